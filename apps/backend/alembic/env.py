@@ -22,6 +22,8 @@ from app.core.database import Base
 from app.models.user import User
 from app.models.task import Task
 from app.models.assignment import Assignment
+from app.models.outbox import OutboxMessage
+from app.models.user_stats import UserStats
 
 # Alembic Config object
 config = context.config
@@ -0,0 +1,26 @@
+"""add telegram_blocked_at to users
+
+Revision ID: 5b1e7c2a9d40
+Revises: d37d42620d59
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c2a9d40'
+down_revision: Union[str, None] = 'd37d42620d59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('telegram_blocked_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'telegram_blocked_at')
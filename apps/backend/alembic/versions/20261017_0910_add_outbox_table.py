@@ -0,0 +1,45 @@
+"""add outbox table for scheduled notifications
+
+Revision ID: 8c3f1a6e2b71
+Revises: 5b1e7c2a9d40
+Create Date: 2026-10-17 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3f1a6e2b71'
+down_revision: Union[str, None] = '5b1e7c2a9d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'outbox',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('kind', sa.Enum('MORNING', 'EVENING', name='outboxkind'), nullable=False),
+        sa.Column('target_date', sa.Date(), nullable=False),
+        sa.Column('chat_id', sa.BigInteger(), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'SENT', 'FAILED', 'BLOCKED', name='outboxstatus'), nullable=False, server_default='PENDING'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint('user_id', 'kind', 'target_date', name='uq_outbox_user_kind_date'),
+    )
+    op.create_index('ix_outbox_status_created', 'outbox', ['status', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_status_created', table_name='outbox')
+    op.drop_table('outbox')
+    op.execute('DROP TYPE IF EXISTS outboxstatus;')
+    op.execute('DROP TYPE IF EXISTS outboxkind;')
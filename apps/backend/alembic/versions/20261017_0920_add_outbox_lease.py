@@ -0,0 +1,26 @@
+"""add outbox lease column for sharded delivery
+
+Revision ID: 2d9e4b7f1c83
+Revises: 8c3f1a6e2b71
+Create Date: 2026-10-17 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d9e4b7f1c83'
+down_revision: Union[str, None] = '8c3f1a6e2b71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('outbox', sa.Column('locked_until', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('outbox', 'locked_until')
@@ -0,0 +1,35 @@
+"""add per-user timezone and delivery times
+
+Revision ID: 6a0f3c9d2e15
+Revises: 2d9e4b7f1c83
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a0f3c9d2e15'
+down_revision: Union[str, None] = '2d9e4b7f1c83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Существующие пользователи получают прежнее глобальное расписание
+    op.add_column('users', sa.Column('timezone', sa.String(length=64), nullable=False, server_default='Europe/Moscow'))
+    op.add_column('users', sa.Column('morning_time', sa.Time(), nullable=False, server_default='09:00'))
+    op.add_column('users', sa.Column('evening_time', sa.Time(), nullable=False, server_default='20:00'))
+    op.create_index('ix_users_timezone_morning_time', 'users', ['timezone', 'morning_time'], unique=False)
+    op.create_index('ix_users_timezone_evening_time', 'users', ['timezone', 'evening_time'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_timezone_evening_time', table_name='users')
+    op.drop_index('ix_users_timezone_morning_time', table_name='users')
+    op.drop_column('users', 'evening_time')
+    op.drop_column('users', 'morning_time')
+    op.drop_column('users', 'timezone')
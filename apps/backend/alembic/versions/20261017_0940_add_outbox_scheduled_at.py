@@ -0,0 +1,32 @@
+"""add outbox scheduled_at for paced delivery windows
+
+Revision ID: 4b8d1e6a7f02
+Revises: 6a0f3c9d2e15
+Create Date: 2026-10-17 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8d1e6a7f02'
+down_revision: Union[str, None] = '6a0f3c9d2e15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('outbox', sa.Column('scheduled_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE outbox SET scheduled_at = created_at")
+    op.alter_column('outbox', 'scheduled_at', nullable=False)
+    op.drop_index('ix_outbox_status_created', table_name='outbox')
+    op.create_index('ix_outbox_status_scheduled', 'outbox', ['status', 'scheduled_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_status_scheduled', table_name='outbox')
+    op.create_index('ix_outbox_status_created', 'outbox', ['status', 'created_at', 'id'], unique=False)
+    op.drop_column('outbox', 'scheduled_at')
@@ -0,0 +1,31 @@
+"""add per-user task deck for non-repeating rotation
+
+Revision ID: 9e2c5a1b7d34
+Revises: 4b8d1e6a7f02
+Create Date: 2026-10-17 09:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e2c5a1b7d34'
+down_revision: Union[str, None] = '4b8d1e6a7f02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Пустая колода заполняется при первой выдаче задания
+    op.add_column(
+        'users',
+        sa.Column('task_deck', postgresql.ARRAY(postgresql.UUID(as_uuid=True)), nullable=False, server_default='{}')
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'task_deck')
@@ -0,0 +1,51 @@
+"""add user_stats table with materialized progress counters
+
+Revision ID: 1f7a3d8c5b96
+Revises: 9e2c5a1b7d34
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f7a3d8c5b96'
+down_revision: Union[str, None] = '9e2c5a1b7d34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_stats',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('total_tasks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completed_tasks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('current_streak', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('longest_streak', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_completed_date', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    )
+
+    # Заполняем счетчики по существующей истории назначений
+    op.execute(
+        """
+        INSERT INTO user_stats (user_id, total_tasks, completed_tasks, last_completed_date)
+        SELECT
+            user_id,
+            count(*),
+            count(*) FILTER (WHERE status = 'COMPLETED'),
+            max(coalesce(assigned_date, completed_at::date)) FILTER (WHERE status = 'COMPLETED')
+        FROM assignments
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_stats')
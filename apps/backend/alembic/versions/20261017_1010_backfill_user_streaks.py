@@ -0,0 +1,63 @@
+"""backfill current and longest streaks in user_stats
+
+Revision ID: 7c4e2f9a1d58
+Revises: 1f7a3d8c5b96
+Create Date: 2026-10-17 10:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c4e2f9a1d58'
+down_revision: Union[str, None] = '1f7a3d8c5b96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Gaps-and-islands: у дней одной серии разность (дата - номер по порядку)
+    # одинакова. current_streak - длина последней серии (заканчивается на
+    # last_completed_date); пропуск до сегодняшнего дня учитывается при чтении.
+    op.execute(
+        """
+        WITH days AS (
+            SELECT DISTINCT user_id, coalesce(assigned_date, completed_at::date) AS day
+            FROM assignments
+            WHERE status = 'COMPLETED'
+        ),
+        islands AS (
+            SELECT
+                user_id,
+                day,
+                day - (row_number() OVER (PARTITION BY user_id ORDER BY day))::int AS island
+            FROM days
+        ),
+        runs AS (
+            SELECT user_id, count(*) AS length, max(day) AS last_day
+            FROM islands
+            GROUP BY user_id, island
+        ),
+        streaks AS (
+            SELECT
+                user_id,
+                max(length) AS longest_streak,
+                (array_agg(length ORDER BY last_day DESC))[1] AS current_streak,
+                max(last_day) AS last_completed_date
+            FROM runs
+            GROUP BY user_id
+        )
+        UPDATE user_stats
+        SET current_streak = streaks.current_streak,
+            longest_streak = streaks.longest_streak,
+            last_completed_date = streaks.last_completed_date
+        FROM streaks
+        WHERE user_stats.user_id = streaks.user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("UPDATE user_stats SET current_streak = 0, longest_streak = 0")
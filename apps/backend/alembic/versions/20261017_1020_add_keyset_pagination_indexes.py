@@ -0,0 +1,32 @@
+"""add composite indexes for keyset pagination
+
+Revision ID: 3e8b5d2a9c47
+Revises: 7c4e2f9a1d58
+Create Date: 2026-10-17 10:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8b5d2a9c47'
+down_revision: Union[str, None] = '7c4e2f9a1d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_created_at_id', 'tasks', ['created_at', 'id'], unique=False)
+    # Новый индекс покрывает запросы по (user_id, assigned_date)
+    op.create_index('ix_assignments_user_date_id', 'assignments', ['user_id', 'assigned_date', 'id'], unique=False)
+    op.drop_index('ix_assignments_user_date', table_name='assignments')
+
+
+def downgrade() -> None:
+    op.create_index('ix_assignments_user_date', 'assignments', ['user_id', 'assigned_date'], unique=False)
+    op.drop_index('ix_assignments_user_date_id', table_name='assignments')
+    op.drop_index('ix_tasks_created_at_id', table_name='tasks')
+    op.drop_index('ix_users_created_at_id', table_name='users')
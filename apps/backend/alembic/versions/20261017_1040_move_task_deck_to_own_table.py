@@ -0,0 +1,52 @@
+"""move task decks from users to user_task_decks
+
+Revision ID: 6c2e9f4a1d57
+Revises: 8d1f6b3e4a20
+Create Date: 2026-10-17 10:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c2e9f4a1d57'
+down_revision: Union[str, None] = '8d1f6b3e4a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Колода меняется при каждой выдаче задания - выносим ее из строки пользователя
+    op.create_table(
+        'user_task_decks',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('task_ids', postgresql.ARRAY(postgresql.UUID(as_uuid=True)), nullable=False, server_default='{}'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    )
+    op.execute(
+        """
+        INSERT INTO user_task_decks (user_id, task_ids)
+        SELECT id, task_deck FROM users WHERE cardinality(task_deck) > 0
+        """
+    )
+    op.drop_column('users', 'task_deck')
+
+
+def downgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('task_deck', postgresql.ARRAY(postgresql.UUID(as_uuid=True)), nullable=False, server_default='{}')
+    )
+    op.execute(
+        """
+        UPDATE users SET task_deck = d.task_ids
+        FROM user_task_decks d
+        WHERE d.user_id = users.id
+        """
+    )
+    op.drop_table('user_task_decks')
@@ -8,68 +8,142 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.core.security import verify_token
+from app.core.security import verify_token_claims
+from app.models.user import UserRole
+from app.schemas.auth import TokenPayload
 
 # Security схема для Bearer токена
 security = HTTPBearer()
 
 
-async def get_current_user_id(
+async def get_token_claims(
     credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> str:
+) -> TokenPayload:
     """
-    Извлекает ID текущего пользователя из JWT токена.
+    Проверяет подпись и срок JWT токена и возвращает его утверждения.
+
+    Токены, выданные до появления утверждений role, active и ver, не
+    принимаются: без ver их нельзя отозвать, без role - авторизовать по
+    токену. Клиент получает 401 и обновляет токены (refresh таких токенов
+    тоже отклоняется, поэтому нужен повторный вход).
 
     Args:
         credentials: Bearer токен из заголовка Authorization
 
     Returns:
-        str: ID пользователя
+        TokenPayload: Утверждения access токена
 
     Raises:
-        HTTPException: Если токен невалиден или отсутствует
+        HTTPException 401: Если токен невалиден, отсутствует или выдан без
+            утверждений role/active/ver
     """
-    token = credentials.credentials
-    user_id = verify_token(token, token_type="access")
+    claims = verify_token_claims(credentials.credentials, token_type="access")
 
-    if user_id is None:
+    if claims is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Невалидный токен авторизации",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return user_id
+    if claims.role is None or claims.active is None or claims.ver is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Токен устарел, обновите его",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return claims
+
+
+async def get_current_user_id(
+    claims: TokenPayload = Depends(get_token_claims)
+) -> str:
+    """
+    Извлекает ID текущего пользователя из JWT токена.
+
+    Args:
+        claims: Утверждения access токена
+
+    Returns:
+        str: ID пользователя
+    """
+    return claims.sub
+
+
+async def get_current_active_claims(
+    claims: TokenPayload = Depends(get_token_claims)
+) -> TokenPayload:
+    """
+    Авторизует запрос только по утверждениям токена, без чтения пользователя.
+
+    Для эндпоинтов, которым нужен только ID пользователя. Отзыв токенов и
+    деактивация вступают в силу для них по истечении access токена
+    (ACCESS_TOKEN_EXPIRE_MINUTES); эндпоинты, где это недопустимо,
+    используют get_current_active_user.
+
+    Args:
+        claims: Утверждения access токена
+
+    Returns:
+        TokenPayload: Утверждения токена активного пользователя
+
+    Raises:
+        HTTPException 403: Если аккаунт деактивирован
+    """
+    if not claims.active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Аккаунт пользователя деактивирован"
+        )
+    return claims
 
 
 async def get_current_user(
-    user_id: str = Depends(get_current_user_id),
+    claims: TokenPayload = Depends(get_token_claims),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Получает полный объект текущего пользователя из БД.
+    Получает текущего пользователя (из кэша или БД).
+
+    Возвращается снимок UserInDB, а не ORM объект: на попадании в кэш
+    запрос к БД не выполняется. Для изменения пользователя используйте
+    user_crud по current_user.id.
 
     Args:
-        user_id: ID пользователя из токена
+        claims: Утверждения access токена
         db: Сессия БД
 
     Returns:
-        User: Объект пользователя
+        UserInDB: Снимок пользователя
 
     Raises:
-        HTTPException: Если пользователь не найден
+        HTTPException 401: Если токен отозван
+        HTTPException 404: Если пользователь не найден
     """
-    from uuid import UUID
     from app.crud import user as user_crud
-    from app.models.user import User
-
-    user = await user_crud.get_by_id(db, UUID(user_id))
-    if user is None:
+    from app.schemas.user import UserInDB
+    from app.services.user_cache import user_cache
+
+    snapshot = await user_cache.get(claims.user_id)
+    if snapshot is None:
+        user = await user_crud.get_by_id(db, claims.user_id)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Пользователь не найден"
+            )
+
+        snapshot = UserInDB.model_validate(user)
+        await user_cache.set(snapshot)
+
+    if claims.ver != snapshot.token_version:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Пользователь не найден"
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Токен отозван",
+            headers={"WWW-Authenticate": "Bearer"},
         )
-    return user
+    return snapshot
 
 
 async def get_current_active_user(
@@ -87,8 +161,6 @@ async def get_current_active_user(
     Raises:
         HTTPException: Если пользователь неактивен
     """
-    from app.models.user import User
-
     if not current_user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -97,12 +169,27 @@ async def get_current_active_user(
     return current_user
 
 
+async def _require_admin_claim(
+    claims: TokenPayload = Depends(get_token_claims)
+) -> None:
+    """Отклоняет токены без роли администратора, не обращаясь к БД."""
+    if claims.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Недостаточно прав для выполнения операции"
+        )
+
+
 async def get_current_admin_user(
+    _: None = Depends(_require_admin_claim),
     current_user = Depends(get_current_active_user)
 ):
     """
     Проверяет, что текущий пользователь является администратором.
 
+    Роль из токена проверяется до чтения пользователя; для администратора
+    роль, активность и версия токена дополнительно сверяются с БД.
+
     Args:
         current_user: Текущий активный пользователь
 
@@ -112,8 +199,6 @@ async def get_current_admin_user(
     Raises:
         HTTPException: Если пользователь не является администратором
     """
-    from app.models.user import User, UserRole
-
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -5,15 +5,22 @@ Admin endpoints.
 
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
+from app.core.pagination import decode_cursor, next_cursor, set_next_cursor
 from app.api.v1.dependencies import get_current_admin_user
 from app.models.user import User
 from app.models.task import TaskDifficulty
 from app.schemas.user import UserResponse, UserProgress
 from app.schemas.task import TaskResponse, TaskCreate, TaskUpdate, AssignmentResponse, AssignmentStatus
-from app.crud import user as user_crud, task as task_crud, assignment as assignment_crud
+from app.crud import (
+    user as user_crud,
+    task as task_crud,
+    assignment as assignment_crud,
+    user_stats as user_stats_crud,
+)
 
 router = APIRouter()
 
@@ -22,28 +29,64 @@ router = APIRouter()
 
 @router.get("/users", response_model=list[UserResponse])
 async def get_all_users(
-    skip: int = Query(0, ge=0, description="Смещение для пагинации"),
+    response: Response,
+    skip: int = Query(0, ge=0, description="Смещение для пагинации (устарело, используйте cursor)"),
     limit: int = Query(100, ge=1, le=100, description="Количество записей"),
     is_active: Optional[bool] = Query(None, description="Фильтр по активности"),
+    cursor: Optional[str] = Query(None, description="Курсор из заголовка X-Next-Cursor предыдущей страницы"),
     _: User = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Получить список всех пользователей (только для администраторов).
 
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor
+    (отсутствует на последней странице).
+
     Args:
         skip: Смещение для пагинации
         limit: Максимальное количество записей (1-100)
         is_active: Фильтр по статусу активности
+        cursor: Курсор следующей страницы
         db: Сессия базы данных
 
     Returns:
         list[UserResponse]: Список пользователей
     """
-    users = await user_crud.get_all(db, skip=skip, limit=limit, is_active=is_active)
+    users = await user_crud.get_all(
+        db,
+        skip=skip,
+        limit=limit,
+        is_active=is_active,
+        after=decode_cursor(cursor, (datetime, UUID)) if cursor else None
+    )
+    set_next_cursor(response, next_cursor(users, limit, "created_at", "id"))
     return [UserResponse.model_validate(u) for u in users]
 
 
+@router.get("/users/progress", response_model=dict[UUID, UserProgress])
+async def get_users_progress(
+    user_ids: list[UUID] = Query(..., alias="ids", max_length=100, description="ID пользователей (до 100)"),
+    _: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Получить статистику прогресса группы пользователей (только для администраторов).
+
+    Прогресс всей страницы списка пользователей читается одним запросом
+    вместо отдельного запроса на каждого пользователя.
+
+    Args:
+        user_ids: ID пользователей (1-100)
+        db: Сессия базы данных
+
+    Returns:
+        dict[UUID, UserProgress]: Прогресс по ID пользователя; несуществующие
+            ID пропускаются
+    """
+    return await user_crud.get_users_progress(db, user_ids)
+
+
 @router.get("/users/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: UUID,
@@ -72,6 +115,69 @@ async def get_user(
     return UserResponse.model_validate(user)
 
 
+@router.patch("/users/{user_id}/active", response_model=UserResponse)
+async def set_user_active(
+    user_id: UUID,
+    is_active: bool = Query(..., description="Новый статус активности"),
+    _: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Активировать или деактивировать пользователя (только для администраторов).
+
+    Деактивированный пользователь получает 403 на следующем же запросе:
+    запись в кэше пользователей сбрасывается.
+
+    Args:
+        user_id: ID пользователя
+        is_active: Новый статус активности
+        db: Сессия базы данных
+
+    Returns:
+        UserResponse: Обновленный пользователь
+
+    Raises:
+        HTTPException 404: Если пользователь не найден
+    """
+    user = await user_crud.set_active(db, user_id, is_active)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Пользователь не найден"
+        )
+    return UserResponse.model_validate(user)
+
+
+@router.post("/users/{user_id}/revoke-tokens", status_code=status.HTTP_200_OK)
+async def revoke_user_tokens(
+    user_id: UUID,
+    _: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Отозвать все токены пользователя (только для администраторов).
+
+    Refresh токены перестают действовать сразу; access токены - не позже
+    чем через ACCESS_TOKEN_EXPIRE_MINUTES.
+
+    Args:
+        user_id: ID пользователя
+        db: Сессия базы данных
+
+    Returns:
+        dict: Сообщение об отзыве
+
+    Raises:
+        HTTPException 404: Если пользователь не найден
+    """
+    if not await user_crud.revoke_tokens(db, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Пользователь не найден"
+        )
+    return {"message": "Токены пользователя отозваны"}
+
+
 @router.get("/users/{user_id}/progress", response_model=UserProgress)
 async def get_user_progress(
     user_id: UUID,
@@ -105,20 +211,26 @@ async def get_user_progress(
 @router.get("/users/{user_id}/assignments", response_model=list[AssignmentResponse])
 async def get_user_assignments(
     user_id: UUID,
-    skip: int = Query(0, ge=0, description="Смещение для пагинации"),
+    response: Response,
+    skip: int = Query(0, ge=0, description="Смещение для пагинации (устарело, используйте cursor)"),
     limit: int = Query(100, ge=1, le=100, description="Количество записей"),
     status_filter: Optional[AssignmentStatus] = Query(None, alias="status", description="Фильтр по статусу"),
+    cursor: Optional[str] = Query(None, description="Курсор из заголовка X-Next-Cursor предыдущей страницы"),
     _: User = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Получить список заданий пользователя по ID (только для администраторов).
 
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor
+    (отсутствует на последней странице).
+
     Args:
         user_id: ID пользователя
         skip: Смещение для пагинации
         limit: Максимальное количество записей (1-100)
         status_filter: Фильтр по статусу (pending/completed)
+        cursor: Курсор следующей страницы
         db: Сессия базы данных
 
     Returns:
@@ -139,8 +251,10 @@ async def get_user_assignments(
         user_id,
         skip=skip,
         limit=limit,
-        status=status_filter
+        status=status_filter,
+        after=decode_cursor(cursor, (date, UUID)) if cursor else None
     )
+    set_next_cursor(response, next_cursor(assignments, limit, "assigned_date", "id"))
     return [AssignmentResponse.model_validate(a) for a in assignments]
 
 
@@ -148,21 +262,27 @@ async def get_user_assignments(
 
 @router.get("/tasks/templates", response_model=list[TaskResponse])
 async def get_task_templates(
-    skip: int = Query(0, ge=0, description="Смещение для пагинации"),
+    response: Response,
+    skip: int = Query(0, ge=0, description="Смещение для пагинации (устарело, используйте cursor)"),
     limit: int = Query(100, ge=1, le=100, description="Количество записей"),
     category: Optional[str] = Query(None, description="Фильтр по категории"),
     difficulty: Optional[TaskDifficulty] = Query(None, description="Фильтр по сложности"),
+    cursor: Optional[str] = Query(None, description="Курсор из заголовка X-Next-Cursor предыдущей страницы"),
     _: User = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Получить список всех шаблонов заданий (только для администраторов).
 
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor
+    (отсутствует на последней странице).
+
     Args:
         skip: Смещение для пагинации
         limit: Максимальное количество записей (1-100)
         category: Фильтр по категории
         difficulty: Фильтр по сложности
+        cursor: Курсор следующей страницы
         db: Сессия базы данных
 
     Returns:
@@ -173,8 +293,10 @@ async def get_task_templates(
         skip=skip,
         limit=limit,
         category=category,
-        difficulty=difficulty
+        difficulty=difficulty,
+        after=decode_cursor(cursor, (datetime, UUID)) if cursor else None
     )
+    set_next_cursor(response, next_cursor(tasks, limit, "created_at", "id"))
     return [TaskResponse.model_validate(t) for t in tasks]
 
 
@@ -294,8 +416,65 @@ async def assign_task_to_user(
     return AssignmentResponse.model_validate(assignment)
 
 
+# ============ Статистика пользователей ============
+
+@router.post("/stats/recompute", status_code=status.HTTP_200_OK)
+async def recompute_user_stats(
+    user_ids: Optional[list[UUID]] = Query(None, alias="ids", description="ID пользователей (по умолчанию - все)"),
+    _: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Пересчитать счетчики прогресса и серии по истории назначений (только для администраторов).
+
+    Сверяет материализованную статистику с назначениями одним set-based
+    запросом для выбранных или всех пользователей.
+
+    Returns:
+        dict: Количество пересчитанных пользователей
+    """
+    recomputed = await user_stats_crud.recompute(db, user_ids)
+    await db.commit()
+    return {"recomputed_users": recomputed}
+
+
+# ============ Метрики ============
+
+@router.get("/metrics/token-cache", status_code=status.HTTP_200_OK)
+async def get_token_cache_metrics(
+    _: User = Depends(get_current_admin_user)
+):
+    """
+    Получить метрики кэша проверенных JWT токенов этого процесса (только для администраторов).
+
+    Returns:
+        dict: size, max_size, hits, misses, evictions, hit_rate
+    """
+    from app.core.security import token_cache
+
+    return token_cache.stats()
+
+
 # ============ Управление планировщиком (для тестирования) ============
 
+@router.get("/scheduler/blocked-users", status_code=status.HTTP_200_OK)
+async def get_blocked_users_count(
+    _: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Получить количество пользователей, исключенных из рассылки (только для администраторов).
+
+    Пользователь исключается, когда Telegram отвечает постоянной ошибкой
+    (бот заблокирован, чат не найден), и возвращается при следующем входе через бота.
+
+    Returns:
+        dict: Количество заблокировавших бота пользователей
+    """
+    blocked = await user_crud.count_telegram_blocked(db)
+    return {"blocked_users": blocked}
+
+
 @router.post("/scheduler/send-morning-tasks", status_code=status.HTTP_200_OK)
 async def trigger_morning_tasks(
     _: User = Depends(get_current_admin_user)
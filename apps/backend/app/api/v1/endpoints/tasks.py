@@ -5,11 +5,13 @@ Task management endpoints.
 
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.api.v1.dependencies import get_current_active_user
-from app.models.user import User
+from app.core.pagination import decode_cursor, next_cursor, set_next_cursor
+from app.api.v1.dependencies import get_current_active_claims
+from app.schemas.auth import TokenPayload
 from app.schemas.task import AssignmentResponse, AssignmentComplete
 from app.services import task_service
 
@@ -18,7 +20,7 @@ router = APIRouter()
 
 @router.get("/today", response_model=AssignmentResponse)
 async def get_today_task(
-    current_user: User = Depends(get_current_active_user),
+    claims: TokenPayload = Depends(get_current_active_claims),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -27,18 +29,18 @@ async def get_today_task(
     Если задание на сегодня еще не назначено, автоматически создает новое случайное задание.
 
     Args:
-        current_user: Текущий пользователь
+        claims: Утверждения токена текущего пользователя
         db: Сессия базы данных
 
     Returns:
         AssignmentResponse: Задание на сегодня с данными упражнения
     """
     # Проверяем, есть ли задание на сегодня
-    today_assignment = await task_service.get_today_task(db, current_user.id)
+    today_assignment = await task_service.get_today_task(db, claims.user_id)
 
     # Если нет - создаем новое
     if not today_assignment:
-        today_assignment = await task_service.assign_daily_task(db, current_user.id)
+        today_assignment = await task_service.assign_daily_task(db, claims.user_id)
 
     return today_assignment
 
@@ -47,7 +49,7 @@ async def get_today_task(
 async def complete_task(
     assignment_id: UUID,
     completion_data: AssignmentComplete,
-    current_user: User = Depends(get_current_active_user),
+    claims: TokenPayload = Depends(get_current_active_claims),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -56,7 +58,7 @@ async def complete_task(
     Args:
         assignment_id: ID назначения
         completion_data: Данные о выполнении (ответ пользователя)
-        current_user: Текущий пользователь
+        claims: Утверждения токена текущего пользователя
         db: Сессия базы данных
 
     Returns:
@@ -68,7 +70,7 @@ async def complete_task(
     """
     return await task_service.complete_task(
         db,
-        user_id=current_user.id,
+        user_id=claims.user_id,
         assignment_id=assignment_id,
         answer_text=completion_data.answer_text
     )
@@ -76,26 +78,35 @@ async def complete_task(
 
 @router.get("/history", response_model=list[AssignmentResponse])
 async def get_task_history(
+    response: Response,
     limit: int = Query(10, ge=1, le=100, description="Количество записей"),
-    offset: int = Query(0, ge=0, description="Смещение для пагинации"),
-    current_user: User = Depends(get_current_active_user),
+    offset: int = Query(0, ge=0, description="Смещение для пагинации (устарело, используйте cursor)"),
+    cursor: Optional[str] = Query(None, description="Курсор из заголовка X-Next-Cursor предыдущей страницы"),
+    claims: TokenPayload = Depends(get_current_active_claims),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Получить историю заданий пользователя.
 
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor
+    (отсутствует на последней странице).
+
     Args:
         limit: Максимальное количество записей (1-100)
         offset: Смещение для пагинации
-        current_user: Текущий пользователь
+        cursor: Курсор следующей страницы
+        claims: Утверждения токена текущего пользователя
         db: Сессия базы данных
 
     Returns:
         list[AssignmentResponse]: Список заданий с их данными
     """
-    return await task_service.get_task_history(
+    history = await task_service.get_task_history(
         db,
-        user_id=current_user.id,
+        user_id=claims.user_id,
         limit=limit,
-        offset=offset
+        offset=offset,
+        after=decode_cursor(cursor, (date, UUID)) if cursor else None
     )
+    set_next_cursor(response, next_cursor(history, limit, "assigned_date", "id"))
+    return history
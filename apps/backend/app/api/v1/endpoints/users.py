@@ -6,9 +6,10 @@ User management endpoints.
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.api.v1.dependencies import get_current_active_user
+from app.api.v1.dependencies import get_current_active_user, get_current_active_claims
 from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate, UserProgress
+from app.schemas.auth import TokenPayload
 from app.crud import user as user_crud
 from app.services import task_service
 
@@ -67,17 +68,17 @@ async def update_current_user(
 
 @router.get("/me/progress", response_model=UserProgress)
 async def get_user_progress(
-    current_user: User = Depends(get_current_active_user),
+    claims: TokenPayload = Depends(get_current_active_claims),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Получить статистику прогресса текущего пользователя.
 
     Args:
-        current_user: Текущий пользователь
+        claims: Утверждения токена текущего пользователя
         db: Сессия базы данных
 
     Returns:
         UserProgress: Статистика выполнения заданий
     """
-    return await task_service.get_user_progress(db, current_user.id)
+    return await task_service.get_user_progress(db, claims.user_id)
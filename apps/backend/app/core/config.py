@@ -42,6 +42,11 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # bcrypt выполняется в отдельном пуле потоков, чтобы не блокировать event loop
+    PASSWORD_HASH_WORKERS: int = 2  # Потоков для bcrypt (не больше числа ядер на процесс)
+    PASSWORD_HASH_MAX_PENDING: int = 16  # Операций в работе и очереди; сверх лимита - 503
+    TOKEN_CACHE_MAX_SIZE: int = 10000  # Проверенных JWT в LRU процесса (0 - выключен)
+
     # CORS настройки
     BACKEND_CORS_ORIGINS: List[str] = [
         "http://localhost:3000",
@@ -64,11 +69,54 @@ class Settings(BaseSettings):
 
     # Telegram Bot (для интеграции)
     TELEGRAM_BOT_TOKEN: Optional[str] = None
+    TELEGRAM_API_URL: str = "https://api.telegram.org"
+    TELEGRAM_HTTP_TIMEOUT: float = 10.0
+    TELEGRAM_HTTP_MAX_CONNECTIONS: int = 50  # Размер пула соединений к Bot API
+    TELEGRAM_HTTP_MAX_KEEPALIVE: int = 20  # Соединений, удерживаемых в keep-alive
+    TELEGRAM_HTTP_KEEPALIVE_EXPIRY: float = 30.0  # Секунд простоя до закрытия
+    # Лимит на бота: при доставке из нескольких процессов делится между ними (OUTBOX_DRAIN_PROCESSES)
+    TELEGRAM_GLOBAL_RATE_LIMIT: float = 30.0  # Сообщений в секунду на бота
+    TELEGRAM_PER_CHAT_RATE_LIMIT: float = 1.0  # Сообщений в секунду в один чат
+    TELEGRAM_SEND_CONCURRENCY: int = 20  # Одновременных запросов к Bot API
+    TELEGRAM_MAX_RETRIES: int = 3  # Повторов при 429, 5xx и сетевых ошибках
+    TELEGRAM_RETRY_BASE_DELAY: float = 0.5  # Базовая задержка экспоненциального backoff, с
+    TELEGRAM_RETRY_MAX_DELAY: float = 30.0
+
+    # Каталог заданий в памяти процесса (случайный выбор без запросов)
+    TASK_CATALOG_TTL_SECONDS: int = 300
+
+    # Кэш аутентифицированных пользователей (общий через REDIS_URL, если задан)
+    USER_CACHE_TTL_SECONDS: int = 30  # 0 - кэш выключен
+    USER_CACHE_MAX_SIZE: int = 10000  # Записей в памяти процесса
 
     # Scheduler настройки
     SCHEDULER_TIMEZONE: str = "Europe/Moscow"
     MORNING_TASK_TIME: str = "09:00"
     EVENING_REMINDER_TIME: str = "20:00"
+    SCHEDULER_BATCH_SIZE: int = 1000  # Размер порции пользователей при рассылке
+    SCHEDULER_MISFIRE_GRACE_SECONDS: int = 3600  # Окно, в котором пропущенный запуск догоняется
+    # Окно доставки: сообщения распределяются по нему со сдвигом по хешу user_id (0 - сразу)
+    DELIVERY_WINDOW_MINUTES: int = 0
+
+    # Выбор лидера: задачи выполняет один процесс среди всех реплик и воркеров
+    SCHEDULER_LEADER_ELECTION: bool = True
+    SCHEDULER_LEADER_LOCK_ID: int = 7310001  # Ключ advisory lock PostgreSQL
+    SCHEDULER_LEADER_POLL_SECONDS: float = 5.0  # Период попыток захвата лидерства
+    SCHEDULER_LEADER_HEARTBEAT_SECONDS: float = 5.0  # Период проверки соединения лидера
+
+    # Outbox запланированных уведомлений
+    OUTBOX_DRAIN_INTERVAL_SECONDS: int = 15  # Период опроса outbox обработчиками
+    OUTBOX_DRAIN_ON_ALL_REPLICAS: bool = False  # Доставлять из каждой реплики, а не только лидером
+    # Число процессов-обработчиков (реплики x воркеры) при доставке из всех реплик. Не определяется
+    # автоматически: должно совпадать с фактическим числом процессов, иначе лимит бота превышается (429)
+    # или используется не полностью
+    OUTBOX_DRAIN_PROCESSES: int = 1
+    OUTBOX_CLAIM_BATCH_SIZE: int = 200  # Сообщений в одном захвате (SKIP LOCKED)
+    OUTBOX_LEASE_SECONDS: int = 300  # Срок захвата порции одним обработчиком
+    OUTBOX_RETRY_DELAY_SECONDS: int = 60  # Пауза перед повтором неудачной доставки
+    OUTBOX_MAX_ATTEMPTS: int = 5  # Прогонов доставки до статуса failed
+    OUTBOX_MAX_AGE_HOURS: int = 12  # Более старые сообщения не отправляются
+    OUTBOX_RETENTION_DAYS: int = 7  # Срок хранения записей outbox
 
     # Seed данные для первого администратора
     ADMIN_EMAIL: str = Field(
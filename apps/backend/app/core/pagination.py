@@ -0,0 +1,107 @@
+"""
+Keyset (cursor) пагинация.
+
+Курсор - непрозрачный токен с ключом сортировки последней записи страницы.
+Следующая страница выбирается условием "после этого ключа" по составному
+индексу, поэтому ее стоимость не зависит от глубины, в отличие от OFFSET.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Optional, Sequence
+from uuid import UUID
+from fastapi import HTTPException, Response, status
+
+# Заголовок ответа с курсором следующей страницы
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _load(value: Any, kind: type) -> Any:
+    if value is None:
+        return None
+    if kind is datetime:
+        return datetime.fromisoformat(value)
+    if kind is date:
+        return date.fromisoformat(value)
+    if kind is UUID:
+        return UUID(value)
+    raise TypeError(f"Unsupported cursor type: {kind}")
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Закодировать ключ сортировки в курсор.
+
+    Args:
+        values: Значения ключа (datetime, date, UUID или None)
+
+    Returns:
+        str: Курсор (URL-safe base64)
+    """
+    payload = json.dumps([_dump(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, kinds: Sequence[type]) -> tuple:
+    """
+    Раскодировать курсор, полученный от клиента.
+
+    Args:
+        cursor: Курсор
+        kinds: Типы значений ключа по порядку
+
+    Returns:
+        tuple: Значения ключа
+
+    Raises:
+        HTTPException 400: Если курсор поврежден или от другого списка
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(kinds):
+            raise ValueError("cursor length mismatch")
+        return tuple(_load(value, kind) for value, kind in zip(values, kinds))
+    except (ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный курсор пагинации"
+        ) from e
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]) -> None:
+    """
+    Передать курсор следующей страницы в заголовке ответа.
+
+    Args:
+        response: Ответ FastAPI
+        cursor: Курсор или None, если страница последняя
+    """
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
+
+def next_cursor(items: Sequence[Any], limit: int, *attrs: str) -> Optional[str]:
+    """
+    Курсор следующей страницы по последней записи.
+
+    Args:
+        items: Записи текущей страницы
+        limit: Запрошенный размер страницы
+        attrs: Атрибуты записи, составляющие ключ сортировки
+
+    Returns:
+        Optional[str]: Курсор или None, если записей больше нет
+    """
+    if len(items) < limit:
+        return None
+    return encode_cursor(*(getattr(items[-1], attr) for attr in attrs))
@@ -2,16 +2,107 @@
 Модуль безопасности для работы с JWT токенами и паролями.
 """
 
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, TypeVar
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from pydantic import ValidationError
 from app.core.config import settings
+from app.schemas.auth import TokenPayload
+
+T = TypeVar("T")
 
 
 # Контекст для хеширования паролей (bcrypt)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt занимает 100-300 мс CPU и отпускает GIL, поэтому выполняется в
+# ограниченном пуле потоков. Лимит допуска не дает всплеску входов занять
+# пул и очередь надолго: лишние запросы сразу получают 503.
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_password_slots = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
+
+class VerifiedTokenCache:
+    """
+    LRU проверенных JWT токенов до их exp.
+
+    Клиенты (в первую очередь бот) повторно используют один access токен,
+    поэтому повторная проверка подписи заменяется поиском по SHA-256 токена.
+    Кэшируются только успешно проверенные токены с exp: поддельный токен не
+    может попасть в кэш, а запись перестает действовать в момент истечения
+    токена. Сам токен не хранится, только его хеш.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        Args:
+            max_size: Максимальное количество записей (0 - кэш выключен)
+        """
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, tuple[float, Dict[str, Any]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Получить утверждения проверенного токена или None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def put(self, key: bytes, payload: Dict[str, Any]) -> None:
+        """Запомнить утверждения проверенного токена до его exp."""
+        exp = payload.get("exp")
+        if self.max_size <= 0 or not isinstance(exp, (int, float)):
+            return
+
+        self._entries[key] = (float(exp), payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Метрики кэша с момента запуска процесса.
+
+        Returns:
+            Dict[str, Any]: size, max_size, hits, misses, evictions, hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+token_cache = VerifiedTokenCache(max_size=settings.TOKEN_CACHE_MAX_SIZE)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -40,6 +131,79 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def _run_password_op(func: Callable[..., T], *args: Any) -> T:
+    """
+    Выполнить операцию bcrypt в пуле потоков с ограничением допуска.
+
+    Raises:
+        HTTPException 503: Если лимит PASSWORD_HASH_MAX_PENDING исчерпан
+    """
+    if _password_slots.locked():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Слишком много одновременных попыток входа, повторите позже",
+            headers={"Retry-After": "1"},
+        )
+
+    async with _password_slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, func, *args)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Проверяет пароль, не блокируя event loop.
+
+    Args:
+        plain_password: Пароль в открытом виде
+        hashed_password: Хешированный пароль
+
+    Returns:
+        bool: True если пароль верный, False в противном случае
+
+    Raises:
+        HTTPException 503: Если слишком много проверок уже выполняется
+    """
+    return await _run_password_op(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Хеширует пароль, не блокируя event loop.
+
+    Args:
+        password: Пароль в открытом виде
+
+    Returns:
+        str: Хешированный пароль
+
+    Raises:
+        HTTPException 503: Если слишком много операций уже выполняется
+    """
+    return await _run_password_op(get_password_hash, password)
+
+
+def user_token_claims(user: Any) -> Dict[str, Any]:
+    """
+    Подписываемые утверждения access токена пользователя.
+
+    Роль и активность позволяют авторизовать запрос без чтения пользователя
+    из БД; ver сравнивается с users.token_version для отзыва токенов.
+
+    Args:
+        user: Пользователь (User или UserInDB)
+
+    Returns:
+        Dict[str, Any]: Данные для create_access_token
+    """
+    return {
+        "sub": str(user.id),
+        "role": user.role.value,
+        "active": user.is_active,
+        "ver": user.token_version,
+    }
+
+
 def create_access_token(
     data: Dict[str, Any],
     expires_delta: Optional[timedelta] = None
@@ -108,22 +272,54 @@ def decode_token(token: str) -> Optional[Dict[str, Any]]:
     """
     Декодирует и валидирует JWT токен.
 
+    Повторно предъявленный токен берется из token_cache без проверки подписи.
+
     Args:
         token: JWT токен для декодирования
 
     Returns:
         Optional[Dict[str, Any]]: Декодированные данные или None при ошибке
+            (не изменяйте: словарь может быть общим с кэшем)
     """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(
             token,
             settings.SECRET_KEY,
             algorithms=[settings.ALGORITHM]
         )
-        return payload
     except JWTError:
         return None
 
+    token_cache.put(key, payload)
+    return payload
+
+
+def verify_token_claims(token: str, token_type: str = "access") -> Optional[TokenPayload]:
+    """
+    Проверяет токен и возвращает его утверждения.
+
+    Args:
+        token: JWT токен для проверки
+        token_type: Тип токена ("access" или "refresh")
+
+    Returns:
+        Optional[TokenPayload]: Утверждения токена или None при ошибке
+    """
+    payload = decode_token(token)
+
+    if payload is None or payload.get("type") != token_type:
+        return None
+
+    try:
+        return TokenPayload.model_validate(payload)
+    except ValidationError:
+        return None
+
 
 def verify_token(token: str, token_type: str = "access") -> Optional[str]:
     """
@@ -0,0 +1,40 @@
+"""
+Локальные даты пользователей.
+
+"Сегодня" для пользователя - дата в его часовом поясе, а не на сервере:
+на ней сходятся планировщик рассылок, выдача задания на сегодня и серии.
+"""
+
+from datetime import date, datetime
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from app.core.config import settings
+
+
+def get_zone(timezone_name: Optional[str]) -> ZoneInfo:
+    """
+    Часовой пояс пользователя.
+
+    Args:
+        timezone_name: Часовой пояс IANA (None - пояс по умолчанию)
+
+    Returns:
+        ZoneInfo: Часовой пояс; неизвестный заменяется SCHEDULER_TIMEZONE
+    """
+    try:
+        return ZoneInfo(timezone_name or settings.SCHEDULER_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(settings.SCHEDULER_TIMEZONE)
+
+
+def local_today(timezone_name: Optional[str]) -> date:
+    """
+    Текущая дата в часовом поясе пользователя.
+
+    Args:
+        timezone_name: Часовой пояс IANA (None - пояс по умолчанию)
+
+    Returns:
+        date: Локальная дата
+    """
+    return datetime.now(get_zone(timezone_name)).date()
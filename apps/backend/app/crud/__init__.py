@@ -2,6 +2,6 @@
 =8F80;870F8O CRUD <>4C;59.
 """
 
-from app.crud import user, task, assignment
+from app.crud import user, task, assignment, outbox, user_stats, task_deck
 
-__all__ = ["user", "task", "assignment"]
+__all__ = ["user", "task", "assignment", "outbox", "user_stats", "task_deck"]
@@ -2,14 +2,45 @@
 CRUD операции для работы с назначениями заданий пользователям.
 """
 
-from typing import Optional
-from uuid import UUID
+from typing import Optional, Sequence
+from uuid import UUID, uuid4
 from datetime import datetime, date
-from sqlalchemy import select, and_
+from sqlalchemy import select, insert, update as sql_update, and_, or_, tuple_, Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, joinedload, contains_eager, aliased
 from app.models.assignment import Assignment, AssignmentStatus
+from app.models.task import Task
 from app.schemas.task import AssignmentCreate, AssignmentUpdate
+from app.crud import user_stats as user_stats_crud
+
+
+async def _write_returning(db: AsyncSession, statement) -> Optional[Assignment]:
+    """
+    Выполнить INSERT/UPDATE назначения и получить результат вместе с заданием.
+
+    Изменение выполняется в data-modifying CTE (... RETURNING), к которому
+    присоединяется задание, поэтому запись и загрузка результата - один
+    запрос. COMMIT выполняет вызывающая функция, чтобы статистика
+    пользователя обновлялась в той же транзакции.
+
+    Args:
+        db: Сессия базы данных
+        statement: INSERT или UPDATE по таблице assignments (без RETURNING)
+
+    Returns:
+        Optional[Assignment]: Записанное назначение с заданием или None,
+            если ни одна строка не изменена
+    """
+    written = statement.returning(*Assignment.__table__.c).cte("written")
+    written_assignment = aliased(Assignment, written)
+
+    result = await db.execute(
+        select(written_assignment)
+        .join(written_assignment.task)
+        .options(contains_eager(written_assignment.task))
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
 
 
 async def get_by_id(db: AsyncSession, assignment_id: UUID) -> Optional[Assignment]:
@@ -38,11 +69,15 @@ async def get_user_assignments(
     limit: int = 100,
     status: Optional[AssignmentStatus] = None,
     start_date: Optional[date] = None,
-    end_date: Optional[date] = None
+    end_date: Optional[date] = None,
+    after: Optional[tuple[Optional[date], UUID]] = None
 ) -> list[Assignment]:
     """
     Получить список назначений пользователя с фильтрацией.
 
+    Порядок: сначала задания в очереди (assigned_date IS NULL), затем по
+    убыванию даты; внутри даты - по убыванию id.
+
     Args:
         db: Сессия базы данных
         user_id: ID пользователя
@@ -51,6 +86,8 @@ async def get_user_assignments(
         status: Фильтр по статусу (опционально)
         start_date: Начальная дата (опционально)
         end_date: Конечная дата (опционально)
+        after: Ключ (assigned_date, id) последней записи предыдущей страницы;
+            страница выбирается по индексу (user_id, assigned_date, id) без OFFSET
 
     Returns:
         list[Assignment]: Список назначений с загруженными заданиями
@@ -65,25 +102,42 @@ async def get_user_assignments(
         query = query.where(Assignment.assigned_date >= start_date)
     if end_date:
         query = query.where(Assignment.assigned_date <= end_date)
+    if after is not None:
+        after_date, after_id = after
+        if after_date is None:
+            # Курсор внутри очереди: остаток очереди, затем все датированные
+            query = query.where(
+                or_(
+                    and_(Assignment.assigned_date.is_(None), Assignment.id < after_id),
+                    Assignment.assigned_date.is_not(None)
+                )
+            )
+        else:
+            query = query.where(
+                tuple_(Assignment.assigned_date, Assignment.id) < tuple_(after_date, after_id)
+            )
 
-    query = query.offset(skip).limit(limit).order_by(Assignment.assigned_date.desc())
+    query = query.offset(skip).limit(limit).order_by(
+        Assignment.assigned_date.desc().nulls_first(),
+        Assignment.id.desc()
+    )
 
     result = await db.execute(query)
     return list(result.scalars().all())
 
 
-async def get_today_assignment(db: AsyncSession, user_id: UUID) -> Optional[Assignment]:
+async def get_today_assignment(db: AsyncSession, user_id: UUID, today: date) -> Optional[Assignment]:
     """
     Получить назначение пользователя на сегодня (только PENDING).
 
     Args:
         db: Сессия базы данных
         user_id: ID пользователя
+        today: Текущая дата в часовом поясе пользователя
 
     Returns:
         Optional[Assignment]: Назначение на сегодня с загруженным заданием или None
     """
-    today = date.today()
     result = await db.execute(
         select(Assignment)
         .options(selectinload(Assignment.task))
@@ -100,18 +154,18 @@ async def get_today_assignment(db: AsyncSession, user_id: UUID) -> Optional[Assi
     return result.scalar_one_or_none()
 
 
-async def has_completed_task_today(db: AsyncSession, user_id: UUID) -> bool:
+async def has_completed_task_today(db: AsyncSession, user_id: UUID, today: date) -> bool:
     """
     Проверить, выполнил ли пользователь хотя бы одно задание сегодня.
 
     Args:
         db: Сессия базы данных
         user_id: ID пользователя
+        today: Текущая дата в часовом поясе пользователя
 
     Returns:
         bool: True если есть выполненное задание на сегодня
     """
-    today = date.today()
     result = await db.execute(
         select(Assignment)
         .where(
@@ -169,21 +223,16 @@ async def assign_pending_to_date(
     Returns:
         Assignment: Обновленное назначение с датой
     """
-    assignment = await get_by_id(db, assignment_id)
+    assignment = await _write_returning(
+        db,
+        sql_update(Assignment)
+        .where(Assignment.id == assignment_id)
+        .values(assigned_date=target_date)
+    )
+    await db.commit()
     if not assignment:
         raise ValueError("Assignment not found")
-
-    assignment.assigned_date = target_date
-    await db.commit()
-    await db.refresh(assignment)
-
-    # Перезагружаем с заданием
-    result = await db.execute(
-        select(Assignment)
-        .options(selectinload(Assignment.task))
-        .where(Assignment.id == assignment.id)
-    )
-    return result.scalar_one()
+    return assignment
 
 
 async def create_daily_assignment(
@@ -211,6 +260,7 @@ async def create_daily_assignment(
     if assigned_date is not None:
         existing = await db.execute(
             select(Assignment)
+            .options(joinedload(Assignment.task))
             .where(
                 and_(
                     Assignment.user_id == user_id,
@@ -222,12 +272,7 @@ async def create_daily_assignment(
 
         # Если уже есть задание на эту дату, возвращаем его
         if existing_assignment:
-            result = await db.execute(
-                select(Assignment)
-                .options(selectinload(Assignment.task))
-                .where(Assignment.id == existing_assignment.id)
-            )
-            return result.scalar_one()
+            return existing_assignment
 
     assignment_data = AssignmentCreate(
         user_id=user_id,
@@ -235,18 +280,153 @@ async def create_daily_assignment(
         assigned_date=assigned_date  # Может быть None для pending заданий
     )
 
-    assignment = Assignment(**assignment_data.model_dump())
-    db.add(assignment)
+    assignment = await _write_returning(
+        db,
+        insert(Assignment).values(
+            id=uuid4(),
+            status=AssignmentStatus.PENDING,
+            created_at=datetime.utcnow(),
+            **assignment_data.model_dump()
+        )
+    )
+    await user_stats_crud.add_assigned(db, [user_id])
     await db.commit()
-    await db.refresh(assignment)
+    return assignment
+
+
+async def get_daily_states(
+    db: AsyncSession,
+    user_ids: Sequence[UUID],
+    target_date: date
+) -> dict[UUID, Row]:
+    """
+    Получить состояние назначений группы пользователей одним запросом.
+
+    Для каждого пользователя возвращается его назначение на дату (выполненное
+    имеет приоритет), а если его нет - первое задание из очереди pending.
+    Пользователи без назначений в результат не попадают.
+
+    Args:
+        db: Сессия базы данных
+        user_ids: ID пользователей
+        target_date: Дата рассылки
+
+    Returns:
+        dict[UUID, Row]: user_id -> строка (user_id, assignment_id, task_id, status)
+    """
+    if not user_ids:
+        return {}
 
-    # Загружаем связанное задание
     result = await db.execute(
-        select(Assignment)
-        .options(selectinload(Assignment.task))
-        .where(Assignment.id == assignment.id)
+        select(
+            Assignment.user_id,
+            Assignment.id.label("assignment_id"),
+            Assignment.task_id,
+            Assignment.status,
+        )
+        .where(
+            and_(
+                Assignment.user_id.in_(user_ids),
+                or_(
+                    Assignment.assigned_date == target_date,
+                    and_(
+                        Assignment.assigned_date.is_(None),
+                        Assignment.status == AssignmentStatus.PENDING
+                    )
+                )
+            )
+        )
+        .distinct(Assignment.user_id)
+        .order_by(
+            Assignment.user_id,
+            Assignment.assigned_date.is_(None),  # Сначала задания на дату, потом очередь
+            Assignment.status == AssignmentStatus.PENDING,  # Выполненное важнее
+            Assignment.created_at.asc()
+        )
+    )
+    return {row.user_id: row for row in result.all()}
+
+
+async def get_pending_titles_for_date(
+    db: AsyncSession,
+    user_ids: Sequence[UUID],
+    target_date: date
+) -> dict[UUID, str]:
+    """
+    Получить названия невыполненных заданий на дату для группы пользователей.
+
+    Args:
+        db: Сессия базы данных
+        user_ids: ID пользователей
+        target_date: Дата назначения
+
+    Returns:
+        dict[UUID, str]: user_id -> название самого раннего PENDING задания
+    """
+    if not user_ids:
+        return {}
+
+    result = await db.execute(
+        select(Assignment.user_id, Task.title)
+        .join(Task, Task.id == Assignment.task_id)
+        .where(
+            and_(
+                Assignment.user_id.in_(user_ids),
+                Assignment.assigned_date == target_date,
+                Assignment.status == AssignmentStatus.PENDING
+            )
+        )
+        .distinct(Assignment.user_id)
+        .order_by(Assignment.user_id, Assignment.created_at.asc())
     )
-    return result.scalar_one()
+    return {row.user_id: row.title for row in result.all()}
+
+
+async def create_bulk_assignments(
+    db: AsyncSession,
+    pairs: Sequence[tuple[UUID, UUID]],
+    assigned_date: Optional[date] = None,
+    batch_size: int = 1000
+) -> list[Row]:
+    """
+    Создать назначения для множества пользователей многострочным INSERT ... RETURNING.
+
+    Args:
+        db: Сессия базы данных
+        pairs: Пары (user_id, task_id)
+        assigned_date: Дата назначения (None = в очередь pending)
+        batch_size: Количество строк в одном INSERT (ограничение числа параметров)
+
+    Returns:
+        list[Row]: Строки (id, user_id, task_id) созданных назначений
+    """
+    created: list[Row] = []
+    now = datetime.utcnow()
+
+    for start in range(0, len(pairs), batch_size):
+        values = [
+            {
+                "id": uuid4(),
+                "user_id": user_id,
+                "task_id": task_id,
+                "assigned_date": assigned_date,
+                "status": AssignmentStatus.PENDING,
+                "created_at": now,
+            }
+            for user_id, task_id in pairs[start:start + batch_size]
+        ]
+        result = await db.execute(
+            insert(Assignment)
+            .values(values)
+            .returning(Assignment.id, Assignment.user_id, Assignment.task_id)
+        )
+        rows = result.all()
+        await user_stats_crud.add_assigned(db, [row.user_id for row in rows])
+        created.extend(rows)
+
+    if created:
+        await db.commit()
+    return created
 
 
 async def mark_as_completed(
@@ -265,35 +445,37 @@ async def mark_as_completed(
     Returns:
         Optional[Assignment]: Обновленное назначение или None
     """
-    assignment = await get_by_id(db, assignment_id)
-    if not assignment:
-        return None
-
-    # Проверяем, что задание еще не выполнено
-    if assignment.status == AssignmentStatus.COMPLETED:
-        # Если уже выполнено, просто возвращаем с заданием
-        result = await db.execute(
-            select(Assignment)
-            .options(selectinload(Assignment.task))
-            .where(Assignment.id == assignment.id)
-        )
-        return result.scalar_one()
-
-    assignment.status = AssignmentStatus.COMPLETED
-    assignment.completed_at = datetime.utcnow()
+    values = {
+        "status": AssignmentStatus.COMPLETED,
+        "completed_at": datetime.utcnow(),
+    }
     if answer_text:
-        assignment.answer_text = answer_text
+        values["answer_text"] = answer_text
 
-    await db.commit()
-    await db.refresh(assignment)
-
-    # Перезагружаем с заданием
-    result = await db.execute(
-        select(Assignment)
-        .options(selectinload(Assignment.task))
-        .where(Assignment.id == assignment.id)
+    # Условие на статус: повторное выполнение не меняет completed_at и ответ
+    assignment = await _write_returning(
+        db,
+        sql_update(Assignment)
+        .where(
+            and_(
+                Assignment.id == assignment_id,
+                Assignment.status != AssignmentStatus.COMPLETED
+            )
+        )
+        .values(**values)
     )
-    return result.scalar_one()
+    if assignment is None:
+        await db.commit()
+        # Назначение не найдено или уже выполнено - возвращаем как есть
+        return await get_by_id(db, assignment_id)
+
+    await user_stats_crud.add_completed(
+        db,
+        assignment.user_id,
+        assignment.assigned_date or assignment.completed_at.date()
+    )
+    await db.commit()
+    return assignment
 
 
 async def update(
@@ -312,24 +494,21 @@ async def update(
     Returns:
         Optional[Assignment]: Обновленное назначение или None
     """
-    assignment = await get_by_id(db, assignment_id)
-    if not assignment:
-        return None
-
     update_data = assignment_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(assignment, field, value)
+    if not update_data:
+        return await get_by_id(db, assignment_id)
 
-    await db.commit()
-    await db.refresh(assignment)
-
-    # Перезагружаем с заданием
-    result = await db.execute(
-        select(Assignment)
-        .options(selectinload(Assignment.task))
-        .where(Assignment.id == assignment.id)
+    assignment = await _write_returning(
+        db,
+        sql_update(Assignment)
+        .where(Assignment.id == assignment_id)
+        .values(**update_data)
     )
-    return result.scalar_one()
+    if assignment is not None and "status" in update_data:
+        # Ручная смена статуса - счетчики пересчитываются по истории
+        await user_stats_crud.recompute(db, [assignment.user_id])
+    await db.commit()
+    return assignment
 
 
 async def delete(db: AsyncSession, assignment_id: UUID) -> bool:
@@ -348,5 +527,7 @@ async def delete(db: AsyncSession, assignment_id: UUID) -> bool:
         return False
 
     await db.delete(assignment)
+    await db.flush()
+    await user_stats_crud.recompute(db, [assignment.user_id])
     await db.commit()
     return True
@@ -0,0 +1,273 @@
+"""
+CRUD операции для работы с исходящими сообщениями (outbox).
+"""
+
+from typing import Sequence
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete, update, func, and_, or_, case, cast, literal, tuple_, Row
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.outbox import OutboxMessage, OutboxStatus
+
+
+async def enqueue(
+    db: AsyncSession,
+    messages: Sequence[dict],
+    batch_size: int = 1000
+) -> int:
+    """
+    Записать сообщения в outbox многострочным INSERT.
+
+    Сообщения с уже существующим ключом (user_id, kind, target_date)
+    пропускаются, поэтому повторное планирование не создает дублей.
+
+    Args:
+        db: Сессия базы данных
+        messages: Словари с полями user_id, kind, target_date, chat_id, text
+            и необязательным scheduled_at (по умолчанию - сейчас)
+        batch_size: Количество строк в одном INSERT
+
+    Returns:
+        int: Количество добавленных сообщений
+    """
+    inserted = 0
+    now = datetime.utcnow()
+
+    for start in range(0, len(messages), batch_size):
+        values = [
+            {
+                "id": uuid4(),
+                "status": OutboxStatus.PENDING,
+                "attempts": 0,
+                "created_at": now,
+                "scheduled_at": now,
+                **message,
+            }
+            for message in messages[start:start + batch_size]
+        ]
+        result = await db.execute(
+            insert(OutboxMessage)
+            .values(values)
+            .on_conflict_do_nothing(constraint="uq_outbox_user_kind_date")
+        )
+        inserted += result.rowcount
+
+    if messages:
+        await db.commit()
+    return inserted
+
+
+async def claim_batch(
+    db: AsyncSession,
+    limit: int,
+    lease: timedelta,
+    max_age: timedelta
+) -> list[Row]:
+    """
+    Захватить порцию недоставленных сообщений, время которых наступило.
+
+    Строки выбираются с FOR UPDATE SKIP LOCKED и получают locked_until,
+    поэтому параллельные обработчики (в том числе в разных репликах)
+    получают непересекающиеся порции. Если обработчик упал, сообщения
+    снова становятся доступны по истечении lease.
+
+    Доставка - "хотя бы один раз": если обработчик не успел отправить
+    порцию за lease (например, ждал retry_after), ее захватывает другой
+    и сообщение может уйти дважды. Значение locked_until служит токеном
+    захвата - итог записывается только владельцем текущего захвата
+    (см. mark_status), поэтому статус устаревший обработчик не перезапишет.
+
+    Args:
+        db: Сессия базы данных
+        limit: Размер порции
+        lease: Срок захвата
+        max_age: Сообщения старше этого возраста считаются неактуальными
+
+    Returns:
+        list[Row]: Строки (id, user_id, chat_id, text, locked_until)
+    """
+    now = datetime.utcnow()
+    claimable = (
+        select(OutboxMessage.id)
+        .where(
+            and_(
+                OutboxMessage.status == OutboxStatus.PENDING,
+                OutboxMessage.scheduled_at <= now,
+                OutboxMessage.created_at >= now - max_age,
+                or_(
+                    OutboxMessage.locked_until.is_(None),
+                    OutboxMessage.locked_until < now
+                )
+            )
+        )
+        .order_by(OutboxMessage.scheduled_at.asc(), OutboxMessage.id.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+
+    result = await db.execute(
+        update(OutboxMessage)
+        .where(OutboxMessage.id.in_(claimable))
+        .values(locked_until=now + lease)
+        .returning(
+            OutboxMessage.id,
+            OutboxMessage.user_id,
+            OutboxMessage.chat_id,
+            OutboxMessage.text,
+            OutboxMessage.locked_until,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rows = list(result.all())
+    await db.commit()
+    return rows
+
+
+def _claimed(claims: Sequence[tuple[UUID, datetime]]):
+    """Условие: сообщения все еще захвачены с указанным locked_until."""
+    return tuple_(OutboxMessage.id, OutboxMessage.locked_until).in_(claims)
+
+
+async def mark_status(
+    db: AsyncSession,
+    claims: Sequence[tuple[UUID, datetime]],
+    status: OutboxStatus
+) -> int:
+    """
+    Установить итоговый статус группе сообщений.
+
+    Обновляются только сообщения, захват которых не перехвачен другим
+    обработчиком после истечения lease.
+
+    Args:
+        db: Сессия базы данных
+        claims: Пары (ID сообщения, locked_until из claim_batch)
+        status: Новый статус (sent/blocked/failed)
+
+    Returns:
+        int: Количество обновленных сообщений
+    """
+    if not claims:
+        return 0
+
+    values = {"status": status, "locked_until": None}
+    if status == OutboxStatus.SENT:
+        values["sent_at"] = datetime.utcnow()
+
+    result = await db.execute(
+        update(OutboxMessage)
+        .where(_claimed(claims))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def record_failed_attempts(
+    db: AsyncSession,
+    claims: Sequence[tuple[UUID, datetime]],
+    max_attempts: int,
+    retry_delay: timedelta
+) -> int:
+    """
+    Учесть неудачную попытку доставки.
+
+    Сообщение остается в очереди до исчерпания max_attempts, затем
+    получает статус failed. Следующая попытка возможна не раньше retry_delay.
+    Как и в mark_status, учитываются только сообщения текущего захвата.
+
+    Args:
+        db: Сессия базы данных
+        claims: Пары (ID сообщения, locked_until из claim_batch)
+        max_attempts: Максимальное количество попыток
+        retry_delay: Пауза до следующей попытки
+
+    Returns:
+        int: Количество обновленных сообщений
+    """
+    if not claims:
+        return 0
+
+    result = await db.execute(
+        update(OutboxMessage)
+        .where(_claimed(claims))
+        .values(
+            attempts=OutboxMessage.attempts + 1,
+            locked_until=datetime.utcnow() + retry_delay,
+            status=case(
+                (
+                    OutboxMessage.attempts + 1 >= max_attempts,
+                    cast(literal(OutboxStatus.FAILED.name), OutboxMessage.status.type)
+                ),
+                else_=cast(literal(OutboxStatus.PENDING.name), OutboxMessage.status.type)
+            )
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def get_window_summary(
+    db: AsyncSession,
+    scheduled_from: datetime,
+    scheduled_to: datetime,
+    created_from: datetime,
+    created_to: datetime
+) -> Row:
+    """
+    Получить итоги доставки сообщений, запланированных в интервале.
+
+    Окна соседних запусков планировщика пересекаются, поэтому сообщения
+    одного запуска отбираются еще и по времени записи в outbox.
+
+    Args:
+        db: Сессия базы данных
+        scheduled_from: Начало интервала scheduled_at (включительно)
+        scheduled_to: Конец интервала scheduled_at (не включительно)
+        created_from: Начало интервала created_at (включительно)
+        created_to: Конец интервала created_at (включительно)
+
+    Returns:
+        Row: (total, sent, pending, first_sent_at, last_sent_at)
+    """
+    result = await db.execute(
+        select(
+            func.count().label("total"),
+            func.count().filter(OutboxMessage.status == OutboxStatus.SENT).label("sent"),
+            func.count().filter(OutboxMessage.status == OutboxStatus.PENDING).label("pending"),
+            func.min(OutboxMessage.sent_at).label("first_sent_at"),
+            func.max(OutboxMessage.sent_at).label("last_sent_at"),
+        ).where(
+            and_(
+                OutboxMessage.scheduled_at >= scheduled_from,
+                OutboxMessage.scheduled_at < scheduled_to,
+                OutboxMessage.created_at >= created_from,
+                OutboxMessage.created_at <= created_to
+            )
+        )
+    )
+    return result.one()
+
+
+async def delete_older_than(db: AsyncSession, age: timedelta) -> int:
+    """
+    Удалить старые записи outbox.
+
+    Args:
+        db: Сессия базы данных
+        age: Возраст записей для удаления
+
+    Returns:
+        int: Количество удаленных записей
+    """
+    result = await db.execute(
+        delete(OutboxMessage)
+        .where(OutboxMessage.created_at < datetime.utcnow() - age)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
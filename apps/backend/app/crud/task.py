@@ -4,11 +4,14 @@ CRUD операции для работы с заданиями (шаблона
 
 from typing import Optional
 from uuid import UUID
-import random
-from sqlalchemy import select, func
+from datetime import datetime
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.assignment import Assignment
 from app.models.task import Task, TaskDifficulty
 from app.schemas.task import TaskCreate, TaskUpdate
+from app.crud import user_stats as user_stats_crud
+from app.services.task_catalog import task_catalog
 
 
 async def get_by_id(db: AsyncSession, task_id: UUID) -> Optional[Task]:
@@ -31,10 +34,11 @@ async def get_all(
     skip: int = 0,
     limit: int = 100,
     category: Optional[str] = None,
-    difficulty: Optional[TaskDifficulty] = None
+    difficulty: Optional[TaskDifficulty] = None,
+    after: Optional[tuple[datetime, UUID]] = None
 ) -> list[Task]:
     """
-    Получить список заданий с пагинацией и фильтрацией.
+    Получить список заданий с пагинацией и фильтрацией (новые первыми).
 
     Args:
         db: Сессия базы данных
@@ -42,6 +46,8 @@ async def get_all(
         limit: Максимальное количество записей
         category: Фильтр по категории (опционально)
         difficulty: Фильтр по сложности (опционально)
+        after: Ключ (created_at, id) последней записи предыдущей страницы;
+            страница выбирается по индексу без OFFSET
 
     Returns:
         list[Task]: Список заданий
@@ -52,8 +58,10 @@ async def get_all(
         query = query.where(Task.category == category)
     if difficulty:
         query = query.where(Task.difficulty == difficulty)
+    if after is not None:
+        query = query.where(tuple_(Task.created_at, Task.id) < tuple_(*after))
 
-    query = query.offset(skip).limit(limit).order_by(Task.created_at.desc())
+    query = query.offset(skip).limit(limit).order_by(Task.created_at.desc(), Task.id.desc())
 
     result = await db.execute(query)
     return list(result.scalars().all())
@@ -74,6 +82,7 @@ async def create(db: AsyncSession, task_data: TaskCreate) -> Task:
     db.add(task)
     await db.commit()
     await db.refresh(task)
+    task_catalog.invalidate()
     return task
 
 
@@ -99,6 +108,7 @@ async def update(db: AsyncSession, task_id: UUID, task_data: TaskUpdate) -> Opti
 
     await db.commit()
     await db.refresh(task)
+    task_catalog.invalidate()
     return task
 
 
@@ -117,11 +127,41 @@ async def delete(db: AsyncSession, task_id: UUID) -> bool:
     if not task:
         return False
 
+    # Назначения задания удаляются каскадно - счетчики их пользователей
+    # пересчитываются в той же транзакции
+    result = await db.execute(
+        select(Assignment.user_id).where(Assignment.task_id == task_id).distinct()
+    )
+    user_ids = list(result.scalars().all())
+
     await db.delete(task)
+    await db.flush()
+    await user_stats_crud.recompute(db, user_ids)
     await db.commit()
+    task_catalog.invalidate()
     return True
 
 
+async def get_random_task_id(
+    db: AsyncSession,
+    category: Optional[str] = None,
+    difficulty: Optional[TaskDifficulty] = None
+) -> Optional[UUID]:
+    """
+    Получить ID случайного задания из каталога в памяти (без запроса к БД,
+    пока каталог актуален).
+
+    Args:
+        db: Сессия базы данных
+        category: Фильтр по категории (опционально)
+        difficulty: Фильтр по сложности (опционально)
+
+    Returns:
+        Optional[UUID]: ID случайного задания или None
+    """
+    return await task_catalog.pick_random_id(db, category=category, difficulty=difficulty)
+
+
 async def get_random_task(
     db: AsyncSession,
     category: Optional[str] = None,
@@ -130,6 +170,9 @@ async def get_random_task(
     """
     Получить случайное задание с опциональной фильтрацией.
 
+    ID выбирается из каталога в памяти, затем задание читается по
+    первичному ключу.
+
     Args:
         db: Сессия базы данных
         category: Фильтр по категории (опционально)
@@ -138,27 +181,17 @@ async def get_random_task(
     Returns:
         Optional[Task]: Случайное задание или None
     """
-    query = select(Task)
-
-    if category:
-        query = query.where(Task.category == category)
-    if difficulty:
-        query = query.where(Task.difficulty == difficulty)
-
-    # Получаем количество подходящих заданий
-    count_query = select(func.count()).select_from(query.alias())
-    count_result = await db.execute(count_query)
-    total_count = count_result.scalar()
-
-    if not total_count:
+    task_id = await get_random_task_id(db, category=category, difficulty=difficulty)
+    if task_id is None:
         return None
 
-    # Выбираем случайное смещение
-    random_offset = random.randint(0, total_count - 1)
-    query = query.offset(random_offset).limit(1)
-
-    result = await db.execute(query)
-    return result.scalar_one_or_none()
+    task = await db.get(Task, task_id)
+    if task is None:
+        # Задание удалено в другой реплике - перечитываем каталог
+        task_catalog.invalidate()
+        task_id = await get_random_task_id(db, category=category, difficulty=difficulty)
+        task = await db.get(Task, task_id) if task_id else None
+    return task
 
 
 async def get_categories(db: AsyncSession) -> list[str]:
@@ -0,0 +1,92 @@
+"""
+CRUD операции для колод заданий пользователей.
+"""
+
+from typing import Sequence
+from uuid import UUID
+from datetime import datetime
+from sqlalchemy import select, func, and_, update, Row
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.task_deck import UserTaskDeck
+
+
+async def pop(db: AsyncSession, user_ids: Sequence[UUID]) -> dict[UUID, Row]:
+    """
+    Снять верхнюю карту с колоды заданий пользователей.
+
+    Одним UPDATE ... RETURNING: строки блокируются (FOR UPDATE), поэтому
+    конкурентные выдачи одному пользователю не получают одну и ту же карту.
+    Пользователи без колоды или с пустой колодой в результат не попадают.
+
+    Args:
+        db: Сессия базы данных
+        user_ids: ID пользователей
+
+    Returns:
+        dict[UUID, Row]: user_id -> строка (user_id, task_id, remaining)
+    """
+    if not user_ids:
+        return {}
+
+    deck_top = (
+        select(
+            UserTaskDeck.user_id,
+            UserTaskDeck.task_ids[1].label("task_id"),
+            func.cardinality(UserTaskDeck.task_ids).label("size"),
+        )
+        .where(
+            and_(
+                UserTaskDeck.user_id.in_(user_ids),
+                func.cardinality(UserTaskDeck.task_ids) > 0
+            )
+        )
+        .with_for_update()
+        .subquery("deck_top")
+    )
+
+    result = await db.execute(
+        update(UserTaskDeck)
+        .where(UserTaskDeck.user_id == deck_top.c.user_id)
+        .values(
+            task_ids=UserTaskDeck.task_ids[2:func.cardinality(UserTaskDeck.task_ids)],
+            updated_at=datetime.utcnow()
+        )
+        .returning(
+            UserTaskDeck.user_id,
+            deck_top.c.task_id,
+            (deck_top.c.size - 1).label("remaining"),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rows = {row.user_id: row for row in result.all()}
+    await db.commit()
+    return rows
+
+
+async def save(db: AsyncSession, decks: dict[UUID, list[UUID]]) -> None:
+    """
+    Записать новые колоды заданий одним INSERT ... ON CONFLICT DO UPDATE.
+
+    Args:
+        db: Сессия базы данных
+        decks: user_id -> колода ID заданий
+    """
+    if not decks:
+        return
+
+    now = datetime.utcnow()
+    statement = insert(UserTaskDeck).values([
+        {"user_id": user_id, "task_ids": deck, "updated_at": now}
+        for user_id, deck in decks.items()
+    ])
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[UserTaskDeck.user_id],
+            set_={
+                "task_ids": statement.excluded.task_ids,
+                "updated_at": statement.excluded.updated_at,
+            }
+        )
+    )
+    await db.commit()
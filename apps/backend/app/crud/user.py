@@ -2,15 +2,18 @@
 CRUD операции для работы с пользователями.
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Sequence
 from uuid import UUID
-from datetime import datetime, date, timedelta
-from sqlalchemy import select, func, and_
+from datetime import datetime, date, time
+from sqlalchemy import select, func, and_, tuple_, update as sql_update, Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User, UserRole
-from app.models.assignment import Assignment, AssignmentStatus
+from app.models.user_stats import UserStats
 from app.schemas.user import UserCreate, UserUpdate, UserProgress
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
+from app.core.timezones import local_today
+from app.crud import user_stats as user_stats_crud
+from app.services.user_cache import user_cache
 
 
 async def get_by_id(db: AsyncSession, user_id: UUID) -> Optional[User]:
@@ -71,9 +74,9 @@ async def create(db: AsyncSession, user_data: UserCreate) -> User:
     """
     user_dict = user_data.model_dump(exclude={"password"})
 
-    # Хешируем пароль, если он предоставлен
+    # Хешируем пароль, если он предоставлен (bcrypt - вне event loop)
     if user_data.password:
-        user_dict["hashed_password"] = get_password_hash(user_data.password)
+        user_dict["hashed_password"] = await get_password_hash_async(user_data.password)
 
     user = User(**user_dict)
     db.add(user)
@@ -99,15 +102,78 @@ async def update(db: AsyncSession, user_id: UUID, user_data: UserUpdate) -> Opti
         return None
 
     update_data = user_data.model_dump(exclude_unset=True)
+    # Расписание рассылки не сбрасывается в NULL: пропуск поля оставляет текущее значение
+    for field in ("timezone", "morning_time", "evening_time"):
+        if update_data.get(field, "") is None:
+            del update_data[field]
     for field, value in update_data.items():
         setattr(user, field, value)
 
+    # Новый Telegram ID - прежняя блокировка к нему не относится
+    if "telegram_id" in update_data:
+        user.telegram_blocked_at = None
+
     user.updated_at = datetime.utcnow()
     await db.commit()
+    await user_cache.invalidate([user_id])
     await db.refresh(user)
     return user
 
 
+async def set_active(db: AsyncSession, user_id: UUID, is_active: bool) -> Optional[User]:
+    """
+    Активировать или деактивировать пользователя.
+
+    Args:
+        db: Сессия базы данных
+        user_id: ID пользователя
+        is_active: Новый статус активности
+
+    Returns:
+        Optional[User]: Обновленный пользователь или None
+    """
+    user = await get_by_id(db, user_id)
+    if not user:
+        return None
+
+    user.is_active = is_active
+    if not is_active:
+        # Выданные токены перестают обновляться и проходить полную проверку
+        user.token_version = User.token_version + 1
+    user.updated_at = datetime.utcnow()
+    await db.commit()
+    await user_cache.invalidate([user_id])
+    await db.refresh(user)
+    return user
+
+
+async def revoke_tokens(db: AsyncSession, user_id: UUID) -> bool:
+    """
+    Отозвать все выданные пользователю токены.
+
+    Увеличивает users.token_version: refresh токены с прежней версией
+    отклоняются сразу, access токены - на эндпоинтах с полной проверкой
+    пользователя сразу, а на эндпоинтах с авторизацией по утверждениям -
+    по истечении срока действия.
+
+    Args:
+        db: Сессия базы данных
+        user_id: ID пользователя
+
+    Returns:
+        bool: True если пользователь найден
+    """
+    result = await db.execute(
+        sql_update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    await user_cache.invalidate([user_id])
+    return result.rowcount > 0
+
+
 async def delete(db: AsyncSession, user_id: UUID) -> bool:
     """
     Удалить пользователя.
@@ -125,112 +191,124 @@ async def delete(db: AsyncSession, user_id: UUID) -> bool:
 
     await db.delete(user)
     await db.commit()
+    await user_cache.invalidate([user_id])
     return True
 
 
-async def get_user_progress(db: AsyncSession, user_id: UUID) -> UserProgress:
+async def get_local_date(db: AsyncSession, user_id: UUID) -> date:
     """
-    Получить статистику прогресса пользователя.
+    Текущая дата в часовом поясе пользователя.
+
+    Часовой пояс берется из кэша аутентифицированных пользователей, а при
+    промахе - из БД по первичному ключу.
 
     Args:
         db: Сессия базы данных
         user_id: ID пользователя
 
     Returns:
-        UserProgress: Статистика пользователя
+        date: Локальная дата пользователя
     """
-    # Общее количество заданий
-    total_tasks_query = await db.execute(
-        select(func.count(Assignment.id)).where(Assignment.user_id == user_id)
-    )
-    total_tasks = total_tasks_query.scalar() or 0
+    cached = await user_cache.get(user_id)
+    if cached is not None:
+        return local_today(cached.timezone)
 
-    # Количество выполненных заданий
-    completed_tasks_query = await db.execute(
-        select(func.count(Assignment.id)).where(
-            and_(
-                Assignment.user_id == user_id,
-                Assignment.status == AssignmentStatus.COMPLETED
-            )
-        )
-    )
-    completed_tasks = completed_tasks_query.scalar() or 0
+    result = await db.execute(select(User.timezone).where(User.id == user_id))
+    return local_today(result.scalar_one_or_none())
+
+
+def _progress_from_stats(stats: Optional[UserStats], today: date) -> UserProgress:
+    """
+    Собрать прогресс пользователя из материализованной статистики.
+
+    Args:
+        stats: Статистика пользователя (None - назначений еще не было)
+        today: Текущая дата
+
+    Returns:
+        UserProgress: Статистика пользователя
+    """
+    total_tasks = stats.total_tasks if stats else 0
+    completed_tasks = stats.completed_tasks if stats else 0
 
     # Процент выполнения
     completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0.0
 
-    # Подсчет streak (дней подряд с выполненными заданиями)
-    streak_days = await _calculate_streak_days(db, user_id)
+    # Серии поддерживаются инкрементально; пропуск дня учитывается при чтении
+    current_streak = user_stats_crud.effective_current_streak(stats, today)
 
     return UserProgress(
         total_tasks=total_tasks,
         completed_tasks=completed_tasks,
         completion_rate=round(completion_rate, 2),
-        streak_days=streak_days
+        streak_days=current_streak,
+        current_streak=current_streak,
+        longest_streak=stats.longest_streak if stats else 0
     )
 
 
-async def _calculate_streak_days(db: AsyncSession, user_id: UUID) -> int:
+async def get_user_progress(db: AsyncSession, user_id: UUID) -> UserProgress:
     """
-    Подсчитать количество дней подряд с выполненными заданиями.
+    Получить статистику прогресса пользователя.
 
     Args:
         db: Сессия базы данных
         user_id: ID пользователя
 
     Returns:
-        int: Количество дней подряд
+        UserProgress: Статистика пользователя
     """
-    # Получаем все выполненные задания, отсортированные по дате назначения
-    result = await db.execute(
-        select(Assignment.assigned_date)
-        .where(
-            and_(
-                Assignment.user_id == user_id,
-                Assignment.status == AssignmentStatus.COMPLETED
-            )
-        )
-        .order_by(Assignment.assigned_date.desc())
-    )
-    completed_dates = [row[0] for row in result.all()]
+    # Счетчики материализованы в user_stats - чтение по первичному ключу
+    stats = await user_stats_crud.get(db, user_id)
+    return _progress_from_stats(stats, await get_local_date(db, user_id))
 
-    if not completed_dates:
-        return 0
 
-    # Проверяем, есть ли выполненное задание сегодня или вчера
-    today = date.today()
-    if completed_dates[0] not in [today, today - timedelta(days=1)]:
-        return 0
+async def get_users_progress(
+    db: AsyncSession,
+    user_ids: Sequence[UUID]
+) -> Dict[UUID, UserProgress]:
+    """
+    Получить статистику прогресса группы пользователей одним запросом.
 
-    # Подсчитываем streak
-    streak = 1
-    current_date = completed_dates[0]
+    Args:
+        db: Сессия базы данных
+        user_ids: ID пользователей
 
-    for completed_date in completed_dates[1:]:
-        expected_date = current_date - timedelta(days=1)
-        if completed_date == expected_date:
-            streak += 1
-            current_date = completed_date
-        else:
-            break
+    Returns:
+        Dict[UUID, UserProgress]: Прогресс по ID; несуществующие пользователи
+            в результат не попадают
+    """
+    if not user_ids:
+        return {}
 
-    return streak
+    result = await db.execute(
+        select(User.id, User.timezone, UserStats)
+        .outerjoin(UserStats, UserStats.user_id == User.id)
+        .where(User.id.in_(user_ids))
+    )
+    return {
+        user_id: _progress_from_stats(stats, local_today(timezone))
+        for user_id, timezone, stats in result.all()
+    }
 
 
 async def get_all(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
-    is_active: Optional[bool] = None
+    is_active: Optional[bool] = None,
+    after: Optional[tuple[datetime, UUID]] = None
 ) -> list[User]:
     """
-    Получить список пользователей с пагинацией.
+    Получить список пользователей с пагинацией (новые первыми).
 
     Args:
         db: Сессия базы данных
         skip: Количество записей для пропуска
         limit: Максимальное количество записей
         is_active: Фильтр по статусу активности (опционально)
+        after: Ключ (created_at, id) последней записи предыдущей страницы;
+            страница выбирается по индексу без OFFSET
 
     Returns:
         list[User]: Список пользователей
@@ -239,8 +317,206 @@ async def get_all(
 
     if is_active is not None:
         query = query.where(User.is_active == is_active)
+    if after is not None:
+        query = query.where(tuple_(User.created_at, User.id) < tuple_(*after))
 
-    query = query.offset(skip).limit(limit).order_by(User.created_at.desc())
+    query = query.offset(skip).limit(limit).order_by(User.created_at.desc(), User.id.desc())
 
     result = await db.execute(query)
     return list(result.scalars().all())
+
+
+async def iter_active_recipients(
+    db: AsyncSession,
+    chunk_size: int = 1000,
+    where: Sequence = ()
+) -> AsyncIterator[list[Row]]:
+    """
+    Потоково перебрать активных пользователей с Telegram ID порциями.
+
+    Пользователи, заблокировавшие бота (telegram_blocked_at), пропускаются.
+
+    Использует keyset-пагинацию по (created_at, id), поэтому стоимость каждой
+    порции не зависит от её позиции. Возвращаются лёгкие строки, а не ORM
+    объекты, чтобы пользователи не накапливались в identity map сессии.
+
+    Args:
+        db: Сессия базы данных
+        chunk_size: Размер порции
+        where: Дополнительные условия отбора
+
+    Yields:
+        list[Row]: Строки (user_id, name, telegram_id, created_at)
+    """
+    last_key = None
+
+    while True:
+        query = select(
+            User.id.label("user_id"),
+            User.name,
+            User.telegram_id,
+            User.created_at,
+        ).where(
+            and_(
+                User.is_active.is_(True),
+                User.telegram_id.is_not(None),
+                User.telegram_blocked_at.is_(None),
+                *where
+            )
+        )
+
+        if last_key is not None:
+            query = query.where(tuple_(User.created_at, User.id) > tuple_(*last_key))
+
+        query = query.order_by(User.created_at.asc(), User.id.asc()).limit(chunk_size)
+
+        result = await db.execute(query)
+        rows = list(result.all())
+        if not rows:
+            return
+
+        yield rows
+
+        if len(rows) < chunk_size:
+            return
+        last_key = (rows[-1].created_at, rows[-1].user_id)
+
+
+async def get_recipient_timezones(db: AsyncSession) -> list[str]:
+    """
+    Получить часовые пояса, в которых есть получатели рассылки.
+
+    Args:
+        db: Сессия базы данных
+
+    Returns:
+        list[str]: Различные часовые пояса пользователей
+    """
+    result = await db.execute(
+        select(User.timezone)
+        .where(
+            and_(
+                User.is_active.is_(True),
+                User.telegram_id.is_not(None),
+                User.telegram_blocked_at.is_(None)
+            )
+        )
+        .distinct()
+    )
+    return list(result.scalars().all())
+
+
+def iter_recipients_in_timezones(
+    db: AsyncSession,
+    timezones: Sequence[str],
+    chunk_size: int = 1000
+) -> AsyncIterator[list[Row]]:
+    """
+    Перебрать получателей из указанных часовых поясов.
+
+    Args:
+        db: Сессия базы данных
+        timezones: Часовые пояса с одинаковой локальной датой
+        chunk_size: Размер порции
+
+    Returns:
+        AsyncIterator[list[Row]]: Порции строк, как у iter_active_recipients
+    """
+    return iter_active_recipients(
+        db, chunk_size=chunk_size, where=[User.timezone.in_(timezones)]
+    )
+
+
+def iter_due_recipients(
+    db: AsyncSession,
+    time_field: str,
+    timezones: Sequence[str],
+    after: Optional[time],
+    until: time,
+    chunk_size: int = 1000
+) -> AsyncIterator[list[Row]]:
+    """
+    Перебрать получателей, у которых наступило локальное время рассылки.
+
+    Отбирает пользователей из указанных часовых поясов, чье время
+    (morning_time или evening_time) попадает в интервал (after, until].
+    Условие покрывается индексом (timezone, <time_field>).
+
+    Args:
+        db: Сессия базы данных
+        time_field: Поле времени рассылки: "morning_time" или "evening_time"
+        timezones: Часовые пояса с одинаковым локальным интервалом
+        after: Начало интервала (не включительно); None - с начала суток
+        until: Конец интервала (включительно)
+        chunk_size: Размер порции
+
+    Returns:
+        AsyncIterator[list[Row]]: Порции строк, как у iter_active_recipients
+    """
+    column = getattr(User, time_field)
+    where = [User.timezone.in_(timezones), column <= until]
+    if after is not None:
+        where.append(column > after)
+    return iter_active_recipients(db, chunk_size=chunk_size, where=where)
+
+
+async def mark_telegram_blocked(db: AsyncSession, user_ids: list[UUID]) -> int:
+    """
+    Отметить пользователей, которым Telegram больше не доставляет сообщения.
+
+    Args:
+        db: Сессия базы данных
+        user_ids: ID пользователей
+
+    Returns:
+        int: Количество отмеченных пользователей
+    """
+    if not user_ids:
+        return 0
+
+    result = await db.execute(
+        sql_update(User)
+        .where(
+            and_(
+                User.id.in_(user_ids),
+                User.telegram_blocked_at.is_(None)
+            )
+        )
+        .values(telegram_blocked_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    await user_cache.invalidate(user_ids)
+    return result.rowcount
+
+
+async def clear_telegram_blocked(db: AsyncSession, user: User) -> None:
+    """
+    Снять отметку блокировки (пользователь снова пишет боту).
+
+    Args:
+        db: Сессия базы данных
+        user: Пользователь
+    """
+    if user.telegram_blocked_at is None:
+        return
+
+    user.telegram_blocked_at = None
+    await db.commit()
+    await user_cache.invalidate([user.id])
+
+
+async def count_telegram_blocked(db: AsyncSession) -> int:
+    """
+    Подсчитать пользователей, исключенных из рассылки из-за блокировки бота.
+
+    Args:
+        db: Сессия базы данных
+
+    Returns:
+        int: Количество пользователей
+    """
+    result = await db.execute(
+        select(func.count(User.id)).where(User.telegram_blocked_at.is_not(None))
+    )
+    return result.scalar() or 0
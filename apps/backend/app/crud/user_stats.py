@@ -0,0 +1,288 @@
+"""
+CRUD операции для материализованной статистики прогресса пользователей.
+
+Функции изменения не делают commit: они вызываются внутри транзакции,
+которая создает или выполняет назначения, и фиксируются вместе с ней.
+"""
+
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Optional, Sequence
+from uuid import UUID
+from sqlalchemy import select, update, func, literal, case, cast, Date, Integer, Row
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.assignment import Assignment, AssignmentStatus
+from app.models.user import User
+from app.models.user_stats import UserStats
+
+
+async def get(db: AsyncSession, user_id: UUID) -> Optional[UserStats]:
+    """
+    Получить статистику пользователя по первичному ключу.
+
+    Args:
+        db: Сессия базы данных
+        user_id: ID пользователя
+
+    Returns:
+        Optional[UserStats]: Статистика или None, если назначений еще не было
+    """
+    return await db.get(UserStats, user_id)
+
+
+def effective_current_streak(stats: Optional[UserStats], today: date) -> int:
+    """
+    Текущая серия с учетом пропуска.
+
+    В user_stats хранится серия, заканчивающаяся на last_completed_date;
+    если с тех пор пропущен хотя бы один день, серия прервана.
+
+    Args:
+        stats: Статистика пользователя (или None)
+        today: Текущая дата
+
+    Returns:
+        int: Текущая серия дней подряд
+    """
+    if stats is None or stats.last_completed_date is None:
+        return 0
+    if stats.last_completed_date < today - timedelta(days=1):
+        return 0
+    return stats.current_streak
+
+
+async def add_assigned(db: AsyncSession, user_ids: Sequence[UUID]) -> None:
+    """
+    Учесть новые назначения (по одному на каждое вхождение user_id).
+
+    Args:
+        db: Сессия базы данных
+        user_ids: ID пользователей созданных назначений
+    """
+    if not user_ids:
+        return
+
+    now = datetime.utcnow()
+    statement = insert(UserStats).values([
+        {
+            "user_id": user_id,
+            "total_tasks": count,
+            "completed_tasks": 0,
+            "current_streak": 0,
+            "longest_streak": 0,
+            "updated_at": now,
+        }
+        for user_id, count in Counter(user_ids).items()
+    ])
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[UserStats.user_id],
+            set_={
+                "total_tasks": UserStats.total_tasks + statement.excluded.total_tasks,
+                "updated_at": statement.excluded.updated_at,
+            }
+        )
+    )
+
+
+async def add_completed(db: AsyncSession, user_id: UUID, completed_date: date) -> None:
+    """
+    Учесть выполнение задания и обновить серию за O(1).
+
+    Серия продолжается, если предыдущее выполнение было накануне, не
+    меняется при повторном выполнении в тот же день или выполнении за более
+    раннюю дату и начинается заново после пропуска.
+
+    Args:
+        db: Сессия базы данных
+        user_id: ID пользователя
+        completed_date: Дата, к которой относится выполненное задание
+    """
+    statement = insert(UserStats).values(
+        user_id=user_id,
+        total_tasks=1,
+        completed_tasks=1,
+        current_streak=1,
+        longest_streak=1,
+        last_completed_date=completed_date,
+        updated_at=datetime.utcnow(),
+    )
+    last = UserStats.last_completed_date
+    new_streak = case(
+        (last.is_(None), 1),
+        (last >= completed_date, UserStats.current_streak),
+        (last == completed_date - timedelta(days=1), UserStats.current_streak + 1),
+        else_=1
+    )
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[UserStats.user_id],
+            set_={
+                "completed_tasks": UserStats.completed_tasks + 1,
+                "current_streak": new_streak,
+                "longest_streak": func.greatest(UserStats.longest_streak, new_streak),
+                "last_completed_date": func.greatest(last, statement.excluded.last_completed_date),
+                "updated_at": statement.excluded.updated_at,
+            }
+        )
+    )
+
+
+def _streaks_query(user_ids: Optional[Sequence[UUID]], today: Optional[date] = None):
+    """
+    Запрос серий по истории назначений (gaps-and-islands).
+
+    Дни одной серии имеют одинаковую разность (дата - номер дня по порядку),
+    по ней дни группируются в серии. Вся агрегация выполняется в БД, и на
+    пользователя возвращается одна строка независимо от длины истории.
+
+    Args:
+        user_ids: ID пользователей (None - все пользователи)
+        today: Текущая дата для расчета прерванной серии (None - локальная
+            дата каждого пользователя по его часовому поясу)
+
+    Returns:
+        Select: (user_id, current_streak, last_streak, longest_streak, last_completed_date)
+    """
+    day = func.coalesce(Assignment.assigned_date, cast(Assignment.completed_at, Date))
+    days = select(Assignment.user_id, day.label("day")).where(
+        Assignment.status == AssignmentStatus.COMPLETED
+    )
+    if user_ids is not None:
+        days = days.where(Assignment.user_id.in_(user_ids))
+    days = days.distinct().subquery("days")
+
+    islands = select(
+        days.c.user_id,
+        days.c.day,
+        (
+            days.c.day
+            - cast(func.row_number().over(partition_by=days.c.user_id, order_by=days.c.day), Integer)
+        ).label("island"),
+    ).subquery("islands")
+
+    runs = select(
+        islands.c.user_id,
+        func.count().label("length"),
+        func.max(islands.c.day).label("last_day"),
+        func.max(func.max(islands.c.day)).over(partition_by=islands.c.user_id).label("user_last_day"),
+    ).group_by(islands.c.user_id, islands.c.island).subquery("runs")
+
+    last_streak = func.max(runs.c.length).filter(runs.c.last_day == runs.c.user_last_day)
+    last_day = func.max(runs.c.last_day)
+    if today is None:
+        # Текущая дата в часовом поясе пользователя (как у выдачи заданий)
+        yesterday = cast(func.timezone(User.timezone, func.now()), Date) - 1
+    else:
+        yesterday = literal(today - timedelta(days=1), Date)
+    query = select(
+        runs.c.user_id,
+        case((last_day >= yesterday, last_streak), else_=0).label("current_streak"),
+        last_streak.label("last_streak"),
+        func.max(runs.c.length).label("longest_streak"),
+        last_day.label("last_completed_date"),
+    )
+    if today is None:
+        query = query.join(User, User.id == runs.c.user_id).group_by(runs.c.user_id, User.timezone)
+    else:
+        query = query.group_by(runs.c.user_id)
+    return query
+
+
+async def get_streaks(
+    db: AsyncSession,
+    user_ids: Optional[Sequence[UUID]] = None,
+    today: Optional[date] = None
+) -> list[Row]:
+    """
+    Рассчитать серии по истории назначений, не используя user_stats.
+
+    Для сверки и пересчета счетчиков и для отчетов сразу по всем
+    пользователям.
+
+    Args:
+        db: Сессия базы данных
+        user_ids: ID пользователей (None - все пользователи с выполненными заданиями)
+        today: Текущая дата (по умолчанию - локальная дата каждого пользователя)
+
+    Returns:
+        list[Row]: (user_id, current_streak, last_streak, longest_streak,
+            last_completed_date); last_streak - серия, заканчивающаяся на
+            last_completed_date (так она хранится в user_stats)
+    """
+    result = await db.execute(_streaks_query(user_ids, today))
+    return list(result.all())
+
+
+async def recompute(db: AsyncSession, user_ids: Optional[Sequence[UUID]] = None) -> int:
+    """
+    Пересчитать счетчики и серии по истории назначений.
+
+    Используется на редких путях, где инкремент неприменим (удаление
+    назначения, ручная смена статуса), и для сверки всех пользователей.
+    Выполняется двумя set-based запросами независимо от числа пользователей.
+
+    Args:
+        db: Сессия базы данных
+        user_ids: ID пользователей (None - все пользователи)
+
+    Returns:
+        int: Количество пользователей с назначениями
+    """
+    if user_ids is not None and not user_ids:
+        return 0
+
+    now = datetime.utcnow()
+    # Пользователи без оставшихся назначений получают нули
+    reset = update(UserStats).values(
+        total_tasks=0,
+        completed_tasks=0,
+        current_streak=0,
+        longest_streak=0,
+        last_completed_date=None,
+        updated_at=now
+    )
+    if user_ids is not None:
+        reset = reset.where(UserStats.user_id.in_(user_ids))
+    await db.execute(reset.execution_options(synchronize_session=False))
+
+    counts = select(
+        Assignment.user_id,
+        func.count().label("total_tasks"),
+        func.count().filter(Assignment.status == AssignmentStatus.COMPLETED).label("completed_tasks"),
+    )
+    if user_ids is not None:
+        counts = counts.where(Assignment.user_id.in_(user_ids))
+    counts = counts.group_by(Assignment.user_id).subquery("counts")
+    streaks = _streaks_query(user_ids).subquery("streaks")
+
+    statement = insert(UserStats).from_select(
+        [
+            "user_id", "total_tasks", "completed_tasks", "current_streak",
+            "longest_streak", "last_completed_date", "updated_at",
+        ],
+        select(
+            counts.c.user_id,
+            counts.c.total_tasks,
+            counts.c.completed_tasks,
+            func.coalesce(streaks.c.last_streak, 0),
+            func.coalesce(streaks.c.longest_streak, 0),
+            streaks.c.last_completed_date,
+            literal(now),
+        ).outerjoin(streaks, streaks.c.user_id == counts.c.user_id)
+    )
+    result = await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[UserStats.user_id],
+            set_={
+                "total_tasks": statement.excluded.total_tasks,
+                "completed_tasks": statement.excluded.completed_tasks,
+                "current_streak": statement.excluded.current_streak,
+                "longest_streak": statement.excluded.longest_streak,
+                "last_completed_date": statement.excluded.last_completed_date,
+                "updated_at": now,
+            }
+        )
+    )
+    return result.rowcount
@@ -9,6 +9,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.database import close_db
+from app.core.pagination import NEXT_CURSOR_HEADER
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +31,9 @@ async def lifespan(app: FastAPI):
     if settings.TELEGRAM_BOT_TOKEN:
         print("📋 TELEGRAM_BOT_TOKEN found, starting scheduler...", flush=True)
         sys.stdout.flush()
+        from app.services.telegram_sender import telegram_sender
         from app.services.task_scheduler import task_scheduler
+        await telegram_sender.open()
         task_scheduler.start()
         scheduler = task_scheduler
         print("✅ Task scheduler started successfully", flush=True)
@@ -47,9 +50,15 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down application...")
 
     if scheduler:
-        scheduler.stop()
+        await scheduler.stop()
         logger.info("Task scheduler stopped")
 
+        from app.services.telegram_sender import telegram_sender
+        await telegram_sender.close()
+
+    from app.services.user_cache import user_cache
+    await user_cache.close()
+
     await close_db()
 
 
@@ -69,6 +78,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
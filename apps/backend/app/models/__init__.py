@@ -6,6 +6,9 @@
 from app.models.user import User, UserRole
 from app.models.task import Task, TaskDifficulty
 from app.models.assignment import Assignment, AssignmentStatus
+from app.models.outbox import OutboxMessage, OutboxKind, OutboxStatus
+from app.models.user_stats import UserStats
+from app.models.task_deck import UserTaskDeck
 
 __all__ = [
     "User",
@@ -14,4 +17,9 @@ __all__ = [
     "TaskDifficulty",
     "Assignment",
     "AssignmentStatus",
+    "OutboxMessage",
+    "OutboxKind",
+    "OutboxStatus",
+    "UserStats",
+    "UserTaskDeck",
 ]
@@ -51,7 +51,8 @@ class Assignment(Base):
 
     # Composite indexes для оптимизации запросов
     __table_args__ = (
-        Index('ix_assignments_user_date', 'user_id', 'assigned_date'),
+        # Keyset-пагинация истории: (assigned_date DESC NULLS FIRST, id DESC) - обратный проход
+        Index('ix_assignments_user_date_id', 'user_id', 'assigned_date', 'id'),
         Index('ix_assignments_user_status', 'user_id', 'status'),
     )
 
@@ -0,0 +1,74 @@
+"""
+Модель исходящего сообщения (outbox) для запланированных уведомлений.
+"""
+
+from datetime import datetime
+import uuid
+import enum
+from sqlalchemy import Column, Text, DateTime, Date, Integer, BigInteger, ForeignKey, Enum as SQLEnum, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class OutboxKind(str, enum.Enum):
+    """Типы запланированных уведомлений."""
+    MORNING = "morning"
+    EVENING = "evening"
+
+
+class OutboxStatus(str, enum.Enum):
+    """Статусы доставки сообщения."""
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    BLOCKED = "blocked"
+
+
+class OutboxMessage(Base):
+    """
+    Модель исходящего сообщения.
+
+    Планировщик записывает сообщения в outbox, а отдельный обработчик
+    доставляет их и отмечает отправленными. Уникальность (user_id, kind,
+    target_date) служит ключом идемпотентности: повторное планирование
+    не создает дублей, а прерванная рассылка продолжается с места остановки.
+    Несколько обработчиков делят очередь, захватывая непересекающиеся порции
+    (FOR UPDATE SKIP LOCKED) на срок lease.
+
+    Attributes:
+        id: Уникальный идентификатор сообщения (UUID)
+        user_id: ID пользователя (FK к User)
+        kind: Тип уведомления (morning/evening)
+        target_date: Дата, к которой относится уведомление
+        chat_id: ID чата в Telegram
+        text: Текст сообщения
+        status: Статус доставки (pending/sent/failed/blocked)
+        attempts: Количество неудачных попыток доставки
+        locked_until: Срок, до которого сообщение захвачено обработчиком (lease)
+        scheduled_at: Время, не раньше которого сообщение можно отправить
+        created_at: Дата и время создания записи
+        sent_at: Дата и время доставки (опционально)
+    """
+
+    __tablename__ = "outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(SQLEnum(OutboxKind), nullable=False)
+    target_date = Column(Date, nullable=False)
+    chat_id = Column(BigInteger, nullable=False)
+    text = Column(Text, nullable=False)
+    status = Column(SQLEnum(OutboxStatus), nullable=False, default=OutboxStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    locked_until = Column(DateTime, nullable=True)
+    scheduled_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'kind', 'target_date', name='uq_outbox_user_kind_date'),
+        Index('ix_outbox_status_scheduled', 'status', 'scheduled_at', 'id'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<OutboxMessage(id={self.id}, user_id={self.user_id}, kind={self.kind}, status={self.status})>"
@@ -5,7 +5,7 @@
 from datetime import datetime
 import uuid
 import enum
-from sqlalchemy import Column, String, Text, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -44,5 +44,10 @@ class Task(Base):
     # Relationships
     assignments = relationship("Assignment", back_populates="task", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Keyset-пагинация по (created_at, id)
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+    )
+
     def __repr__(self) -> str:
         return f"<Task(id={self.id}, title={self.title}, category={self.category}, difficulty={self.difficulty})>"
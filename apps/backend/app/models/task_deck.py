@@ -0,0 +1,32 @@
+"""
+Модель колоды заданий пользователя.
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from app.core.database import Base
+
+
+class UserTaskDeck(Base):
+    """
+    Перемешанная колода еще не выданных заданий (ротация без повторов).
+
+    Колода меняется при каждой выдаче задания, поэтому хранится отдельно
+    от users: ежедневная запись затрагивает узкую строку этой таблицы, а не
+    строку пользователя, которую читают аутентификация и кэш пользователей.
+
+    Attributes:
+        user_id: ID пользователя (PK, FK к User)
+        task_ids: ID заданий колоды; первый элемент выдается следующим
+        updated_at: Дата и время последнего изменения колоды
+    """
+
+    __tablename__ = "user_task_decks"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    task_ids = Column(ARRAY(UUID(as_uuid=True)), nullable=False, default=list, server_default="{}")
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<UserTaskDeck(user_id={self.user_id}, size={len(self.task_ids or [])})>"
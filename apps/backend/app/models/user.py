@@ -2,16 +2,23 @@
 Модель пользователя для системы психолог-бота.
 """
 
-from datetime import datetime
+from datetime import datetime, time
 from typing import List
 import uuid
 import enum
-from sqlalchemy import Column, String, Boolean, DateTime, Enum as SQLEnum, BigInteger
+from sqlalchemy import Column, String, Boolean, DateTime, Time, Integer, Index, Enum as SQLEnum, BigInteger
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from app.core.config import settings
 from app.core.database import Base
 
 
+def _default_time(value: str) -> time:
+    """Преобразовать время из настроек (HH:MM) в time."""
+    hour, minute = map(int, value.split(":"))
+    return time(hour, minute)
+
+
 class UserRole(str, enum.Enum):
     """Роли пользователей в системе."""
     USER = "user"
@@ -30,6 +37,12 @@ class User(Base):
         hashed_password: Хешированный пароль для веб-доступа
         role: Роль пользователя (user/admin)
         is_active: Флаг активности аккаунта
+        telegram_blocked_at: Когда Telegram сообщил, что писать пользователю нельзя
+            (бот заблокирован, чат не найден); такие пользователи не получают рассылку
+        timezone: Часовой пояс пользователя (IANA, например Europe/Moscow)
+        morning_time: Локальное время утреннего задания
+        evening_time: Локальное время вечернего напоминания
+        token_version: Версия токенов; увеличение отзывает все выданные токены
         created_at: Дата и время создания
         updated_at: Дата и время последнего обновления
         assignments: Связь с назначенными заданиями
@@ -44,11 +57,24 @@ class User(Base):
     hashed_password = Column(String(255), nullable=True)
     role = Column(SQLEnum(UserRole), nullable=False, default=UserRole.USER)
     is_active = Column(Boolean, default=True, nullable=False)
+    telegram_blocked_at = Column(DateTime, nullable=True)
+    timezone = Column(String(64), nullable=False, default=lambda: settings.SCHEDULER_TIMEZONE)
+    morning_time = Column(Time, nullable=False, default=lambda: _default_time(settings.MORNING_TASK_TIME))
+    evening_time = Column(Time, nullable=False, default=lambda: _default_time(settings.EVENING_REMINDER_TIME))
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     # Relationships
     assignments = relationship("Assignment", back_populates="user", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Поиск пользователей, у которых наступило время рассылки
+        Index("ix_users_timezone_morning_time", "timezone", "morning_time"),
+        Index("ix_users_timezone_evening_time", "timezone", "evening_time"),
+        # Keyset-пагинация по (created_at, id)
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
+
     def __repr__(self) -> str:
         return f"<User(id={self.id}, name={self.name}, email={self.email}, role={self.role})>"
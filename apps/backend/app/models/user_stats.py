@@ -0,0 +1,43 @@
+"""
+Модель материализованной статистики прогресса пользователя.
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class UserStats(Base):
+    """
+    Счетчики прогресса пользователя.
+
+    Обновляются в той же транзакции, что и назначения (создание и
+    выполнение), поэтому чтение прогресса - один запрос по первичному ключу
+    вместо COUNT по всей истории назначений.
+
+    Attributes:
+        user_id: ID пользователя (PK, FK к User)
+        total_tasks: Количество назначенных заданий
+        completed_tasks: Количество выполненных заданий
+        current_streak: Текущая серия дней подряд с выполненными заданиями
+        longest_streak: Самая длинная серия
+        last_completed_date: Дата последнего выполненного задания
+        updated_at: Дата и время последнего обновления
+    """
+
+    __tablename__ = "user_stats"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_tasks = Column(Integer, nullable=False, default=0)
+    completed_tasks = Column(Integer, nullable=False, default=0)
+    current_streak = Column(Integer, nullable=False, default=0)
+    longest_streak = Column(Integer, nullable=False, default=0)
+    last_completed_date = Column(Date, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<UserStats(user_id={self.user_id}, total={self.total_tasks}, "
+            f"completed={self.completed_tasks}, streak={self.current_streak})>"
+        )
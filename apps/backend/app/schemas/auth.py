@@ -3,7 +3,9 @@ Pydantic схемы для аутентификации и авторизаци
 """
 
 from typing import Optional
+from uuid import UUID
 from pydantic import BaseModel, EmailStr, Field
+from app.models.user import UserRole
 from app.schemas.user import UserResponse
 
 
@@ -47,3 +49,11 @@ class TokenPayload(BaseModel):
     sub: str = Field(..., description="Subject (обычно user_id)")
     exp: int = Field(..., description="Expiration time (timestamp)")
     type: str = Field(..., description="Тип токена (access или refresh)")
+    role: Optional[UserRole] = Field(None, description="Роль пользователя (только access)")
+    active: Optional[bool] = Field(None, description="Активен ли аккаунт (только access)")
+    ver: Optional[int] = Field(None, description="Версия токенов пользователя на момент выдачи")
+
+    @property
+    def user_id(self) -> UUID:
+        """ID пользователя из subject."""
+        return UUID(self.sub)
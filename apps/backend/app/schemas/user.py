@@ -2,9 +2,10 @@
 Pydantic схемы для валидации данных пользователей.
 """
 
-from datetime import datetime
+from datetime import datetime, time
 from typing import Optional
 from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from app.models.user import UserRole
 
@@ -34,6 +35,29 @@ class UserUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     email: Optional[EmailStr] = None
     telegram_id: Optional[int] = None
+    timezone: Optional[str] = Field(None, max_length=64, description="Часовой пояс IANA, например Europe/Moscow")
+    morning_time: Optional[time] = Field(None, description="Локальное время утреннего задания (HH:MM)")
+    evening_time: Optional[time] = Field(None, description="Локальное время вечернего напоминания (HH:MM)")
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, v: Optional[str]) -> Optional[str]:
+        """Валидация часового пояса."""
+        if v is None:
+            return v
+        try:
+            ZoneInfo(v)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError("Неизвестный часовой пояс")
+        return v
+
+    @field_validator("morning_time", "evening_time")
+    @classmethod
+    def validate_delivery_time(cls, v: Optional[time]) -> Optional[time]:
+        """Время рассылки с точностью до минуты."""
+        if v is None:
+            return v
+        return v.replace(second=0, microsecond=0, tzinfo=None)
 
 
 class UserInDB(UserBase):
@@ -41,6 +65,11 @@ class UserInDB(UserBase):
     id: UUID
     role: UserRole
     is_active: bool
+    telegram_blocked_at: Optional[datetime] = None
+    timezone: Optional[str] = None
+    morning_time: Optional[time] = None
+    evening_time: Optional[time] = None
+    token_version: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -53,6 +82,10 @@ class UserResponse(UserBase):
     id: UUID
     role: UserRole
     is_active: bool
+    telegram_blocked_at: Optional[datetime] = None
+    timezone: Optional[str] = None
+    morning_time: Optional[time] = None
+    evening_time: Optional[time] = None
     created_at: datetime
     updated_at: datetime
 
@@ -65,7 +98,9 @@ class UserProgress(BaseModel):
     total_tasks: int = Field(..., description="Общее количество назначенных заданий")
     completed_tasks: int = Field(..., description="Количество выполненных заданий")
     completion_rate: float = Field(..., ge=0, le=100, description="Процент выполнения заданий")
-    streak_days: int = Field(0, ge=0, description="Количество дней подряд с выполненными заданиями")
+    streak_days: int = Field(0, ge=0, description="Количество дней подряд с выполненными заданиями (= current_streak)")
+    current_streak: int = Field(0, ge=0, description="Текущая серия дней подряд с выполненными заданиями")
+    longest_streak: int = Field(0, ge=0, description="Самая длинная серия дней подряд")
 
     class Config:
         from_attributes = True
@@ -7,7 +7,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud import user as user_crud
 from app.schemas.auth import RegisterRequest, RegisterResponse, LoginRequest, TokenResponse
 from app.schemas.user import UserCreate
-from app.core.security import verify_password, create_access_token, create_refresh_token, verify_token
+from app.core.security import (
+    verify_password_async,
+    create_access_token,
+    create_refresh_token,
+    user_token_claims,
+    verify_token_claims,
+)
 
 
 async def register_user(db: AsyncSession, data: RegisterRequest) -> RegisterResponse:
@@ -51,8 +57,8 @@ async def register_user(db: AsyncSession, data: RegisterRequest) -> RegisterResp
     user = await user_crud.create(db, user_data)
 
     # Генерируем токены
-    access_token = create_access_token(data={"sub": str(user.id)})
-    refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    access_token = create_access_token(data=user_token_claims(user))
+    refresh_token = create_refresh_token(data={"sub": str(user.id), "ver": user.token_version})
 
     # Формируем ответ
     from app.schemas.user import UserResponse
@@ -87,6 +93,9 @@ async def login(db: AsyncSession, data: LoginRequest) -> TokenResponse:
                 detail="Пользователь с таким Telegram ID не найден",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+
+        # Пользователь снова пишет боту - значит, бот разблокирован
+        await user_crud.clear_telegram_blocked(db, user)
     # Вход через email + password
     elif data.email and data.password:
         user = await user_crud.get_by_email(db, data.email)
@@ -106,7 +115,7 @@ async def login(db: AsyncSession, data: LoginRequest) -> TokenResponse:
             )
 
         # Проверяем пароль
-        if not verify_password(data.password, user.hashed_password):
+        if not await verify_password_async(data.password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Неверный email или пароль",
@@ -126,8 +135,8 @@ async def login(db: AsyncSession, data: LoginRequest) -> TokenResponse:
         )
 
     # Генерируем токены
-    access_token = create_access_token(data={"sub": str(user.id)})
-    refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    access_token = create_access_token(data=user_token_claims(user))
+    refresh_token = create_refresh_token(data={"sub": str(user.id), "ver": user.token_version})
 
     return TokenResponse(
         access_token=access_token,
@@ -151,8 +160,8 @@ async def refresh_access_token(db: AsyncSession, refresh_token: str) -> TokenRes
         HTTPException: Если токен невалидный или пользователь не найден
     """
     # Проверяем refresh токен
-    user_id = verify_token(refresh_token, token_type="refresh")
-    if not user_id:
+    claims = verify_token_claims(refresh_token, token_type="refresh")
+    if not claims:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Невалидный refresh token",
@@ -160,8 +169,7 @@ async def refresh_access_token(db: AsyncSession, refresh_token: str) -> TokenRes
         )
 
     # Проверяем существование пользователя
-    from uuid import UUID
-    user = await user_crud.get_by_id(db, UUID(user_id))
+    user = await user_crud.get_by_id(db, claims.user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -169,6 +177,14 @@ async def refresh_access_token(db: AsyncSession, refresh_token: str) -> TokenRes
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Токены, выданные до отзыва, больше не обновляются
+    if claims.ver != user.token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Токен отозван",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     # Проверяем активность пользователя
     if not user.is_active:
         raise HTTPException(
@@ -177,8 +193,8 @@ async def refresh_access_token(db: AsyncSession, refresh_token: str) -> TokenRes
         )
 
     # Генерируем новые токены
-    new_access_token = create_access_token(data={"sub": str(user.id)})
-    new_refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    new_access_token = create_access_token(data=user_token_claims(user))
+    new_refresh_token = create_refresh_token(data={"sub": str(user.id), "ver": user.token_version})
 
     return TokenResponse(
         access_token=new_access_token,
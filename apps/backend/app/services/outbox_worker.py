@@ -0,0 +1,143 @@
+"""
+Outbox Worker Service.
+Доставка запланированных уведомлений из таблицы outbox.
+"""
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import AsyncIterator
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import AsyncSessionLocal
+from app.core.config import settings
+from app.crud import outbox as outbox_crud, user as user_crud
+from app.models.outbox import OutboxStatus
+from app.services.telegram_sender import telegram_sender, DeliveryJob, DeliveryOutcome, DeliveryStats
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxWorker:
+    """Обработчик, доставляющий сообщения из outbox с учетом лимитов Telegram."""
+
+    def __init__(self):
+        """Инициализация обработчика."""
+        # Один прогон доставки на процесс: периодический запуск и ручной не пересекаются
+        self._lock = asyncio.Lock()
+
+    async def drain(self) -> DeliveryStats:
+        """
+        Доставить все ожидающие сообщения outbox.
+
+        Сообщения захватываются порциями (SKIP LOCKED), поэтому drain можно
+        одновременно запускать в нескольких процессах - каждый получит свою
+        часть очереди. Результаты записываются по ходу прогона, а порции
+        упавшего обработчика освобождаются по истечении lease.
+
+        Доставка - "хотя бы один раз": порцию, не отправленную за
+        OUTBOX_LEASE_SECONDS, может захватить и отправить другой процесс.
+        Результаты пишутся только по своему захвату, а расхождения
+        попадают в лог.
+
+        Returns:
+            DeliveryStats: Статистика прогона
+        """
+        async with self._lock:
+            results = {outcome: [] for outcome in DeliveryOutcome}
+            blocked_user_ids = []
+
+            def on_result(job: DeliveryJob, outcome: DeliveryOutcome) -> None:
+                results[outcome].append((job.outbox_id, job.locked_until))
+                if outcome == DeliveryOutcome.BLOCKED:
+                    blocked_user_ids.append(job.user_id)
+
+            async with AsyncSessionLocal() as db:
+                stats = await telegram_sender.deliver(
+                    self._pending_jobs(db, results, blocked_user_ids),
+                    on_result=on_result
+                )
+                await self._flush(db, results, blocked_user_ids)
+
+            if stats.total:
+                logger.info(
+                    f"Outbox drained: {stats.sent} sent, {stats.failed} errors, "
+                    f"{stats.blocked} blocked, {stats.retries} retries "
+                    f"in {stats.duration:.1f}s ({stats.rate:.1f} msg/s)"
+                )
+            return stats
+
+    async def _pending_jobs(
+        self,
+        db: AsyncSession,
+        results: dict,
+        blocked_user_ids: list
+    ) -> AsyncIterator[DeliveryJob]:
+        """
+        Сформировать поток сообщений из outbox.
+
+        Перед захватом очередной порции сохраняет уже полученные результаты.
+
+        Args:
+            db: Сессия базы данных
+            results: Накопленные захваты (ID, locked_until) по результатам доставки
+            blocked_user_ids: Накопленные ID заблокировавших бота пользователей
+
+        Yields:
+            DeliveryJob: Сообщение для доставки
+        """
+        while True:
+            await self._flush(db, results, blocked_user_ids)
+            rows = await outbox_crud.claim_batch(
+                db,
+                limit=settings.OUTBOX_CLAIM_BATCH_SIZE,
+                lease=timedelta(seconds=settings.OUTBOX_LEASE_SECONDS),
+                max_age=timedelta(hours=settings.OUTBOX_MAX_AGE_HOURS)
+            )
+            if not rows:
+                return
+
+            for row in rows:
+                yield DeliveryJob(
+                    chat_id=row.chat_id,
+                    text=row.text,
+                    user_id=row.user_id,
+                    outbox_id=row.id,
+                    locked_until=row.locked_until
+                )
+
+    async def _flush(self, db: AsyncSession, results: dict, blocked_user_ids: list) -> None:
+        """
+        Записать накопленные результаты доставки в БД.
+
+        Args:
+            db: Сессия базы данных
+            results: Накопленные захваты (ID, locked_until) по результатам доставки
+            blocked_user_ids: Накопленные ID заблокировавших бота пользователей
+        """
+        sent = results[DeliveryOutcome.SENT][:]
+        blocked = results[DeliveryOutcome.BLOCKED][:]
+        failed = results[DeliveryOutcome.FAILED][:]
+        blocked_users = blocked_user_ids[:]
+        for ids in (*results.values(), blocked_user_ids):
+            ids.clear()
+
+        updated = await outbox_crud.mark_status(db, sent, OutboxStatus.SENT)
+        updated += await outbox_crud.mark_status(db, blocked, OutboxStatus.BLOCKED)
+        updated += await outbox_crud.record_failed_attempts(
+            db,
+            failed,
+            max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+            retry_delay=timedelta(seconds=settings.OUTBOX_RETRY_DELAY_SECONDS)
+        )
+        await user_crud.mark_telegram_blocked(db, blocked_users)
+
+        lost = len(sent) + len(blocked) + len(failed) - updated
+        if lost:
+            logger.warning(
+                f"Outbox lease expired for {lost} messages: they were re-claimed by another "
+                f"drain and may be sent twice; consider raising OUTBOX_LEASE_SECONDS"
+            )
+
+
+# Создаем глобальный экземпляр
+outbox_worker = OutboxWorker()
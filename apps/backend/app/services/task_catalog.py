@@ -0,0 +1,128 @@
+"""
+Task Catalog Service.
+Кэш каталога заданий в памяти процесса для выбора случайного задания.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.task import Task, TaskDifficulty
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CatalogTask:
+    """Неизменяемый снимок задания из каталога."""
+    id: UUID
+    title: str
+    description: str
+    category: str
+    difficulty: TaskDifficulty
+
+
+class TaskCatalog:
+    """
+    Каталог заданий в памяти процесса.
+
+    ID заданий сгруппированы по (category, difficulty), а также по каждому
+    фильтру отдельно, поэтому случайный выбор с любым набором фильтров -
+    выбор элемента списка без запросов к БД. Каталог перечитывается по TTL
+    и после изменения заданий в этом процессе; другие реплики увидят
+    изменения не позже чем через TASK_CATALOG_TTL_SECONDS.
+    """
+
+    def __init__(self, ttl: float):
+        """
+        Args:
+            ttl: Время жизни каталога в секундах
+        """
+        self.ttl = ttl
+        self._tasks: dict[UUID, CatalogTask] = {}
+        self._groups: dict[tuple, list[UUID]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Сбросить каталог: следующее обращение перечитает задания."""
+        self._loaded_at = None
+
+    def _is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    async def _ensure_loaded(self, db: AsyncSession) -> None:
+        """Загрузить каталог, если он устарел."""
+        if self._is_fresh():
+            return
+
+        async with self._lock:
+            # Каталог мог загрузить конкурентный запрос, пока мы ждали блокировку
+            if self._is_fresh():
+                return
+
+            result = await db.execute(
+                select(Task.id, Task.title, Task.description, Task.category, Task.difficulty)
+            )
+            tasks = {task.id: task for task in (CatalogTask(*row) for row in result.all())}
+
+            groups: dict[tuple, list[UUID]] = {}
+            for task in tasks.values():
+                for key in (
+                    (task.category, task.difficulty),
+                    (task.category, None),
+                    (None, task.difficulty),
+                    (None, None),
+                ):
+                    groups.setdefault(key, []).append(task.id)
+
+            self._tasks = tasks
+            self._groups = groups
+            self._loaded_at = time.monotonic()
+            logger.debug(f"Task catalog loaded: {len(tasks)} tasks")
+
+    async def get_all(self, db: AsyncSession) -> dict[UUID, CatalogTask]:
+        """
+        Получить весь каталог.
+
+        Args:
+            db: Сессия базы данных (используется только при перезагрузке)
+
+        Returns:
+            dict[UUID, CatalogTask]: Задания по ID (только для чтения)
+        """
+        await self._ensure_loaded(db)
+        return self._tasks
+
+    async def pick_random_id(
+        self,
+        db: AsyncSession,
+        category: Optional[str] = None,
+        difficulty: Optional[TaskDifficulty] = None
+    ) -> Optional[UUID]:
+        """
+        Выбрать ID случайного задания с опциональной фильтрацией.
+
+        Args:
+            db: Сессия базы данных (используется только при перезагрузке)
+            category: Фильтр по категории (опционально)
+            difficulty: Фильтр по сложности (опционально)
+
+        Returns:
+            Optional[UUID]: ID задания или None, если подходящих нет
+        """
+        await self._ensure_loaded(db)
+        ids = self._groups.get((category or None, difficulty or None))
+        if not ids:
+            return None
+        return random.choice(ids)
+
+
+# Создаем глобальный экземпляр
+task_catalog = TaskCatalog(ttl=settings.TASK_CATALOG_TTL_SECONDS)
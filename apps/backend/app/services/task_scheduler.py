@@ -3,15 +3,29 @@ Task Scheduler Service.
 Планировщик для автоматической отправки заданий и напоминаний.
 """
 
+import asyncio
+import contextlib
 import logging
-from datetime import datetime
+from datetime import datetime, date, time, timedelta, timezone
+from typing import AsyncIterator
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import AsyncSessionLocal
+from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+from app.core.database import AsyncSessionLocal, database_url
 from app.core.config import settings
-from app.crud import user as user_crud, assignment as assignment_crud, task as task_crud
+from app.core.timezones import local_today
+from app.crud import user as user_crud, assignment as assignment_crud, outbox as outbox_crud
+from app.models.assignment import AssignmentStatus
+from app.models.outbox import OutboxKind
 from app.services.telegram_sender import telegram_sender
+from app.services.outbox_worker import outbox_worker
+from app.services.task_catalog import task_catalog
+from app.services import task_service
 
 logger = logging.getLogger(__name__)
 
@@ -24,11 +38,28 @@ class TaskScheduler:
         self.scheduler = AsyncIOScheduler(
             timezone=settings.SCHEDULER_TIMEZONE
         )
+        # Доставка из outbox не требует лидерства и работает в каждой реплике
+        self.worker_scheduler = AsyncIOScheduler(
+            timezone=settings.SCHEDULER_TIMEZONE
+        )
+        self.is_leader = False
+        # Конец интервала, обработанного предыдущим минутным тиком (UTC)
+        self._last_tick: datetime | None = None
+        self._leader_task: asyncio.Task | None = None
+        self._leader_engine: AsyncEngine | None = None
 
     async def send_morning_tasks(self):
         """
         Отправляет утренние задания всем активным пользователям.
         Запускается каждое утро в заданное время.
+
+        Пользователи обрабатываются порциями (keyset-итерация). Для каждой
+        порции выполняется массовое планирование (состояние назначений одним
+        запросом, выбор заданий в памяти, один INSERT для недостающих
+        назначений), а сообщения записываются в outbox. Затем outbox
+        доставляется обработчиком; повторный запуск не создает дублей.
+        При DELIVERY_WINDOW_MINUTES отправка распределяется по окну.
+        Задания назначаются на локальную дату каждого пользователя.
         """
         try:
             import sys
@@ -36,100 +67,148 @@ class TaskScheduler:
             sys.stdout.flush()
             logger.info("Starting morning tasks distribution...")
 
+            planned_at = datetime.utcnow()
             async with AsyncSessionLocal() as db:
-                # Получаем всех активных пользователей
-                users = await user_crud.get_all(db, is_active=True)
-
-                if not users:
-                    logger.info("No active users found")
-                    return
-
-                success_count = 0
-                error_count = 0
-
-                for user in users:
-                    try:
-                        # Пропускаем пользователей без Telegram ID
-                        if not user.telegram_id:
-                            print(f"⏭️  Skipping {user.name} - no telegram_id", flush=True)
-                            sys.stdout.flush()
-                            continue
-
-                        # Получаем задание на сегодня для пользователя
-                        assignment = await assignment_crud.get_today_assignment(
-                            db, user.id
-                        )
-
-                        # Если задание уже выполнено - пропускаем отправку (не отправляем повторно)
-                        if assignment and assignment.status.value == "completed":
-                            print(f"⏭️  {user.name} already completed today's task", flush=True)
-                            sys.stdout.flush()
-                            continue
-
-                        # Если нет задания - создаем новое
-                        if not assignment:
-                            print(f"📝 No assignment for {user.name}, creating new...", flush=True)
-                            sys.stdout.flush()
-
-                            # Выбираем случайную задачу
-                            random_task = await task_crud.get_random_task(db)
-
-                            if not random_task:
-                                logger.error(f"No tasks available in database for user {user.id}")
-                                print(f"❌ No tasks in database!", flush=True)
-                                sys.stdout.flush()
-                                error_count += 1
-                                continue
-
-                            # Создаем назначение
-                            assignment = await assignment_crud.create_daily_assignment(
-                                db, user.id, random_task.id
-                            )
-                            print(f"✅ Created assignment: {assignment.task.title}", flush=True)
-                            sys.stdout.flush()
-
-                        # Формируем сообщение
-                        task_data = {
-                            "title": assignment.task.title,
-                            "description": assignment.task.description
-                        }
-                        message = telegram_sender.format_morning_message(
-                            user.name, task_data
-                        )
-
-                        # Отправляем сообщение
-                        print(f"📤 Sending morning task to {user.name} (telegram_id: {user.telegram_id})", flush=True)
-                        print(f"   Task: {assignment.task.title}", flush=True)
-                        sys.stdout.flush()
-                        sent = await telegram_sender.send_message(
-                            chat_id=user.telegram_id,
-                            text=message
-                        )
-
-                        if sent:
-                            success_count += 1
-                            print(f"✅ Morning task sent to user {user.id}", flush=True)
-                            sys.stdout.flush()
-                            logger.info(f"Morning task sent to user {user.id}")
-                        else:
-                            error_count += 1
-                            print(f"❌ Failed to send to user {user.id}", flush=True)
-                            sys.stdout.flush()
-
-                    except Exception as e:
-                        error_count += 1
-                        print(f"❌ Exception for user {user.id}: {str(e)}", flush=True)
-                        sys.stdout.flush()
-                        logger.error(f"Error sending morning task to user {user.id}: {str(e)}")
-
-                logger.info(
-                    f"Morning tasks distribution completed: "
-                    f"{success_count} success, {error_count} errors"
+                await outbox_crud.delete_older_than(
+                    db, timedelta(days=settings.OUTBOX_RETENTION_DAYS)
                 )
+                enqueued = 0
+                timezones = await user_crud.get_recipient_timezones(db)
+                for local_date, zones in self._local_dates(timezones).items():
+                    enqueued += await self._enqueue_morning_tasks(
+                        db,
+                        local_date,
+                        user_crud.iter_recipients_in_timezones(
+                            db, zones, chunk_size=settings.SCHEDULER_BATCH_SIZE
+                        ),
+                        planned_at
+                    )
+            self._schedule_window_report("morning tasks", planned_at, enqueued, datetime.utcnow())
+
+            stats = await outbox_worker.drain()
+
+            print(
+                f"✅ Morning tasks distribution completed: "
+                f"{enqueued} planned, {stats.sent} success, {stats.failed} errors",
+                flush=True
+            )
+            sys.stdout.flush()
+            logger.info(
+                f"Morning tasks distribution completed: {enqueued} planned, "
+                f"{stats.sent} success, {stats.failed} errors, "
+                f"{stats.blocked} blocked, {stats.retries} retries "
+                f"in {stats.duration:.1f}s ({stats.rate:.1f} msg/s)"
+            )
 
         except Exception as e:
             logger.error(f"Error in send_morning_tasks: {str(e)}")
 
+    async def _enqueue_morning_tasks(
+        self,
+        db: AsyncSession,
+        today: date,
+        recipients: AsyncIterator[list],
+        planned_at: datetime
+    ) -> int:
+        """
+        Спланировать утренние сообщения и записать их в outbox.
+
+        Args:
+            db: Сессия базы данных
+            today: Дата рассылки (локальная дата получателей)
+            recipients: Порции получателей из user_crud
+            planned_at: Начало окна доставки (UTC)
+
+        Returns:
+            int: Количество новых сообщений в outbox
+        """
+        enqueued = 0
+
+        async for users in recipients:
+            tasks = await task_catalog.get_all(db)
+            plan = await self._plan_morning_tasks(db, users, tasks, today)
+
+            messages = []
+            for user_id, telegram_id, user_name, task in plan:
+                task_data = {
+                    "title": task.title,
+                    "description": task.description
+                }
+                messages.append({
+                    "user_id": user_id,
+                    "kind": OutboxKind.MORNING,
+                    "target_date": today,
+                    "chat_id": telegram_id,
+                    "text": telegram_sender.format_morning_message(user_name, task_data),
+                    "scheduled_at": self._scheduled_at(user_id, planned_at),
+                })
+
+            enqueued += await outbox_crud.enqueue(db, messages)
+
+        return enqueued
+
+    async def _plan_morning_tasks(
+        self,
+        db: AsyncSession,
+        users: list,
+        tasks: dict,
+        today: date
+    ) -> list[tuple]:
+        """
+        Массовое планирование утренней рассылки для порции пользователей.
+
+        Args:
+            db: Сессия базы данных
+            users: Порция получателей из user_crud.iter_active_recipients
+            tasks: Каталог заданий (task_id -> CatalogTask)
+            today: Дата рассылки
+
+        Returns:
+            list[tuple]: Кортежи (user_id, telegram_id, user_name, task) для отправки
+        """
+        states = await assignment_crud.get_daily_states(
+            db, [user.user_id for user in users], today
+        )
+
+        plan = []
+        missing = {}
+        for user in users:
+            state = states.get(user.user_id)
+
+            if state is None:
+                missing[user.user_id] = user
+                continue
+
+            # Если задание уже выполнено - пропускаем отправку (не отправляем повторно)
+            if state.status == AssignmentStatus.COMPLETED:
+                continue
+
+            if state.task_id not in tasks:
+                # Задание добавлено в другой реплике после загрузки каталога
+                task_catalog.invalidate()
+                tasks = await task_catalog.get_all(db)
+
+            plan.append((user.user_id, user.telegram_id, user.name, tasks[state.task_id]))
+
+        if missing:
+            # Следующие задания из колод пользователей, назначения - одним INSERT
+            created = await task_service.assign_next_tasks(db, list(missing))
+            # Каталог мог обновиться по TTL или после удаления задания во время выдачи
+            tasks = await task_catalog.get_all(db)
+            if not created:
+                logger.error(f"No tasks available in database for {len(missing)} users")
+            for created_row in created:
+                user = missing[created_row.user_id]
+                plan.append(
+                    (user.user_id, user.telegram_id, user.name, tasks[created_row.task_id])
+                )
+
+        logger.info(
+            f"Morning plan ready: {len(plan)} recipients, "
+            f"{len(missing)} new assignments"
+        )
+        return plan
+
     async def send_evening_reminders(self):
         """
         Отправляет вечерние напоминания пользователям с невыполненными заданиями.
@@ -138,61 +217,311 @@ class TaskScheduler:
         try:
             logger.info("Starting evening reminders...")
 
+            planned_at = datetime.utcnow()
             async with AsyncSessionLocal() as db:
-                # Получаем всех активных пользователей
-                users = await user_crud.get_all(db, is_active=True)
-
-                if not users:
-                    logger.info("No active users found")
-                    return
-
-                success_count = 0
-                error_count = 0
-
-                for user in users:
-                    try:
-                        # Пропускаем пользователей без Telegram ID
-                        if not user.telegram_id:
-                            continue
-
-                        # Получаем задание на сегодня
-                        assignment = await assignment_crud.get_today_assignment(
-                            db, user.id
-                        )
-
-                        if not assignment:
-                            continue
-
-                        # Отправляем напоминание только если задание НЕ выполнено
-                        if assignment.status.value != "completed":
-                            task_data = {
-                                "title": assignment.task.title
-                            }
-                            message = telegram_sender.format_evening_reminder(task_data)
-
-                            # Отправляем сообщение
-                            sent = await telegram_sender.send_message(
-                                chat_id=user.telegram_id,
-                                text=message
-                            )
-
-                            if sent:
-                                success_count += 1
-                                logger.info(f"Evening reminder sent to user {user.id}")
-                            else:
-                                error_count += 1
-
-                    except Exception as e:
-                        error_count += 1
-                        logger.error(f"Error sending evening reminder to user {user.id}: {str(e)}")
+                enqueued = 0
+                timezones = await user_crud.get_recipient_timezones(db)
+                for local_date, zones in self._local_dates(timezones).items():
+                    enqueued += await self._enqueue_evening_reminders(
+                        db,
+                        local_date,
+                        user_crud.iter_recipients_in_timezones(
+                            db, zones, chunk_size=settings.SCHEDULER_BATCH_SIZE
+                        ),
+                        planned_at
+                    )
+            self._schedule_window_report("evening reminders", planned_at, enqueued, datetime.utcnow())
+
+            stats = await outbox_worker.drain()
+
+            logger.info(
+                f"Evening reminders completed: {enqueued} planned, "
+                f"{stats.sent} success, {stats.failed} errors, "
+                f"{stats.blocked} blocked, {stats.retries} retries "
+                f"in {stats.duration:.1f}s ({stats.rate:.1f} msg/s)"
+            )
+
+        except Exception as e:
+            logger.error(f"Error in send_evening_reminders: {str(e)}")
 
+    async def _enqueue_evening_reminders(
+        self,
+        db: AsyncSession,
+        today: date,
+        recipients: AsyncIterator[list],
+        planned_at: datetime
+    ) -> int:
+        """
+        Спланировать вечерние напоминания и записать их в outbox.
+
+        Args:
+            db: Сессия базы данных
+            today: Дата рассылки (локальная дата получателей)
+            recipients: Порции получателей из user_crud
+            planned_at: Начало окна доставки (UTC)
+
+        Returns:
+            int: Количество новых сообщений в outbox
+        """
+        enqueued = 0
+
+        async for users in recipients:
+            # Напоминаем только о заданиях, которые НЕ выполнены
+            pending_titles = await assignment_crud.get_pending_titles_for_date(
+                db, [user.user_id for user in users], today
+            )
+
+            messages = [
+                {
+                    "user_id": user.user_id,
+                    "kind": OutboxKind.EVENING,
+                    "target_date": today,
+                    "chat_id": user.telegram_id,
+                    "text": telegram_sender.format_evening_reminder(
+                        {"title": pending_titles[user.user_id]}
+                    ),
+                    "scheduled_at": self._scheduled_at(user.user_id, planned_at),
+                }
+                for user in users
+                if user.user_id in pending_titles
+            ]
+
+            enqueued += await outbox_crud.enqueue(db, messages)
+
+        return enqueued
+
+    async def send_due_notifications(self):
+        """
+        Отправляет утренние задания и вечерние напоминания пользователям,
+        у которых в их часовом поясе наступило выбранное время.
+        Запускается каждую минуту.
+
+        Каждый тик обрабатывает интервал с конца предыдущего тика, поэтому
+        пропущенные минуты (перезапуск, смена лидера) догоняются. После смены
+        лидера догоняется до SCHEDULER_MISFIRE_GRACE_SECONDS: outbox не
+        создает дублей, поэтому повторное планирование безопасно.
+        """
+        try:
+            now = datetime.now(timezone.utc)
+            grace_start = now - timedelta(seconds=settings.SCHEDULER_MISFIRE_GRACE_SECONDS)
+            since = max(self._last_tick or grace_start, grace_start)
+            planned_at = datetime.utcnow()
+
+            async with AsyncSessionLocal() as db:
+                timezones = await user_crud.get_recipient_timezones(db)
+
+                morning = evening = 0
+                for (local_date, after, until), zones in self._local_windows(
+                    timezones, since, now
+                ).items():
+                    morning += await self._enqueue_morning_tasks(
+                        db,
+                        local_date,
+                        user_crud.iter_due_recipients(
+                            db, "morning_time", zones, after, until,
+                            chunk_size=settings.SCHEDULER_BATCH_SIZE
+                        ),
+                        planned_at
+                    )
+                    evening += await self._enqueue_evening_reminders(
+                        db,
+                        local_date,
+                        user_crud.iter_due_recipients(
+                            db, "evening_time", zones, after, until,
+                            chunk_size=settings.SCHEDULER_BATCH_SIZE
+                        ),
+                        planned_at
+                    )
+
+            self._last_tick = now
+            self._schedule_window_report(
+                "due notifications", planned_at, morning + evening, datetime.utcnow()
+            )
+
+            if morning or evening:
+                stats = await outbox_worker.drain()
                 logger.info(
-                    f"Evening reminders completed: "
-                    f"{success_count} success, {error_count} errors"
+                    f"Due notifications: {morning} morning, {evening} evening planned, "
+                    f"{stats.sent} success, {stats.failed} errors, "
+                    f"{stats.blocked} blocked in {stats.duration:.1f}s"
                 )
 
         except Exception as e:
-            logger.error(f"Error in send_evening_reminders: {str(e)}")
+            logger.error(f"Error in send_due_notifications: {str(e)}")
+
+    def _scheduled_at(self, user_id, planned_at: datetime) -> datetime:
+        """
+        Время отправки сообщения пользователю внутри окна доставки.
+
+        Сдвиг детерминирован (по user_id), поэтому пользователь получает
+        сообщения в одно и то же время окна, а повторное планирование
+        не меняет порядок.
+
+        Args:
+            user_id: ID пользователя
+            planned_at: Начало окна (UTC)
+
+        Returns:
+            datetime: Время, не раньше которого сообщение отправляется
+        """
+        window = settings.DELIVERY_WINDOW_MINUTES * 60
+        if window <= 0:
+            return planned_at
+        return planned_at + timedelta(seconds=user_id.int % window)
+
+    def _schedule_window_report(
+        self,
+        label: str,
+        planned_at: datetime,
+        planned: int,
+        enqueued_until: datetime
+    ):
+        """
+        Запланировать отчет о доставке по окончании окна.
+
+        Отчет учитывает только сообщения, записанные в outbox этим запуском
+        (с planned_at по enqueued_until): окна минутных тиков пересекаются.
+
+        Args:
+            label: Название рассылки для лога
+            planned_at: Начало окна (UTC)
+            planned: Количество запланированных сообщений
+            enqueued_until: Время окончания записи сообщений в outbox (UTC)
+        """
+        if not planned or settings.DELIVERY_WINDOW_MINUTES <= 0:
+            return
+
+        window_end = planned_at + timedelta(minutes=settings.DELIVERY_WINDOW_MINUTES)
+        logger.info(
+            f"Delivery window for {label}: {planned} messages until "
+            f"{window_end:%H:%M:%S} UTC, target "
+            f"{planned / (settings.DELIVERY_WINDOW_MINUTES * 60):.2f} msg/s"
+        )
+        self.scheduler.add_job(
+            self.report_delivery_window,
+            # Отчет после последней дочистки outbox в окне
+            trigger=DateTrigger(
+                run_date=(
+                    window_end + timedelta(seconds=2 * settings.OUTBOX_DRAIN_INTERVAL_SECONDS)
+                ).replace(tzinfo=timezone.utc)
+            ),
+            args=[label, planned_at, window_end, enqueued_until],
+            misfire_grace_time=settings.SCHEDULER_MISFIRE_GRACE_SECONDS
+        )
+
+    async def report_delivery_window(
+        self,
+        label: str,
+        window_start: datetime,
+        window_end: datetime,
+        enqueued_until: datetime
+    ):
+        """
+        Сравнить достигнутую скорость доставки окна с целевой.
+
+        Целевая скорость - равномерное распределение сообщений окна по его
+        длительности; достигнутая - отправленные сообщения за время от начала
+        окна до последней доставки.
+
+        Args:
+            label: Название рассылки для лога
+            window_start: Начало окна (UTC)
+            window_end: Конец окна (UTC)
+            enqueued_until: Время окончания записи сообщений окна в outbox (UTC)
+        """
+        try:
+            async with AsyncSessionLocal() as db:
+                summary = await outbox_crud.get_window_summary(
+                    db, window_start, window_end, window_start, enqueued_until
+                )
+
+            target = summary.total / (window_end - window_start).total_seconds()
+            achieved = 0.0
+            if summary.sent and summary.last_sent_at:
+                elapsed = max((summary.last_sent_at - window_start).total_seconds(), 1.0)
+                achieved = summary.sent / elapsed
+
+            logger.info(
+                f"Delivery window for {label} finished: {summary.sent}/{summary.total} sent, "
+                f"{summary.pending} pending, achieved {achieved:.2f} msg/s "
+                f"vs target {target:.2f} msg/s"
+            )
+        except Exception as e:
+            logger.error(f"Error in report_delivery_window: {str(e)}")
+
+    def _local_dates(self, timezones: list[str]) -> dict[date, list[str]]:
+        """
+        Сгруппировать часовые пояса по текущей локальной дате.
+
+        Ручной запуск рассылки планирует задания на "сегодня" каждого
+        пользователя - ту же дату, что выдает /tasks/today.
+
+        Args:
+            timezones: Часовые пояса получателей
+
+        Returns:
+            dict: локальная дата -> часовые пояса
+        """
+        dates: dict[date, list[str]] = {}
+        for name in timezones:
+            dates.setdefault(local_today(name), []).append(name)
+        return dates
+
+    def _local_windows(
+        self,
+        timezones: list[str],
+        since: datetime,
+        until: datetime
+    ) -> dict[tuple, list[str]]:
+        """
+        Перевести интервал (since, until] в локальные интервалы часовых поясов.
+
+        Часовые пояса с одинаковым локальным интервалом группируются, чтобы
+        выбирать их пользователей одним запросом. Интервал, пересекающий
+        локальную полночь, делится на два - по одному на каждую дату.
+
+        Args:
+            timezones: Часовые пояса получателей
+            since: Начало интервала (UTC, не включительно)
+            until: Конец интервала (UTC, включительно)
+
+        Returns:
+            dict: (локальная дата, время после, время до) -> часовые пояса
+        """
+        windows: dict[tuple, list[str]] = {}
+
+        for name in timezones:
+            try:
+                zone = ZoneInfo(name)
+            except (ZoneInfoNotFoundError, ValueError):
+                logger.warning(f"Unknown user timezone skipped: {name}")
+                continue
+
+            start = since.astimezone(zone).replace(tzinfo=None)
+            end = until.astimezone(zone).replace(tzinfo=None)
+
+            if start.date() == end.date():
+                keys = [(end.date(), start.time(), end.time())]
+            else:
+                keys = [
+                    (start.date(), start.time(), time.max),
+                    (end.date(), None, end.time()),
+                ]
+            for key in keys:
+                windows.setdefault(key, []).append(name)
+
+        return windows
+
+    async def drain_outbox(self):
+        """
+        Доставляет сообщения из outbox.
+        Запускается периодически во всех репликах: обработчики делят очередь
+        через SKIP LOCKED, поэтому рассылка лидера ускоряется остальными.
+        """
+        try:
+            await outbox_worker.drain()
+        except Exception as e:
+            logger.error(f"Error in drain_outbox: {str(e)}")
 
     def start(self):
         """Запускает планировщик и регистрирует задачи."""
@@ -201,49 +530,64 @@ class TaskScheduler:
         sys.stdout.flush()
         logger.info("Starting task scheduler...")
 
-        # Парсим время из конфига
-        morning_hour, morning_minute = map(
-            int, settings.MORNING_TASK_TIME.split(":")
-        )
-        evening_hour, evening_minute = map(
-            int, settings.EVENING_REMINDER_TIME.split(":")
-        )
-
-        print(f"📋 Adding morning job: {morning_hour}:{morning_minute}", flush=True)
+        print("📋 Adding per-user delivery job (every minute)", flush=True)
         sys.stdout.flush()
-        # Утренние задания
+        # Утренние задания и вечерние напоминания в локальное время пользователей
         self.scheduler.add_job(
-            self.send_morning_tasks,
+            self.send_due_notifications,
             trigger=CronTrigger(
-                hour=morning_hour,
-                minute=morning_minute,
+                minute="*",
                 timezone=settings.SCHEDULER_TIMEZONE
             ),
-            id="morning_tasks",
-            name="Send morning tasks",
-            replace_existing=True
+            id="due_notifications",
+            name="Send due morning tasks and evening reminders",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
         )
 
-        print(f"📋 Adding evening job: {evening_hour}:{evening_minute}", flush=True)
-        sys.stdout.flush()
-        # Вечерние напоминания
-        self.scheduler.add_job(
-            self.send_evening_reminders,
-            trigger=CronTrigger(
-                hour=evening_hour,
-                minute=evening_minute,
-                timezone=settings.SCHEDULER_TIMEZONE
-            ),
-            id="evening_reminders",
-            name="Send evening reminders",
-            replace_existing=True
+        # Доставка outbox: во всех репликах или только лидером
+        drain_scheduler = (
+            self.worker_scheduler
+            if settings.OUTBOX_DRAIN_ON_ALL_REPLICAS
+            else self.scheduler
+        )
+        if settings.OUTBOX_DRAIN_ON_ALL_REPLICAS:
+            logger.warning(
+                f"Outbox is drained by every process: Telegram limit "
+                f"{settings.TELEGRAM_GLOBAL_RATE_LIMIT} msg/s is split into "
+                f"{telegram_sender.global_bucket.rate:.2f} msg/s per process for "
+                f"OUTBOX_DRAIN_PROCESSES={settings.OUTBOX_DRAIN_PROCESSES}; it must equal "
+                f"the number of replicas x workers"
+            )
+        else:
+            logger.info(
+                f"Outbox is drained by the scheduler leader only "
+                f"({telegram_sender.global_bucket.rate:.2f} msg/s)"
+            )
+        drain_scheduler.add_job(
+            self.drain_outbox,
+            trigger=IntervalTrigger(seconds=settings.OUTBOX_DRAIN_INTERVAL_SECONDS),
+            id="drain_outbox",
+            name="Drain notification outbox",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
         )
 
         print("📋 Starting scheduler...", flush=True)
         sys.stdout.flush()
-        self.scheduler.start()
-
-        jobs = self.scheduler.get_jobs()
+        if settings.SCHEDULER_LEADER_ELECTION:
+            # Задачи выполняет только лидер; остальные процессы обслуживают HTTP
+            self.scheduler.start(paused=True)
+            self._leader_task = asyncio.create_task(self._leadership_loop())
+        else:
+            self.scheduler.start()
+            self.is_leader = True
+        if settings.OUTBOX_DRAIN_ON_ALL_REPLICAS:
+            self.worker_scheduler.start()
+
+        jobs = self.scheduler.get_jobs() + self.worker_scheduler.get_jobs()
         print(f"📋 Scheduler started with {len(jobs)} jobs", flush=True)
         for job in jobs:
             print(f"   - {job.id}: next run at {job.next_run_time}", flush=True)
@@ -251,16 +595,102 @@ class TaskScheduler:
 
         logger.info(
             f"Task scheduler started successfully. "
-            f"Morning tasks: {settings.MORNING_TASK_TIME}, "
-            f"Evening reminders: {settings.EVENING_REMINDER_TIME}"
+            f"Default morning tasks: {settings.MORNING_TASK_TIME}, "
+            f"default evening reminders: {settings.EVENING_REMINDER_TIME} "
+            f"({settings.SCHEDULER_TIMEZONE})"
         )
 
-    def stop(self):
-        """Останавливает планировщик."""
+    async def stop(self):
+        """
+        Останавливает планировщик.
+
+        Задача выбора лидера дожидается завершения: ее finally снимает
+        advisory lock и закрывает соединение, и это должно произойти до
+        закрытия движка БД (close_db) при остановке приложения.
+        """
         logger.info("Stopping task scheduler...")
+        if self.worker_scheduler.running:
+            self.worker_scheduler.shutdown()
         self.scheduler.shutdown()
+        if self._leader_task is not None:
+            self._leader_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._leader_task
+            self._leader_task = None
         logger.info("Task scheduler stopped")
 
+    async def _leadership_loop(self):
+        """
+        Выбор лидера через advisory lock PostgreSQL.
+
+        Лидер удерживает session-level блокировку на отдельном соединении и
+        периодически проверяет его запросом. Если процесс лидера завершается
+        или теряет соединение, PostgreSQL снимает блокировку, и один из
+        остальных процессов захватывает ее при следующей попытке.
+        """
+        if self._leader_engine is None:
+            # Отдельное соединение вне пула: его закрытие гарантированно снимает блокировку
+            self._leader_engine = create_async_engine(
+                database_url,
+                poolclass=NullPool,
+                connect_args={
+                    "server_settings": {
+                        # Быстро обнаруживать "мертвое" соединение лидера на стороне сервера
+                        "tcp_keepalives_idle": "5",
+                        "tcp_keepalives_interval": "2",
+                        "tcp_keepalives_count": "3",
+                    }
+                },
+            )
+
+        try:
+            while True:
+                try:
+                    async with self._leader_engine.connect() as conn:
+                        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                        acquired = (await conn.execute(
+                            select(func.pg_try_advisory_lock(settings.SCHEDULER_LEADER_LOCK_ID))
+                        )).scalar()
+
+                        if acquired:
+                            self._become_leader()
+                            try:
+                                while True:
+                                    await asyncio.sleep(settings.SCHEDULER_LEADER_HEARTBEAT_SECONDS)
+                                    await asyncio.wait_for(
+                                        conn.execute(text("SELECT 1")),
+                                        timeout=settings.SCHEDULER_LEADER_HEARTBEAT_SECONDS
+                                    )
+                            finally:
+                                self._step_down()
+
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Scheduler leader election error: {str(e)}")
+
+                await asyncio.sleep(settings.SCHEDULER_LEADER_POLL_SECONDS)
+        finally:
+            await self._leader_engine.dispose()
+            self._leader_engine = None
+
+    def _become_leader(self):
+        """Возобновить выполнение задач в этом процессе."""
+        self.is_leader = True
+        # Новый лидер догоняет интервал, который мог пропустить предыдущий
+        self._last_tick = None
+        self.scheduler.resume()
+        logger.info("This process is now the scheduler leader")
+
+    def _step_down(self):
+        """Приостановить выполнение задач в этом процессе."""
+        if not self.is_leader:
+            return
+        self.is_leader = False
+        if self.scheduler.running:
+            self.scheduler.pause()
+        logger.warning("This process is no longer the scheduler leader")
+
 
 # Создаем глобальный экземпляр
 task_scheduler = TaskScheduler()
@@ -2,16 +2,162 @@
 Сервис для работы с заданиями и их назначениями.
 """
 
-from typing import Optional
+import random
+from typing import Optional, Sequence
 from uuid import UUID
 from datetime import date
 from fastapi import HTTPException, status
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.crud import task as task_crud, assignment as assignment_crud
+from app.crud import task as task_crud, assignment as assignment_crud, user as user_crud, task_deck as task_deck_crud
 from app.models.assignment import Assignment
 from app.models.task import TaskDifficulty
 from app.schemas.task import AssignmentResponse, TaskResponse
 from app.schemas.user import UserProgress
+from app.services.task_catalog import task_catalog
+
+
+def _shuffled_deck(task_ids: Sequence[UUID], avoid: Optional[UUID] = None) -> list[UUID]:
+    """
+    Перемешать каталог в новую колоду.
+
+    Args:
+        task_ids: ID заданий каталога
+        avoid: Задание, которое не должно оказаться первым (выдано последним)
+
+    Returns:
+        list[UUID]: Колода заданий
+    """
+    deck = list(task_ids)
+    random.shuffle(deck)
+    if len(deck) > 1 and deck[0] == avoid:
+        deck[0], deck[-1] = deck[-1], deck[0]
+    return deck
+
+
+async def draw_next_tasks(db: AsyncSession, user_ids: Sequence[UUID]) -> dict[UUID, UUID]:
+    """
+    Выдать пользователям следующие задания из их колод.
+
+    Каждый пользователь проходит перемешанный каталог целиком, прежде чем
+    задание повторится. Выдача - снятие верхней карты одним UPDATE на всю
+    порцию пользователей, без просмотра истории назначений. Опустевшая
+    колода перемешивается заново так, чтобы на стыке колод задание не
+    повторилось два дня подряд. Карты заданий, которых уже нет в каталоге
+    (удалены после перемешивания), пропускаются - снимается следующая.
+
+    Args:
+        db: Сессия базы данных
+        user_ids: ID пользователей
+
+    Returns:
+        dict[UUID, UUID]: user_id -> task_id (пусто, если каталог пуст)
+    """
+    tasks = await task_catalog.get_all(db)
+    if not tasks or not user_ids:
+        return {}
+
+    popped = await task_deck_crud.pop(db, user_ids)
+    stale = [user_id for user_id, top in popped.items() if top.task_id not in tasks]
+    while stale:
+        repopped = await task_deck_crud.pop(db, stale)
+        popped.update(repopped)
+        stale = [user_id for user_id, top in repopped.items() if top.task_id not in tasks]
+
+    picks = {}
+    decks = {}
+    for user_id in user_ids:
+        top = popped.get(user_id)
+
+        if top is not None and top.task_id in tasks:
+            picks[user_id] = top.task_id
+            if top.remaining == 0:
+                decks[user_id] = _shuffled_deck(tasks, avoid=top.task_id)
+            continue
+
+        # Колоды нет (новый пользователь) или в ней остались только
+        # удаленные задания - новая колода
+        deck = _shuffled_deck(tasks, avoid=top.task_id if top is not None else None)
+        picks[user_id] = deck[0]
+        decks[user_id] = deck[1:]
+
+    await task_deck_crud.save(db, decks)
+    return picks
+
+
+async def _redraw_deleted_tasks(db: AsyncSession, picks: dict[UUID, UUID]) -> dict[UUID, UUID]:
+    """
+    Заменить выданные задания, удаленные в другой реплике.
+
+    Перечитывает каталог и заново выдает задания только тем пользователям,
+    чьих заданий в нем больше нет.
+
+    Args:
+        db: Сессия базы данных
+        picks: user_id -> task_id
+
+    Returns:
+        dict[UUID, UUID]: user_id -> task_id с актуальными заданиями
+    """
+    task_catalog.invalidate()
+    tasks = await task_catalog.get_all(db)
+    deleted = [user_id for user_id, task_id in picks.items() if task_id not in tasks]
+    redrawn = await draw_next_tasks(db, deleted)
+    return {
+        **{user_id: task_id for user_id, task_id in picks.items() if task_id in tasks},
+        **redrawn,
+    }
+
+
+async def assign_next_tasks(db: AsyncSession, user_ids: Sequence[UUID]) -> list[Row]:
+    """
+    Выдать пользователям задания из колод и создать назначения в очереди pending.
+
+    Каталог в памяти может не знать об удалении задания в другой реплике -
+    тогда INSERT нарушает внешний ключ. В этом случае каталог перечитывается,
+    удаленные задания выдаются заново и запись повторяется один раз.
+
+    Args:
+        db: Сессия базы данных
+        user_ids: ID пользователей
+
+    Returns:
+        list[Row]: Строки (id, user_id, task_id) созданных назначений
+    """
+    picks = await draw_next_tasks(db, user_ids)
+    try:
+        return await assignment_crud.create_bulk_assignments(db, list(picks.items()))
+    except IntegrityError:
+        await db.rollback()
+        picks = await _redraw_deleted_tasks(db, picks)
+        return await assignment_crud.create_bulk_assignments(db, list(picks.items()))
+
+
+async def _pick_task_id(
+    db: AsyncSession,
+    user_id: UUID,
+    category: Optional[str],
+    difficulty: Optional[TaskDifficulty]
+) -> Optional[UUID]:
+    """
+    Выбрать задание для нового назначения.
+
+    Без фильтров - следующее из колоды пользователя, с фильтрами -
+    случайное подходящее (ID из каталога в памяти).
+
+    Args:
+        db: Сессия базы данных
+        user_id: ID пользователя
+        category: Категория задания (опционально)
+        difficulty: Сложность задания (опционально)
+
+    Returns:
+        Optional[UUID]: ID задания или None, если подходящих нет
+    """
+    if category or difficulty:
+        return await task_crud.get_random_task_id(db, category=category, difficulty=difficulty)
+    return (await draw_next_tasks(db, [user_id])).get(user_id)
 
 
 async def assign_daily_task(
@@ -24,11 +170,11 @@ async def assign_daily_task(
     Назначить ежедневное задание пользователю.
 
     Логика:
-    1. Проверяем, выполнил ли пользователь задание сегодня
+    1. Проверяем, выполнил ли пользователь задание сегодня (в своем часовом поясе)
     2. Если выполнил - возвращаем 409 (уже выполнено)
     3. Проверяем, есть ли PENDING задание на сегодня
     4. Если нет - проверяем очередь pending заданий и назначаем на сегодня
-    5. Если нет pending - создаем новое случайное задание
+    5. Если нет pending - создаем новое из колоды пользователя (без повторов)
 
     Args:
         db: Сессия базы данных
@@ -43,8 +189,11 @@ async def assign_daily_task(
         HTTPException 409: Если пользователь уже выполнил задание сегодня
         HTTPException 404: Если не найдено подходящих заданий
     """
+    # "Сегодня" - по часовому поясу пользователя, как у планировщика рассылок
+    today = await user_crud.get_local_date(db, user_id)
+
     # Проверяем, выполнил ли пользователь задание сегодня
-    has_completed = await assignment_crud.has_completed_task_today(db, user_id)
+    has_completed = await assignment_crud.has_completed_task_today(db, user_id, today)
     if has_completed:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -52,7 +201,7 @@ async def assign_daily_task(
         )
 
     # Проверяем, есть ли уже PENDING задание на сегодня
-    today_assignment = await assignment_crud.get_today_assignment(db, user_id)
+    today_assignment = await assignment_crud.get_today_assignment(db, user_id, today)
     if today_assignment:
         return AssignmentResponse.model_validate(today_assignment)
 
@@ -63,27 +212,37 @@ async def assign_daily_task(
         assigned = await assignment_crud.assign_pending_to_date(
             db,
             assignment_id=pending_assignment.id,
-            target_date=date.today()
+            target_date=today
         )
         return AssignmentResponse.model_validate(assigned)
 
-    # Нет pending заданий - создаем новое случайное
-    task = await task_crud.get_random_task(db, category=category, difficulty=difficulty)
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Не найдено подходящих заданий"
-        )
-
-    # Создаем назначение на сегодня
-    assignment = await assignment_crud.create_daily_assignment(
-        db,
-        user_id=user_id,
-        task_id=task.id,
-        assigned_date=date.today()
-    )
-
-    return AssignmentResponse.model_validate(assignment)
+    # Нет pending заданий - выбираем новое. Если задание удалено в другой
+    # реплике, а каталог еще не обновился, INSERT нарушает внешний ключ:
+    # перечитываем каталог и выбираем еще раз
+    for attempt in range(2):
+        task_id = await _pick_task_id(db, user_id, category, difficulty)
+        if not task_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Не найдено подходящих заданий"
+            )
+
+        try:
+            # Создаем назначение на сегодня
+            assignment = await assignment_crud.create_daily_assignment(
+                db,
+                user_id=user_id,
+                task_id=task_id,
+                assigned_date=today
+            )
+        except IntegrityError:
+            if attempt:
+                raise
+            await db.rollback()
+            task_catalog.invalidate()
+            continue
+
+        return AssignmentResponse.model_validate(assignment)
 
 
 async def complete_task(
@@ -151,7 +310,8 @@ async def get_task_history(
     db: AsyncSession,
     user_id: UUID,
     limit: int = 10,
-    offset: int = 0
+    offset: int = 0,
+    after: Optional[tuple[Optional[date], UUID]] = None
 ) -> list[AssignmentResponse]:
     """
     Получить историю заданий пользователя.
@@ -161,6 +321,7 @@ async def get_task_history(
         user_id: ID пользователя
         limit: Максимальное количество записей
         offset: Смещение для пагинации
+        after: Ключ (assigned_date, id) последней записи предыдущей страницы
 
     Returns:
         list[AssignmentResponse]: Список назначений с заданиями
@@ -169,7 +330,8 @@ async def get_task_history(
         db,
         user_id=user_id,
         skip=offset,
-        limit=limit
+        limit=limit,
+        after=after
     )
 
     return [AssignmentResponse.model_validate(a) for a in assignments]
@@ -177,7 +339,7 @@ async def get_task_history(
 
 async def get_today_task(db: AsyncSession, user_id: UUID) -> Optional[AssignmentResponse]:
     """
-    Получить задание на сегодня, если оно существует.
+    Получить задание на сегодня (по часовому поясу пользователя), если оно существует.
 
     Args:
         db: Сессия базы данных
@@ -186,7 +348,8 @@ async def get_today_task(db: AsyncSession, user_id: UUID) -> Optional[Assignment
     Returns:
         Optional[AssignmentResponse]: Задание на сегодня или None
     """
-    assignment = await assignment_crud.get_today_assignment(db, user_id)
+    today = await user_crud.get_local_date(db, user_id)
+    assignment = await assignment_crud.get_today_assignment(db, user_id, today)
     if not assignment:
         return None
 
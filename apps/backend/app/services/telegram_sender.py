@@ -3,21 +3,178 @@ Telegram Sender Service.
 Отправка сообщений через Telegram Bot API.
 """
 
+import asyncio
+import enum
 import logging
-from typing import Optional
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, AsyncIterable, Iterable, Union, Callable
+from uuid import UUID
 import httpx
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+# Фрагменты описаний ошибок 400, означающие, что писать в чат больше нельзя
+PERMANENT_BAD_REQUEST_ERRORS = (
+    "chat not found",
+    "user not found",
+    "user is deactivated",
+    "peer_id_invalid",
+)
+
+
+class DeliveryOutcome(str, enum.Enum):
+    """Результат доставки сообщения."""
+    SENT = "sent"
+    FAILED = "failed"  # Временная ошибка после исчерпания повторов или ошибка запроса
+    BLOCKED = "blocked"  # Постоянная ошибка чата: бот заблокирован, чат не найден
+
+
+@dataclass
+class DeliveryJob:
+    """Сообщение для отправки движком доставки."""
+    chat_id: int
+    text: str
+    reply_markup: Optional[dict] = None
+    user_id: Optional[UUID] = None
+    outbox_id: Optional[UUID] = None
+    locked_until: Optional[datetime] = None  # Токен захвата сообщения outbox
+
+
+@dataclass
+class DeliveryStats:
+    """Статистика одного прогона доставки."""
+    sent: int = 0
+    failed: int = 0
+    blocked: int = 0
+    retries: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+
+    @property
+    def total(self) -> int:
+        """Общее количество обработанных сообщений."""
+        return self.sent + self.failed + self.blocked
+
+    @property
+    def duration(self) -> float:
+        """Длительность прогона в секундах."""
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def rate(self) -> float:
+        """Достигнутая пропускная способность (сообщений в секунду)."""
+        return self.total / self.duration if self.duration > 0 else 0.0
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты по алгоритму token bucket.
+
+    Attributes:
+        rate: Скорость пополнения (токенов в секунду)
+        capacity: Максимальный размер всплеска
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """Инициализация ограничителя."""
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """
+        Приостановить выдачу токенов (например, по retry_after от Telegram).
+
+        Args:
+            seconds: Длительность паузы в секундах
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        """Дождаться и забрать один токен."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
 class TelegramSender:
     """Сервис для отправки сообщений через Telegram Bot API."""
 
     def __init__(self):
         """Инициализация сервиса."""
         self.bot_token = settings.TELEGRAM_BOT_TOKEN
-        self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
+        self.base_url = f"{settings.TELEGRAM_API_URL}/bot{self.bot_token}"
+        # Глобальный лимит Telegram общий для всех прогонов этого процесса
+        self.global_bucket = TokenBucket(self._process_rate_limit())
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @staticmethod
+    def _process_rate_limit() -> float:
+        """
+        Доля глобального лимита бота, доступная этому процессу.
+
+        Лимит Bot API действует на бота целиком, а TokenBucket - в пределах
+        процесса. Если outbox доставляют все реплики, лимит делится поровну
+        между OUTBOX_DRAIN_PROCESSES обработчиками.
+
+        Returns:
+            float: Сообщений в секунду для этого процесса
+        """
+        if settings.OUTBOX_DRAIN_ON_ALL_REPLICAS:
+            return settings.TELEGRAM_GLOBAL_RATE_LIMIT / max(settings.OUTBOX_DRAIN_PROCESSES, 1)
+        return settings.TELEGRAM_GLOBAL_RATE_LIMIT
+
+    async def open(self) -> None:
+        """
+        Открыть долгоживущий HTTP клиент с пулом keep-alive соединений.
+        Вызывается при старте приложения (lifespan).
+        """
+        if self._client is not None:
+            return
+
+        self._client = httpx.AsyncClient(
+            timeout=settings.TELEGRAM_HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.TELEGRAM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.TELEGRAM_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=settings.TELEGRAM_HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    async def close(self) -> None:
+        """Закрыть HTTP клиент и все соединения пула."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Получить общий HTTP клиент, открыв его при первом обращении."""
+        if self._client is None:
+            await self.open()
+        return self._client
 
     async def send_message(
         self,
@@ -38,28 +195,213 @@ class TelegramSender:
         Returns:
             bool: True если успешно отправлено
         """
-        try:
-            url = f"{self.base_url}/sendMessage"
+        outcome = await self.send(
+            chat_id=chat_id,
+            text=text,
+            parse_mode=parse_mode,
+            reply_markup=reply_markup
+        )
+        return outcome == DeliveryOutcome.SENT
 
-            payload = {
-                "chat_id": chat_id,
-                "text": text,
-                "parse_mode": parse_mode
-            }
+    async def send(
+        self,
+        chat_id: int,
+        text: str,
+        parse_mode: str = "HTML",
+        reply_markup: Optional[dict] = None,
+        chat_bucket: Optional[TokenBucket] = None,
+        stats: Optional[DeliveryStats] = None
+    ) -> DeliveryOutcome:
+        """
+        Отправить сообщение с учетом лимитов и повторами.
+
+        429 приостанавливает глобальный лимит и лимит чата на retry_after и
+        повторяет отправку. 5xx и сетевые ошибки повторяются с экспоненциальной
+        задержкой со случайным разбросом в пределах бюджета повторов. 403 и
+        400 "chat not found" считаются постоянными и не повторяются.
+
+        Args:
+            chat_id: ID чата в Telegram
+            text: Текст сообщения
+            parse_mode: Режим парсинга (HTML/Markdown)
+            reply_markup: Inline клавиатура
+            chat_bucket: Лимитер чата (опционально)
+            stats: Статистика прогона для учета повторов (опционально)
+
+        Returns:
+            DeliveryOutcome: Результат доставки
+        """
+        url = f"{self.base_url}/sendMessage"
+        payload = {
+            "chat_id": chat_id,
+            "text": text,
+            "parse_mode": parse_mode
+        }
+
+        if reply_markup:
+            payload["reply_markup"] = reply_markup
 
-            if reply_markup:
-                payload["reply_markup"] = reply_markup
+        attempt = 0
+        while True:
+            if chat_bucket is not None:
+                await chat_bucket.acquire()
+            await self.global_bucket.acquire()
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            retry_after = None
+            try:
+                client = await self._get_client()
                 response = await client.post(url, json=payload)
-                response.raise_for_status()
+            except httpx.TransportError as e:
+                error = f"network error: {str(e)}"
+            except Exception as e:
+                logger.error(f"Error sending message to chat_id={chat_id}: {str(e)}")
+                return DeliveryOutcome.FAILED
+            else:
+                if response.is_success:
+                    logger.info(f"Message sent to chat_id={chat_id}")
+                    return DeliveryOutcome.SENT
+
+                body = self._parse_error(response)
+                description = body.get("description", response.text)
+                error = f"HTTP {response.status_code}: {description}"
+
+                if response.status_code == 429:
+                    retry_after = float(
+                        (body.get("parameters") or {}).get("retry_after", 1)
+                    )
+                    self.global_bucket.pause(retry_after)
+                    if chat_bucket is not None:
+                        chat_bucket.pause(retry_after)
+                elif self._is_permanent_error(response.status_code, description):
+                    logger.warning(f"Chat {chat_id} is unreachable permanently: {error}")
+                    return DeliveryOutcome.BLOCKED
+                elif response.status_code < 500:
+                    logger.error(f"Error sending message to chat_id={chat_id}: {error}")
+                    return DeliveryOutcome.FAILED
+
+            attempt += 1
+            if attempt > settings.TELEGRAM_MAX_RETRIES:
+                logger.error(
+                    f"Error sending message to chat_id={chat_id} "
+                    f"after {attempt} attempts: {error}"
+                )
+                return DeliveryOutcome.FAILED
+
+            if stats is not None:
+                stats.retries += 1
+
+            # При 429 ожидание обеспечивают приостановленные лимитеры
+            if retry_after is None:
+                delay = min(
+                    settings.TELEGRAM_RETRY_MAX_DELAY,
+                    settings.TELEGRAM_RETRY_BASE_DELAY * 2 ** (attempt - 1)
+                )
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
 
-            logger.info(f"Message sent to chat_id={chat_id}")
+    @staticmethod
+    def _parse_error(response: httpx.Response) -> dict:
+        """Разобрать тело ошибки Bot API (ok=false, description, parameters)."""
+        try:
+            body = response.json()
+        except ValueError:
+            return {}
+        return body if isinstance(body, dict) else {}
+
+    @staticmethod
+    def _is_permanent_error(status_code: int, description: str) -> bool:
+        """Проверить, что ошибка означает невозможность писать в чат."""
+        if status_code == 403:
             return True
+        if status_code == 400:
+            description = description.lower()
+            return any(error in description for error in PERMANENT_BAD_REQUEST_ERRORS)
+        return False
+
+    async def deliver(
+        self,
+        jobs: Union[AsyncIterable[DeliveryJob], Iterable[DeliveryJob]],
+        concurrency: Optional[int] = None,
+        on_result: Optional[Callable[[DeliveryJob, DeliveryOutcome], None]] = None
+    ) -> DeliveryStats:
+        """
+        Отправить поток сообщений с ограниченной параллельностью.
+
+        Каждое сообщение проходит через лимит чата и глобальный лимит бота,
+        поэтому время рассылки определяется лимитами Telegram, а не
+        суммой задержек запросов.
+
+        Args:
+            jobs: Поток сообщений (синхронный или асинхронный итерируемый объект)
+            concurrency: Количество одновременных запросов (по умолчанию из настроек)
+            on_result: Обработчик результата каждого сообщения (опционально).
+                Если он или отправка выбрасывает исключение, сообщение
+                считается неудачным, а обработчик продолжает работу.
+
+        Returns:
+            DeliveryStats: Статистика прогона
+        """
+        concurrency = concurrency or settings.TELEGRAM_SEND_CONCURRENCY
+        stats = DeliveryStats()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        chat_buckets: dict[int, TokenBucket] = {}
+
+        async def worker():
+            while True:
+                job = await queue.get()
+                if job is None:
+                    return
+
+                bucket = chat_buckets.get(job.chat_id)
+                if bucket is None:
+                    bucket = TokenBucket(settings.TELEGRAM_PER_CHAT_RATE_LIMIT, capacity=1)
+                    chat_buckets[job.chat_id] = bucket
+
+                # Ошибка одного сообщения не должна останавливать обработчик:
+                # иначе, когда упадут все, производитель навсегда встанет на queue.put
+                try:
+                    outcome = await self.send(
+                        chat_id=job.chat_id,
+                        text=job.text,
+                        reply_markup=job.reply_markup,
+                        chat_bucket=bucket,
+                        stats=stats
+                    )
+                except Exception as e:
+                    logger.error(f"Error delivering message to chat_id={job.chat_id}: {str(e)}")
+                    outcome = DeliveryOutcome.FAILED
+
+                if on_result is not None:
+                    try:
+                        on_result(job, outcome)
+                    except Exception as e:
+                        logger.error(f"Error handling delivery result for chat_id={job.chat_id}: {str(e)}")
+                        outcome = DeliveryOutcome.FAILED
+
+                if outcome == DeliveryOutcome.SENT:
+                    stats.sent += 1
+                elif outcome == DeliveryOutcome.BLOCKED:
+                    stats.blocked += 1
+                else:
+                    stats.failed += 1
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            if isinstance(jobs, AsyncIterable):
+                async for job in jobs:
+                    await queue.put(job)
+            else:
+                for job in jobs:
+                    await queue.put(job)
+
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            stats.finished_at = time.monotonic()
 
-        except Exception as e:
-            logger.error(f"Error sending message to chat_id={chat_id}: {str(e)}")
-            return False
+        return stats
 
     def format_morning_message(self, user_name: str, task: dict) -> str:
         """
@@ -0,0 +1,142 @@
+"""
+User Cache Service.
+Кэш аутентифицированных пользователей для зависимости get_current_user.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+from uuid import UUID
+from app.core.config import settings
+from app.schemas.user import UserInDB
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # redis - опциональная зависимость
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+
+class UserCache:
+    """
+    Кэш снимков пользователей (UserInDB) по ID с коротким TTL.
+
+    По умолчанию - LRU в памяти процесса, ограниченный max_size. Если задан
+    REDIS_URL и установлен пакет redis, кэш общий для всех воркеров и
+    реплик, и инвалидация из одного процесса видна остальным. Ошибки Redis
+    не ломают запросы: пользователь читается из БД.
+
+    Изменения пользователя через user_crud инвалидируют запись; изменения в
+    обход CRUD становятся видны не позже чем через TTL.
+    """
+
+    def __init__(self, ttl: float, max_size: int, redis_url: Optional[str] = None):
+        """
+        Args:
+            ttl: Время жизни записи в секундах (0 - кэш выключен)
+            max_size: Максимальное количество записей в памяти процесса
+            redis_url: URL Redis (опционально)
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[UUID, tuple[float, UserInDB]] = OrderedDict()
+        self._redis = None
+
+        if redis_url and ttl > 0:
+            if redis_asyncio is None:
+                logger.warning("REDIS_URL is set but redis package is not installed, using in-process user cache")
+            else:
+                self._redis = redis_asyncio.from_url(redis_url)
+
+    @staticmethod
+    def _key(user_id: UUID) -> str:
+        return f"user:{user_id}"
+
+    async def get(self, user_id: UUID) -> Optional[UserInDB]:
+        """
+        Получить пользователя из кэша.
+
+        Args:
+            user_id: ID пользователя
+
+        Returns:
+            Optional[UserInDB]: Снимок пользователя или None при промахе
+        """
+        if self.ttl <= 0:
+            return None
+
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(self._key(user_id))
+            except Exception as e:
+                logger.warning(f"User cache read failed: {e}")
+                return None
+            return UserInDB.model_validate_json(raw) if raw else None
+
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(user_id, None)
+            return None
+        self._entries.move_to_end(user_id)
+        return user
+
+    async def set(self, user: UserInDB) -> None:
+        """
+        Сохранить снимок пользователя.
+
+        Args:
+            user: Снимок пользователя
+        """
+        if self.ttl <= 0:
+            return
+
+        if self._redis is not None:
+            try:
+                await self._redis.set(self._key(user.id), user.model_dump_json(), ex=max(1, int(self.ttl)))
+            except Exception as e:
+                logger.warning(f"User cache write failed: {e}")
+            return
+
+        self._entries[user.id] = (time.monotonic() + self.ttl, user)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, user_ids: Iterable[UUID]) -> None:
+        """
+        Удалить пользователей из кэша.
+
+        Args:
+            user_ids: ID пользователей
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+
+        if self._redis is not None:
+            try:
+                await self._redis.delete(*(self._key(user_id) for user_id in user_ids))
+            except Exception as e:
+                logger.warning(f"User cache invalidation failed: {e}")
+            return
+
+        for user_id in user_ids:
+            self._entries.pop(user_id, None)
+
+    async def close(self) -> None:
+        """Закрыть соединение с Redis (если используется)."""
+        if self._redis is not None:
+            await self._redis.aclose()
+
+
+# Создаем глобальный экземпляр
+user_cache = UserCache(
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    redis_url=settings.REDIS_URL
+)
@@ -0,0 +1,111 @@
+"""
+Нагрузочный тест: задержка обычных запросов во время шторма входов по паролю.
+
+Измеряет задержку GET /api/v1/tasks/today (с токеном) сначала без
+нагрузки, затем во время шторма POST /api/v1/auth/login по email и паролю.
+Пока bcrypt выполнялся в event loop, каждый вход останавливал обработку всех
+остальных запросов воркера, и p99 /tasks/today рос до сотен миллисекунд; с
+пулом потоков и лимитом допуска он должен оставаться близким к базовому.
+Ответы 503 во время шторма - ожидаемое срабатывание лимита допуска.
+
+Нужен запущенный backend (лучше с одним воркером uvicorn, чтобы эффект был
+виден) и пользователь с паролем, например администратор из seed.
+
+Запуск (из apps/backend):
+    python scripts/bench_login_storm.py --url http://localhost:8000 \\
+        --email admin@psychologist-bot.com --password admin123 --logins 50
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _report(name: str, latencies: list[float]) -> None:
+    if not latencies:
+        print(f"{name:>12}: нет ответов")
+        return
+    print(
+        f"{name:>12}: {len(latencies):5d} запросов, "
+        f"p50 {_percentile(latencies, 50) * 1000:7.1f} мс, "
+        f"p95 {_percentile(latencies, 95) * 1000:7.1f} мс, "
+        f"p99 {_percentile(latencies, 99) * 1000:7.1f} мс, "
+        f"max {max(latencies) * 1000:7.1f} мс"
+    )
+
+
+async def _probe(client: httpx.AsyncClient, token: str, duration: float, interval: float) -> list[float]:
+    """Запрашивать /tasks/today с фиксированным интервалом и собирать задержки."""
+    latencies = []
+    headers = {"Authorization": f"Bearer {token}"}
+    deadline = time.perf_counter() + duration
+
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.get("/api/v1/tasks/today", headers=headers)
+        # 404 - у пользователя нет задания на сегодня; для замера это нормально
+        if response.status_code not in (200, 404):
+            response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - started)))
+
+    return latencies
+
+
+async def _storm(client: httpx.AsyncClient, credentials: dict, concurrency: int, stop: asyncio.Event) -> Counter:
+    """Непрерывно выполнять входы по паролю в concurrency потоков."""
+    statuses = Counter()
+
+    async def one() -> None:
+        while not stop.is_set():
+            response = await client.post("/api/v1/auth/login", json=credentials)
+            statuses[response.status_code] += 1
+
+    await asyncio.gather(*(one() for _ in range(concurrency)))
+    return statuses
+
+
+async def main(url: str, email: str, password: str, logins: int, duration: float, interval: float) -> None:
+    credentials = {"email": email, "password": password}
+    limits = httpx.Limits(max_connections=logins + 10)
+
+    async with httpx.AsyncClient(base_url=url, timeout=30.0, limits=limits) as client:
+        response = await client.post("/api/v1/auth/login", json=credentials)
+        response.raise_for_status()
+        token = response.json()["access_token"]
+
+        baseline = await _probe(client, token, duration, interval)
+
+        stop = asyncio.Event()
+        storm = asyncio.create_task(_storm(client, credentials, logins, stop))
+        # Даем шторму разогнаться до начала замера
+        await asyncio.sleep(1.0)
+        under_storm = await _probe(client, token, duration, interval)
+        stop.set()
+        statuses = await storm
+
+    _report("без нагрузки", baseline)
+    _report("шторм входов", under_storm)
+    summary = ", ".join(f"{code}: {count}" for code, count in sorted(statuses.items()))
+    print(f"{'входы':>12}: {summary}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=50, help="Одновременных входов во время шторма")
+    parser.add_argument("--duration", type=float, default=10.0, help="Длительность каждого замера, с")
+    parser.add_argument("--interval", type=float, default=0.05, help="Интервал запросов /tasks/today, с")
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.email, args.password, args.logins, args.duration, args.interval))
@@ -0,0 +1,178 @@
+"""
+Бенчмарк параллельной доставки outbox несколькими процессами.
+
+Создает синтетических пользователей и сообщения outbox, поднимает локальную
+заглушку Bot API с задержкой ответа и для каждого числа обработчиков
+запускает столько же процессов, выполняющих outbox_worker.drain(). Процессы
+делят очередь через FOR UPDATE SKIP LOCKED; при доставке, ограниченной
+задержкой Bot API, время рассылки должно сокращаться почти линейно.
+
+Нужна PostgreSQL с примененными миграциями (DATABASE_URL). Запускайте на
+отдельной БД: обработчики доставляют все ожидающие сообщения outbox.
+Синтетические пользователи удаляются по завершении.
+
+Запуск (из apps/backend):
+    python scripts/bench_outbox_drain.py --users 5000 --workers 1 2 4 --latency 0.1
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date, datetime
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("SECRET_KEY", "bench-secret-key-bench-secret-key-0000")
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "bench")
+# Лимит Bot API не моделируется: измеряется распределение очереди
+os.environ.setdefault("TELEGRAM_GLOBAL_RATE_LIMIT", "1000000")
+
+BENCH_NAME = "bench-outbox-drain"
+BENCH_TELEGRAM_ID_BASE = 9_000_000_000_000
+
+
+async def _seed(users: int) -> None:
+    from sqlalchemy import insert
+    from app.core.database import AsyncSessionLocal
+    from app.crud import outbox as outbox_crud
+    from app.models.user import User, UserRole
+    from app.models.outbox import OutboxKind
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": uuid4(),
+            "telegram_id": BENCH_TELEGRAM_ID_BASE + i,
+            "name": BENCH_NAME,
+            "role": UserRole.USER,
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(users)
+    ]
+
+    async with AsyncSessionLocal() as db:
+        for start in range(0, len(rows), 1000):
+            await db.execute(insert(User).values(rows[start:start + 1000]))
+        await db.commit()
+        await outbox_crud.enqueue(db, [
+            {
+                "user_id": row["id"],
+                "kind": OutboxKind.MORNING,
+                "target_date": date.today(),
+                "chat_id": row["telegram_id"],
+                "text": "bench",
+            }
+            for row in rows
+        ])
+
+
+async def _reset() -> None:
+    from sqlalchemy import select, update
+    from app.core.database import AsyncSessionLocal
+    from app.models.user import User
+    from app.models.outbox import OutboxMessage, OutboxStatus
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.user_id.in_(
+                select(User.id).where(User.name == BENCH_NAME)
+            ))
+            .values(status=OutboxStatus.PENDING, attempts=0, locked_until=None, sent_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+
+async def _cleanup() -> None:
+    from sqlalchemy import delete
+    from app.core.database import AsyncSessionLocal, close_db
+    from app.models.user import User
+
+    async with AsyncSessionLocal() as db:
+        # Сообщения outbox удаляются каскадно
+        await db.execute(
+            delete(User)
+            .where(User.name == BENCH_NAME, User.telegram_id >= BENCH_TELEGRAM_ID_BASE)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+    await close_db()
+
+
+async def _worker() -> None:
+    from app.core.database import close_db
+    from app.services.telegram_sender import telegram_sender
+    from app.services.outbox_worker import outbox_worker
+
+    await telegram_sender.open()
+    try:
+        await outbox_worker.drain()
+    finally:
+        await telegram_sender.close()
+        await close_db()
+
+
+async def _run_workers(workers: int, env: dict) -> float:
+    started = time.perf_counter()
+    processes = [
+        await asyncio.create_subprocess_exec(
+            sys.executable, os.path.abspath(__file__), "--worker", env=env
+        )
+        for _ in range(workers)
+    ]
+    codes = await asyncio.gather(*(process.wait() for process in processes))
+    elapsed = time.perf_counter() - started
+    if any(codes):
+        raise RuntimeError(f"worker exited with codes {codes}")
+    return elapsed
+
+
+async def main(users: int, workers: list[int], latency: float, concurrency: int, port: int) -> None:
+    from telegram_stub import TelegramStub
+
+    stub = TelegramStub(latency=latency)
+    base_url = await stub.start(port=port)
+    env = {
+        **os.environ,
+        "TELEGRAM_API_URL": base_url,
+        "TELEGRAM_SEND_CONCURRENCY": str(concurrency),
+    }
+
+    await _seed(users)
+    try:
+        baseline = None
+        for count in workers:
+            await _reset()
+            stub.messages = 0
+            elapsed = await _run_workers(count, env)
+            baseline = baseline or elapsed
+            print(
+                f"{count:>3} worker(s): {stub.messages} messages in {elapsed:6.2f}s "
+                f"({stub.messages / elapsed:8.1f} msg/s, x{baseline / elapsed:.2f} "
+                f"vs {workers[0]} worker(s))"
+            )
+    finally:
+        await _cleanup()
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    if "--worker" in sys.argv:
+        asyncio.run(_worker())
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--latency", type=float, default=0.1, help="Задержка ответа заглушки, с")
+    parser.add_argument("--concurrency", type=int, default=20, help="TELEGRAM_SEND_CONCURRENCY на процесс")
+    parser.add_argument("--port", type=int, default=8082)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.workers, args.latency, args.concurrency, args.port))
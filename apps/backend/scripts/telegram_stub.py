@@ -0,0 +1,84 @@
+"""
+Локальная заглушка Telegram Bot API для бенчмарков рассылки.
+
+Отвечает на sendMessage как настоящий Bot API (с опциональной задержкой)
+и считает принятые сообщения и новые TCP соединения.
+
+Запуск отдельно:
+    python scripts/telegram_stub.py --port 8081 --latency 0.05
+"""
+
+import argparse
+import asyncio
+from aiohttp import web
+
+
+class TelegramStub:
+    """Заглушка Bot API на aiohttp."""
+
+    def __init__(self, latency: float = 0.0):
+        """
+        Args:
+            latency: Искусственная задержка ответа в секундах
+        """
+        self.latency = latency
+        self.messages = 0
+        self._peers: set = set()
+        self._runner = None
+
+    @property
+    def connections(self) -> int:
+        """Количество различных TCP соединений, через которые пришли запросы."""
+        return len(self._peers)
+
+    async def _send_message(self, request: web.Request) -> web.Response:
+        self._peers.add(request.transport.get_extra_info("peername"))
+        payload = await request.json()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.messages += 1
+        return web.json_response({
+            "ok": True,
+            "result": {"message_id": self.messages, "chat": {"id": payload.get("chat_id")}}
+        })
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8081) -> str:
+        """
+        Запустить заглушку.
+
+        Returns:
+            str: Базовый URL для TELEGRAM_API_URL
+        """
+        app = web.Application()
+        app.router.add_post("/bot{token}/sendMessage", self._send_message)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        return f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        """Остановить заглушку."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def _serve(host: str, port: int, latency: float) -> None:
+    stub = TelegramStub(latency=latency)
+    url = await stub.start(host, port)
+    print(f"Telegram stub listening on {url}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(_serve(args.host, args.port, args.latency))
@@ -0,0 +1,142 @@
+"""
+Количество запросов CRUD операций назначений.
+
+Запись назначения - один INSERT/UPDATE ... RETURNING вместе с заданием,
+затем COMMIT, без повторного SELECT и refresh. Сессия подменяется
+записывающей, поэтому тесты не требуют PostgreSQL.
+"""
+
+from datetime import date, datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.crud import assignment as assignment_crud
+from app.models.assignment import AssignmentStatus
+from app.schemas.task import AssignmentUpdate
+
+
+class RecordingResult:
+    """Результат execute: возвращает заранее заданное назначение."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+
+class RecordingSession:
+    """Сессия, записывающая выполненные запросы вместо обращения к БД."""
+
+    def __init__(self, *results):
+        self.statements: list[str] = []
+        self.commits = 0
+        self.refreshes = 0
+        self._results = list(results)
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return RecordingResult(self._results.pop(0) if self._results else None)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def refresh(self, *args, **kwargs):
+        self.refreshes += 1
+
+    def writes(self) -> list[str]:
+        """Запросы записи назначений (data-modifying CTE с RETURNING)."""
+        return [sql for sql in self.statements if sql.startswith("WITH written AS")]
+
+    def assert_single_write(self):
+        """Одна запись с RETURNING, один COMMIT, без SELECT назначений после записи."""
+        writes = self.writes()
+        assert len(writes) == 1
+        assert "RETURNING" in writes[0]
+        after_write = self.statements[self.statements.index(writes[0]) + 1:]
+        assert not [sql for sql in after_write if sql.lstrip().startswith("SELECT")]
+        assert self.commits == 1
+        assert self.refreshes == 0
+
+
+def _assignment(**fields) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid4(),
+        user_id=uuid4(),
+        task_id=uuid4(),
+        assigned_date=date(2026, 10, 17),
+        completed_at=None,
+        **fields
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_daily_assignment_to_queue():
+    written = _assignment()
+    db = RecordingSession(written)
+
+    result = await assignment_crud.create_daily_assignment(db, written.user_id, written.task_id)
+
+    assert result is written
+    db.assert_single_write()
+    assert "INSERT INTO assignments" in db.writes()[0]
+    # Единственный запрос после записи - инкремент счетчиков user_stats
+    assert len(db.statements) == 2
+    assert db.statements[1].startswith("INSERT INTO user_stats")
+
+
+@pytest.mark.asyncio
+async def test_create_daily_assignment_for_date():
+    written = _assignment()
+    # Проверка существования назначения на дату ничего не находит
+    db = RecordingSession(None, written)
+
+    result = await assignment_crud.create_daily_assignment(
+        db, written.user_id, written.task_id, assigned_date=written.assigned_date
+    )
+
+    assert result is written
+    db.assert_single_write()
+    assert len(db.statements) == 3
+
+
+@pytest.mark.asyncio
+async def test_mark_as_completed():
+    written = _assignment(status=AssignmentStatus.COMPLETED)
+    written.completed_at = datetime(2026, 10, 17, 9, 0)
+    db = RecordingSession(written)
+
+    result = await assignment_crud.mark_as_completed(db, written.id, answer_text="ответ")
+
+    assert result is written
+    db.assert_single_write()
+    assert "UPDATE assignments" in db.writes()[0]
+    assert len(db.statements) == 2
+    assert db.statements[1].startswith("INSERT INTO user_stats")
+
+
+@pytest.mark.asyncio
+async def test_assign_pending_to_date():
+    written = _assignment()
+    db = RecordingSession(written)
+
+    result = await assignment_crud.assign_pending_to_date(db, written.id, written.assigned_date)
+
+    assert result is written
+    db.assert_single_write()
+    assert len(db.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_update():
+    written = _assignment()
+    db = RecordingSession(written)
+
+    result = await assignment_crud.update(db, written.id, AssignmentUpdate(answer_text="ответ"))
+
+    assert result is written
+    db.assert_single_write()
+    assert len(db.statements) == 1
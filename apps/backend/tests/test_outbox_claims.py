@@ -0,0 +1,74 @@
+"""
+Запись результатов доставки outbox только по своему захвату.
+
+Если lease истек и порцию захватил другой обработчик, результаты
+прежнего владельца не должны перезаписать статус сообщения.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.crud import outbox as outbox_crud
+from app.models.outbox import OutboxStatus
+from app.services.outbox_worker import OutboxWorker
+from app.services.telegram_sender import DeliveryOutcome
+
+
+class RowcountSession:
+    """Сессия, записывающая запросы и возвращающая заданный rowcount."""
+
+    def __init__(self, rowcount: int):
+        self.rowcount = rowcount
+        self.statements: list[str] = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return SimpleNamespace(rowcount=self.rowcount)
+
+    async def commit(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_status_is_written_only_for_current_claim():
+    claims = [(uuid4(), datetime(2026, 10, 17, 9, 5))]
+    db = RowcountSession(rowcount=0)
+
+    updated = await outbox_crud.mark_status(db, claims, OutboxStatus.SENT)
+    updated += await outbox_crud.record_failed_attempts(db, claims, 3, timedelta(seconds=60))
+
+    assert updated == 0
+    for sql in db.statements:
+        assert "(outbox.id, outbox.locked_until) IN" in sql
+
+
+@pytest.mark.asyncio
+async def test_flush_reports_reclaimed_messages(monkeypatch, caplog):
+    async def mark_status(db, claims, status):
+        return 0  # Захват перехвачен другим обработчиком
+
+    async def record_failed_attempts(db, claims, **kwargs):
+        return len(claims)
+
+    async def mark_telegram_blocked(db, user_ids):
+        pass
+
+    monkeypatch.setattr(outbox_crud, "mark_status", mark_status)
+    monkeypatch.setattr(outbox_crud, "record_failed_attempts", record_failed_attempts)
+    monkeypatch.setattr("app.crud.user.mark_telegram_blocked", mark_telegram_blocked)
+
+    lease = datetime(2026, 10, 17, 9, 5)
+    results = {outcome: [] for outcome in DeliveryOutcome}
+    results[DeliveryOutcome.SENT] = [(uuid4(), lease), (uuid4(), lease)]
+    results[DeliveryOutcome.FAILED] = [(uuid4(), lease)]
+
+    with caplog.at_level(logging.WARNING):
+        await OutboxWorker()._flush(None, results, [])
+
+    assert "lease expired for 2 messages" in caplog.text
+    assert not any(results.values())
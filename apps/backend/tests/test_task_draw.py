@@ -0,0 +1,149 @@
+"""
+Выдача заданий при устаревшем каталоге.
+
+Задание удалено в другой реплике, а каталог этого процесса еще содержит
+его ID: запись назначения нарушает внешний ключ, после чего каталог
+перечитывается и задание выдается заново.
+"""
+
+from datetime import date
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models.task import TaskDifficulty
+from app.services import task_service
+from app.services.task_catalog import TaskCatalog
+
+
+class TasksSession:
+    """Сессия с таблицей заданий в памяти: отвечает на запрос каталога."""
+
+    def __init__(self, *task_ids):
+        self.task_ids = list(task_ids)
+        self.rollbacks = 0
+
+    async def execute(self, statement, *args, **kwargs):
+        rows = [
+            (task_id, "title", "description", "category", TaskDifficulty.EASY)
+            for task_id in self.task_ids
+        ]
+        return SimpleNamespace(all=lambda: rows)
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def stale_catalog(monkeypatch):
+    """Каталог загружен с двумя заданиями, после чего первое удалено."""
+    deleted, live = uuid4(), uuid4()
+    db = TasksSession(deleted, live)
+    catalog = TaskCatalog(ttl=300)
+    monkeypatch.setattr(task_service, "task_catalog", catalog)
+
+    decks = {}
+
+    async def pop_task_decks(db, user_ids):
+        # Верхняя карта колоды - удаленное задание, пока каталог его знает
+        return {
+            user_id: SimpleNamespace(task_id=deleted, remaining=1)
+            for user_id in user_ids
+            if user_id not in decks
+        }
+
+    async def set_task_decks(db, new_decks):
+        decks.update(new_decks)
+
+    monkeypatch.setattr(task_service.task_deck_crud, "pop", pop_task_decks)
+    monkeypatch.setattr(task_service.task_deck_crud, "save", set_task_decks)
+    return SimpleNamespace(db=db, catalog=catalog, deleted=deleted, live=live)
+
+
+def _check_foreign_key(db, task_ids):
+    if any(task_id not in db.task_ids for task_id in task_ids):
+        raise IntegrityError("INSERT INTO assignments", {}, Exception("assignments_task_id_fkey"))
+
+
+@pytest.mark.asyncio
+async def test_assign_next_tasks_redraws_deleted_task(stale_catalog, monkeypatch):
+    db = stale_catalog.db
+    await stale_catalog.catalog.get_all(db)
+    db.task_ids.remove(stale_catalog.deleted)
+
+    async def create_bulk_assignments(db, pairs, assigned_date=None):
+        _check_foreign_key(db, [task_id for _, task_id in pairs])
+        return [SimpleNamespace(id=uuid4(), user_id=user_id, task_id=task_id) for user_id, task_id in pairs]
+
+    monkeypatch.setattr(task_service.assignment_crud, "create_bulk_assignments", create_bulk_assignments)
+
+    user_ids = [uuid4(), uuid4()]
+    created = await task_service.assign_next_tasks(db, user_ids)
+
+    assert db.rollbacks == 1
+    assert {row.user_id for row in created} == set(user_ids)
+    assert {row.task_id for row in created} == {stale_catalog.live}
+    assert stale_catalog.deleted not in await stale_catalog.catalog.get_all(db)
+
+
+@pytest.mark.asyncio
+async def test_assign_daily_task_redraws_deleted_task(stale_catalog, monkeypatch):
+    db = stale_catalog.db
+    await stale_catalog.catalog.get_all(db)
+    db.task_ids.remove(stale_catalog.deleted)
+
+    async def nothing(*args, **kwargs):
+        return None
+
+    async def get_local_date(db, user_id):
+        return date(2026, 10, 17)
+
+    async def create_daily_assignment(db, user_id, task_id, assigned_date=None):
+        _check_foreign_key(db, [task_id])
+        return SimpleNamespace(user_id=user_id, task_id=task_id, assigned_date=assigned_date)
+
+    monkeypatch.setattr(task_service.user_crud, "get_local_date", get_local_date)
+    monkeypatch.setattr(task_service.assignment_crud, "has_completed_task_today", nothing)
+    monkeypatch.setattr(task_service.assignment_crud, "get_today_assignment", nothing)
+    monkeypatch.setattr(task_service.assignment_crud, "get_next_pending_assignment", nothing)
+    monkeypatch.setattr(task_service.assignment_crud, "create_daily_assignment", create_daily_assignment)
+    monkeypatch.setattr(task_service, "AssignmentResponse", SimpleNamespace(model_validate=lambda a: a))
+
+    assignment = await task_service.assign_daily_task(db, uuid4())
+
+    assert db.rollbacks == 1
+    assert assignment.task_id == stale_catalog.live
+
+
+@pytest.mark.asyncio
+async def test_draw_skips_deleted_cards(monkeypatch):
+    live, other = uuid4(), uuid4()
+    db = TasksSession(live, other)
+    monkeypatch.setattr(task_service, "task_catalog", TaskCatalog(ttl=300))
+
+    user_id = uuid4()
+    # Колода перемешана до удаления двух заданий
+    decks = {user_id: [uuid4(), uuid4(), live, other]}
+    saved = {}
+
+    async def pop(db, user_ids):
+        popped = {}
+        for deck_user_id in user_ids:
+            deck = decks.get(deck_user_id)
+            if deck:
+                popped[deck_user_id] = SimpleNamespace(task_id=deck.pop(0), remaining=len(deck))
+        return popped
+
+    async def save(db, new_decks):
+        saved.update(new_decks)
+
+    monkeypatch.setattr(task_service.task_deck_crud, "pop", pop)
+    monkeypatch.setattr(task_service.task_deck_crud, "save", save)
+
+    picks = await task_service.draw_next_tasks(db, [user_id])
+
+    assert picks == {user_id: live}
+    assert decks[user_id] == [other]
+    assert not saved
@@ -0,0 +1,58 @@
+"""
+Движок доставки TelegramSender.deliver.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.telegram_sender import TelegramSender, DeliveryJob, DeliveryOutcome
+
+
+def _jobs(count: int) -> list[DeliveryJob]:
+    return [DeliveryJob(chat_id=chat_id, text="text") for chat_id in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_deliver_survives_failing_on_result():
+    sender = TelegramSender()
+
+    async def send(**kwargs):
+        return DeliveryOutcome.SENT
+
+    def on_result(job, outcome):
+        raise RuntimeError("result handler failed")
+
+    sender.send = send
+
+    # Сообщений больше, чем помещается в очередь: при падении обработчиков
+    # производитель бы завис на queue.put
+    stats = await asyncio.wait_for(
+        sender.deliver(_jobs(50), concurrency=2, on_result=on_result),
+        timeout=5
+    )
+
+    assert stats.failed == 50
+    assert stats.sent == 0
+
+
+@pytest.mark.asyncio
+async def test_deliver_survives_failing_send():
+    sender = TelegramSender()
+    results = []
+
+    async def send(chat_id, **kwargs):
+        if chat_id % 2:
+            raise RuntimeError("send failed")
+        return DeliveryOutcome.SENT
+
+    sender.send = send
+
+    stats = await asyncio.wait_for(
+        sender.deliver(_jobs(20), concurrency=2, on_result=lambda job, outcome: results.append(outcome)),
+        timeout=5
+    )
+
+    assert stats.sent == 10
+    assert stats.failed == 10
+    assert sorted(results) == sorted([DeliveryOutcome.SENT] * 10 + [DeliveryOutcome.FAILED] * 10)
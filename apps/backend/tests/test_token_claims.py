@@ -0,0 +1,47 @@
+"""
+Проверка утверждений access токена в зависимостях FastAPI.
+"""
+
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.api.v1.dependencies import get_token_claims, _require_admin_claim
+from app.core.security import create_access_token
+
+
+def _credentials(**claims) -> HTTPAuthorizationCredentials:
+    token = create_access_token({"sub": str(uuid4()), **claims})
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.mark.asyncio
+async def test_current_token_is_accepted():
+    claims = await get_token_claims(_credentials(role="user", active=True, ver=0))
+
+    assert claims.ver == 0
+    assert claims.active is True
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("missing", ["role", "active", "ver"])
+async def test_token_without_claim_is_rejected(missing):
+    claims = {"role": "admin", "active": True, "ver": 0}
+    del claims[missing]
+
+    with pytest.raises(HTTPException) as error:
+        await get_token_claims(_credentials(**claims))
+
+    assert error.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_admin_claim_requires_admin_role():
+    claims = await get_token_claims(_credentials(role="user", active=True, ver=0))
+
+    with pytest.raises(HTTPException) as error:
+        await _require_admin_claim(claims)
+
+    assert error.value.status_code == 403
@@ -6,7 +6,7 @@
 
 import { useState, useMemo } from 'react'
 import Link from 'next/link'
-import { useAdminUsers } from '@/lib/hooks/use-admin'
+import { useAdminUsers, useAdminUsersProgress } from '@/lib/hooks/use-admin'
 import {
   Card,
   CardContent,
@@ -33,8 +33,24 @@ import {
   SelectTrigger,
   SelectValue,
 } from '@/components/ui/select'
-import { Users, Search, Eye, CheckCircle, XCircle } from 'lucide-react'
+import { Users, Search, Eye, CheckCircle, XCircle, Flame } from 'lucide-react'
 import { formatDate } from '@/lib/utils/formatters'
+import type { UserProgress } from '@/types'
+
+function UserProgressCell({ progress }: { progress: UserProgress }) {
+  return (
+    <div className="flex items-center gap-3 text-sm">
+      <span>
+        {progress.completed_tasks}/{progress.total_tasks} (
+        {progress.completion_rate.toFixed(0)}%)
+      </span>
+      <span className="flex items-center gap-1 text-orange-500">
+        <Flame className="h-4 w-4" />
+        {progress.current_streak}
+      </span>
+    </div>
+  )
+}
 
 export default function AdminUsersPage() {
   const [searchQuery, setSearchQuery] = useState('')
@@ -42,6 +58,10 @@ export default function AdminUsersPage() {
 
   const { data: users, isLoading } = useAdminUsers({ limit: 100 })
 
+  // Прогресс всех пользователей страницы - одним запросом
+  const userIds = useMemo(() => users?.map((u) => u.id) ?? [], [users])
+  const { data: progressByUser } = useAdminUsersProgress(userIds)
+
   // Фильтрация пользователей
   const filteredUsers = useMemo(() => {
     if (!users) return []
@@ -155,6 +175,7 @@ export default function AdminUsersPage() {
                     <TableHead>Telegram ID</TableHead>
                     <TableHead>Роль</TableHead>
                     <TableHead>Статус</TableHead>
+                    <TableHead>Прогресс</TableHead>
                     <TableHead>Дата регистрации</TableHead>
                     <TableHead className="text-right">Действия</TableHead>
                   </TableRow>
@@ -195,6 +216,13 @@ export default function AdminUsersPage() {
                           </div>
                         )}
                       </TableCell>
+                      <TableCell>
+                        {progressByUser?.[user.id] ? (
+                          <UserProgressCell progress={progressByUser[user.id]} />
+                        ) : (
+                          <span className="text-muted-foreground">—</span>
+                        )}
+                      </TableCell>
                       <TableCell>{formatDate(user.created_at)}</TableCell>
                       <TableCell className="text-right">
                         <Link href={`/admin/users/${user.id}`}>
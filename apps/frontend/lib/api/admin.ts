@@ -49,6 +49,21 @@ export const adminApi = {
     return response.data
   },
 
+  /**
+   * Получить статистику прогресса группы пользователей (до 100 ID) одним запросом
+   */
+  getUsersProgress: async (
+    userIds: string[]
+  ): Promise<Record<string, UserProgress>> => {
+    const params = new URLSearchParams()
+    userIds.forEach((id) => params.append('ids', id))
+    const response = await apiClient.get<Record<string, UserProgress>>(
+      '/api/v1/admin/users/progress',
+      { params }
+    )
+    return response.data
+  },
+
   /**
    * Получить список заданий пользователя по ID
    */
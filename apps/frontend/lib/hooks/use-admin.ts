@@ -48,6 +48,18 @@ export function useAdminUserProgress(userId: string) {
   })
 }
 
+/**
+ * Хук для получения прогресса группы пользователей (например, страницы списка)
+ */
+export function useAdminUsersProgress(userIds: string[]) {
+  return useQuery({
+    queryKey: ['admin', 'users', 'progress', userIds],
+    queryFn: () => adminApi.getUsersProgress(userIds),
+    enabled: userIds.length > 0,
+    staleTime: 1 * 60 * 1000,
+  })
+}
+
 /**
  * Хук для получения списка заданий пользователя по ID
  */
@@ -23,6 +23,8 @@ export interface UserProgress {
   completed_tasks: number
   completion_rate: number // 0-100
   streak_days: number
+  current_streak: number
+  longest_streak: number
 }
 
 export interface UserUpdate {
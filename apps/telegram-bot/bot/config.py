@@ -33,6 +33,18 @@ class BotSettings(BaseSettings):
         description="URL Backend API для взаимодействия"
     )
 
+    # HTTP клиент к Backend API (общий на процесс)
+    BACKEND_HTTP2: bool = False  # Включать при доступе к Backend через TLS прокси с HTTP/2
+    BACKEND_MAX_CONNECTIONS: int = 20
+    BACKEND_MAX_KEEPALIVE: int = 10
+    BACKEND_KEEPALIVE_EXPIRY: float = 30.0
+    BACKEND_CONNECT_TIMEOUT: float = 5.0
+    BACKEND_TIMEOUT_DEFAULT: float = 10.0
+    BACKEND_TIMEOUT_AUTH: float = 15.0
+    BACKEND_TIMEOUT_HEALTH: float = 3.0
+    TOKEN_REFRESH_MARGIN_SECONDS: float = 60.0  # Обновлять access токен заранее, до истечения
+    TOKEN_NOT_REGISTERED_TTL_SECONDS: float = 30.0  # Не повторять вход незарегистрированного пользователя
+
     # Опциональные настройки
     TELEGRAM_WEBHOOK_URL: Optional[str] = None
     DEBUG: bool = False
@@ -8,6 +8,7 @@ from telegram import Update
 from telegram.ext import CallbackQueryHandler, ContextTypes
 from telegram.error import BadRequest
 from bot.services.api_client import api_client
+from bot.services.token_manager import token_manager
 from bot.utils.keyboards import (
     get_main_menu_keyboard,
     get_task_keyboard,
@@ -50,8 +51,8 @@ async def handle_today_task(update: Update, context: ContextTypes.DEFAULT_TYPE)
     query = update.callback_query
     await query.answer()
 
-    # Проверяем наличие токена
-    token = context.user_data.get("token")
+    # Получаем токен (обновляется автоматически, при необходимости - повторный вход)
+    token = await token_manager.get_token(update.effective_user.id)
 
     if not token:
         try:
@@ -61,7 +62,7 @@ async def handle_today_task(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
 
     # Получаем задание на сегодня
-    task = await api_client.get_today_task(token)
+    task = await token_manager.call(update.effective_user.id, api_client.get_today_task)
 
     if not task:
         try:
@@ -123,8 +124,8 @@ async def handle_my_progress(update: Update, context: ContextTypes.DEFAULT_TYPE)
     query = update.callback_query
     await query.answer()
 
-    # Проверяем наличие токена
-    token = context.user_data.get("token")
+    # Получаем токен (обновляется автоматически, при необходимости - повторный вход)
+    token = await token_manager.get_token(update.effective_user.id)
 
     if not token:
         try:
@@ -134,7 +135,7 @@ async def handle_my_progress(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
 
     # Получаем статистику
-    progress = await api_client.get_user_progress(token)
+    progress = await token_manager.call(update.effective_user.id, api_client.get_user_progress)
 
     if not progress:
         try:
@@ -260,8 +261,8 @@ async def handle_skip(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     query = update.callback_query
     await query.answer()
 
-    # Проверяем наличие токена
-    token = context.user_data.get("token")
+    # Получаем токен (обновляется автоматически, при необходимости - повторный вход)
+    token = await token_manager.get_token(update.effective_user.id)
     task_id = context.user_data.get("current_task_id")
 
     if not token or not task_id:
@@ -272,10 +273,11 @@ async def handle_skip(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         return
 
     # Завершаем задание без ответа
-    result = await api_client.complete_task(
+    result = await token_manager.call(
+        update.effective_user.id,
+        api_client.complete_task,
         assignment_id=task_id,
-        answer_text=None,
-        token=token
+        answer_text=None
     )
 
     if result:
@@ -315,8 +317,8 @@ async def handle_task_answer(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if not context.user_data.get("awaiting_task_answer"):
         return
 
-    # Проверяем наличие токена
-    token = context.user_data.get("token")
+    # Получаем токен (обновляется автоматически, при необходимости - повторный вход)
+    token = await token_manager.get_token(update.effective_user.id)
     task_id = context.user_data.get("current_task_id")
 
     if not token or not task_id:
@@ -328,16 +330,17 @@ async def handle_task_answer(update: Update, context: ContextTypes.DEFAULT_TYPE)
     answer_text = update.message.text.strip()
 
     # Завершаем задание через API
-    result = await api_client.complete_task(
+    result = await token_manager.call(
+        update.effective_user.id,
+        api_client.complete_task,
         assignment_id=task_id,
-        answer_text=answer_text if answer_text else None,
-        token=token
+        answer_text=answer_text if answer_text else None
     )
 
     if result:
         # Задание успешно выполнено
         # Получаем обновленную статистику
-        progress = await api_client.get_user_progress(token)
+        progress = await token_manager.call(update.effective_user.id, api_client.get_user_progress)
 
         success_message = Messages.TASK_COMPLETED_SUCCESS
 
@@ -7,6 +7,7 @@ import logging
 from telegram import Update
 from telegram.ext import CommandHandler, ContextTypes
 from bot.services.api_client import api_client
+from bot.services.token_manager import token_manager
 from bot.utils.keyboards import get_task_keyboard, get_main_menu_keyboard
 from bot.utils.messages import Messages
 
@@ -37,15 +38,15 @@ async def today_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         update: Объект Update от Telegram
         context: Контекст выполнения
     """
-    # Проверяем наличие токена
-    token = context.user_data.get("token")
+    # Получаем токен (обновляется автоматически, при необходимости - повторный вход)
+    token = await token_manager.get_token(update.effective_user.id)
 
     if not token:
         await update.message.reply_text(Messages.ERROR_NO_TOKEN)
         return
 
     # Получаем задание на сегодня
-    task = await api_client.get_today_task(token)
+    task = await token_manager.call(update.effective_user.id, api_client.get_today_task)
 
     if not task:
         await update.message.reply_text(
@@ -78,15 +79,15 @@ async def done_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         update: Объект Update от Telegram
         context: Контекст выполнения
     """
-    # Проверяем наличие токена
-    token = context.user_data.get("token")
+    # Получаем токен (обновляется автоматически, при необходимости - повторный вход)
+    token = await token_manager.get_token(update.effective_user.id)
 
     if not token:
         await update.message.reply_text(Messages.ERROR_NO_TOKEN)
         return
 
     # Получаем задание на сегодня
-    task = await api_client.get_today_task(token)
+    task = await token_manager.call(update.effective_user.id, api_client.get_today_task)
 
     if not task:
         await update.message.reply_text(Messages.NO_TASK_TODAY)
@@ -113,15 +114,15 @@ async def progress_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         update: Объект Update от Telegram
         context: Контекст выполнения
     """
-    # Проверяем наличие токена
-    token = context.user_data.get("token")
+    # Получаем токен (обновляется автоматически, при необходимости - повторный вход)
+    token = await token_manager.get_token(update.effective_user.id)
 
     if not token:
         await update.message.reply_text(Messages.ERROR_NO_TOKEN)
         return
 
     # Получаем статистику
-    progress = await api_client.get_user_progress(token)
+    progress = await token_manager.call(update.effective_user.id, api_client.get_user_progress)
 
     if not progress:
         await update.message.reply_text(
@@ -13,6 +13,7 @@ from telegram.ext import (
     filters
 )
 from bot.services.api_client import api_client
+from bot.services.token_manager import token_manager
 from bot.utils.keyboards import get_task_completed_keyboard, get_main_menu_keyboard
 from bot.utils.messages import Messages
 
@@ -34,15 +35,15 @@ async def start_complete_task(update: Update, context: ContextTypes.DEFAULT_TYPE
     Returns:
         Состояние AWAITING_ANSWER
     """
-    # Проверяем наличие токена
-    token = context.user_data.get("token")
+    # Получаем токен (обновляется автоматически, при необходимости - повторный вход)
+    token = await token_manager.get_token(update.effective_user.id)
 
     if not token:
         await update.message.reply_text(Messages.ERROR_NO_TOKEN)
         return ConversationHandler.END
 
     # Получаем задание на сегодня
-    task = await api_client.get_today_task(token)
+    task = await token_manager.call(update.effective_user.id, api_client.get_today_task)
 
     if not task:
         await update.message.reply_text(Messages.NO_TASK_TODAY)
@@ -73,8 +74,8 @@ async def receive_task_answer(update: Update, context: ContextTypes.DEFAULT_TYPE
     Returns:
         ConversationHandler.END
     """
-    # Проверяем наличие токена
-    token = context.user_data.get("token")
+    # Получаем токен (обновляется автоматически, при необходимости - повторный вход)
+    token = await token_manager.get_token(update.effective_user.id)
     task_id = context.user_data.get("current_task_id")
 
     if not token or not task_id:
@@ -85,16 +86,17 @@ async def receive_task_answer(update: Update, context: ContextTypes.DEFAULT_TYPE
     answer_text = update.message.text.strip()
 
     # Завершаем задание через API
-    result = await api_client.complete_task(
+    result = await token_manager.call(
+        update.effective_user.id,
+        api_client.complete_task,
         assignment_id=task_id,
-        answer_text=answer_text if answer_text else None,
-        token=token
+        answer_text=answer_text if answer_text else None
     )
 
     if result:
         # Задание успешно выполнено
         # Получаем обновленную статистику
-        progress = await api_client.get_user_progress(token)
+        progress = await token_manager.call(update.effective_user.id, api_client.get_user_progress)
 
         success_message = Messages.TASK_COMPLETED_SUCCESS
 
@@ -133,8 +135,8 @@ async def skip_task_answer(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     Returns:
         ConversationHandler.END
     """
-    # Проверяем наличие токена
-    token = context.user_data.get("token")
+    # Получаем токен (обновляется автоматически, при необходимости - повторный вход)
+    token = await token_manager.get_token(update.effective_user.id)
     task_id = context.user_data.get("current_task_id")
 
     if not token or not task_id:
@@ -142,10 +144,11 @@ async def skip_task_answer(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         return ConversationHandler.END
 
     # Завершаем задание без ответа
-    result = await api_client.complete_task(
+    result = await token_manager.call(
+        update.effective_user.id,
+        api_client.complete_task,
         assignment_id=task_id,
-        answer_text=None,
-        token=token
+        answer_text=None
     )
 
     if result:
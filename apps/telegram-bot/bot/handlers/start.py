@@ -13,6 +13,7 @@ from telegram.ext import (
     filters
 )
 from bot.services.api_client import api_client
+from bot.services.token_manager import token_manager
 from bot.utils.keyboards import get_main_menu_keyboard
 from bot.utils.messages import Messages
 
@@ -37,13 +38,12 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     user = update.effective_user
     telegram_id = user.id
 
-    # Проверяем, зарегистрирован ли пользователь
-    user_data = await api_client.get_user_by_telegram_id(telegram_id)
+    # Проверяем, зарегистрирован ли пользователь (вход по Telegram ID)
+    token = await token_manager.get_token(telegram_id)
 
-    if user_data and "access_token" in user_data:
+    if token:
         # Пользователь уже зарегистрирован
-        context.user_data["token"] = user_data["access_token"]
-        context.user_data["user_info"] = user_data
+        context.user_data["user_info"] = await token_manager.call(telegram_id, api_client.get_current_user)
 
         await update.message.reply_text(
             Messages.WELCOME_EXISTING_USER,
@@ -154,7 +154,7 @@ async def receive_password(update: Update, context: ContextTypes.DEFAULT_TYPE) -
 
     if result and "access_token" in result:
         # Регистрация успешна
-        context.user_data["token"] = result["access_token"]
+        token_manager.store(user.id, result)
         context.user_data["user_info"] = result.get("user", {})
 
         # Очищаем временные данные регистрации
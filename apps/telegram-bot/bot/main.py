@@ -89,6 +89,9 @@ async def post_init(application: Application) -> None:
     """
     logger.info("Telegram bot initialized successfully")
 
+    # Открываем общий HTTP клиент к Backend API
+    await api_client.start()
+
     # Проверяем доступность Backend API
     api_available = await api_client.health_check()
 
@@ -109,6 +112,7 @@ async def post_shutdown(application: Application) -> None:
         application: Объект Application
     """
     logger.info("Shutting down bot...")
+    await api_client.close()
     logger.info("Bot shutdown completed")
 
 
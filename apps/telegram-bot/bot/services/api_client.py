@@ -11,6 +11,14 @@ from bot.config import bot_settings
 logger = logging.getLogger(__name__)
 
 
+class BackendUnauthorizedError(Exception):
+    """Backend отклонил токен пользователя (401): его нужно обновить."""
+
+
+class BackendLoginRejectedError(Exception):
+    """Backend отказал во входе по Telegram ID (401/403): пользователь не зарегистрирован или деактивирован."""
+
+
 class BackendAPIClient:
     """
     Асинхронный HTTP клиент для взаимодействия с Backend API.
@@ -20,7 +28,53 @@ class BackendAPIClient:
         """Инициализация клиента."""
         self.base_url = bot_settings.BACKEND_API_URL
         self.api_prefix = "/api/v1"
-        self.timeout = 30.0
+        # Таймауты по классам запросов: обычные, аутентификация (bcrypt на backend), health check
+        self.timeouts = {
+            "default": httpx.Timeout(
+                bot_settings.BACKEND_TIMEOUT_DEFAULT,
+                connect=bot_settings.BACKEND_CONNECT_TIMEOUT
+            ),
+            "auth": httpx.Timeout(
+                bot_settings.BACKEND_TIMEOUT_AUTH,
+                connect=bot_settings.BACKEND_CONNECT_TIMEOUT
+            ),
+            "health": httpx.Timeout(
+                bot_settings.BACKEND_TIMEOUT_HEALTH,
+                connect=bot_settings.BACKEND_CONNECT_TIMEOUT
+            ),
+        }
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        """
+        Открыть общий HTTP клиент процесса с пулом keep-alive соединений.
+        Вызывается из post_init бота.
+        """
+        if self._client is not None:
+            return
+
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeouts["default"],
+            http2=bot_settings.BACKEND_HTTP2,
+            limits=httpx.Limits(
+                max_connections=bot_settings.BACKEND_MAX_CONNECTIONS,
+                max_keepalive_connections=bot_settings.BACKEND_MAX_KEEPALIVE,
+                keepalive_expiry=bot_settings.BACKEND_KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    async def close(self) -> None:
+        """Закрыть общий HTTP клиент. Вызывается из post_shutdown бота."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Получить общий HTTP клиент, открыв его при первом обращении."""
+        if self._client is None:
+            await self.start()
+        return self._client
 
     async def _make_request(
         self,
@@ -28,7 +82,9 @@ class BackendAPIClient:
         endpoint: str,
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
-        token: Optional[str] = None
+        token: Optional[str] = None,
+        timeout_class: str = "default",
+        is_login: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Выполняет HTTP запрос к Backend API.
@@ -39,28 +95,41 @@ class BackendAPIClient:
             data: Данные для отправки в теле запроса
             params: Query параметры
             token: JWT токен для авторизации
+            timeout_class: Класс таймаутов ("default", "auth", "health")
+            is_login: Запрос входа: отказ (401/403) поднимается исключением
 
         Returns:
             Optional[Dict[str, Any]]: Ответ от API или None при ошибке
+
+        Raises:
+            BackendUnauthorizedError: Если запрос с токеном получил 401
+            BackendLoginRejectedError: Если вход (is_login) получил 401 или 403
         """
-        url = f"{self.base_url}{self.api_prefix}{endpoint}"
+        url = f"{self.api_prefix}{endpoint}"
         headers = {}
 
         if token:
             headers["Authorization"] = f"Bearer {token}"
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    json=data,
-                    params=params,
-                    headers=headers
-                )
-                response.raise_for_status()
-                return response.json()
-
+            client = await self._get_client()
+            response = await client.request(
+                method=method,
+                url=url,
+                json=data,
+                params=params,
+                headers=headers,
+                timeout=self.timeouts[timeout_class]
+            )
+            if token and response.status_code == 401:
+                raise BackendUnauthorizedError(response.text)
+            if is_login and response.status_code in (401, 403):
+                raise BackendLoginRejectedError(response.text)
+            response.raise_for_status()
+            return response.json()
+
+        except (BackendUnauthorizedError, BackendLoginRejectedError):
+            raise
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error {e.response.status_code}: {e.response.text}")
             return None
@@ -97,7 +166,9 @@ class BackendAPIClient:
             "password": password,
             "telegram_id": telegram_id
         }
-        return await self._make_request("POST", "/auth/register", data=data)
+        return await self._make_request(
+            "POST", "/auth/register", data=data, timeout_class="auth"
+        )
 
     async def login(
         self,
@@ -111,39 +182,30 @@ class BackendAPIClient:
 
         Returns:
             Dict с access_token или None при ошибке
+
+        Raises:
+            BackendLoginRejectedError: Если пользователь не зарегистрирован или деактивирован
         """
         data = {"telegram_id": telegram_id}
-        return await self._make_request("POST", "/auth/login", data=data)
+        return await self._make_request(
+            "POST", "/auth/login", data=data, timeout_class="auth", is_login=True
+        )
 
-    async def get_user_by_telegram_id(
+    async def refresh(
         self,
-        telegram_id: int
+        refresh_token: str
     ) -> Optional[Dict[str, Any]]:
         """
-        Получение пользователя по Telegram ID.
+        Обновление токенов по refresh token.
 
         Args:
-            telegram_id: Telegram ID пользователя
+            refresh_token: Refresh токен пользователя
 
         Returns:
-            Dict с данными пользователя или None если не найден
+            Dict с access_token и refresh_token или None, если токен отклонен
         """
-        try:
-            # Сначала логинимся чтобы получить токен
-            login_result = await self.login(telegram_id)
-            if not login_result or "access_token" not in login_result:
-                return None
-
-            token = login_result["access_token"]
-            user_data = await self.get_current_user(token)
-
-            if user_data:
-                user_data["access_token"] = token
-
-            return user_data
-        except Exception as e:
-            logger.error(f"Error getting user by telegram_id: {str(e)}")
-            return None
+        data = {"refresh_token": refresh_token}
+        return await self._make_request("POST", "/auth/refresh", data=data)
 
     # User methods
     async def get_user_info(
@@ -187,21 +249,29 @@ class BackendAPIClient:
 
         Returns:
             Dict с заданием на сегодня, или dict с ключом 'already_completed', или None при ошибке
+
+        Raises:
+            BackendUnauthorizedError: Если токен отклонен (401)
         """
-        url = f"{self.base_url}{self.api_prefix}/tasks/today"
+        url = f"{self.api_prefix}/tasks/today"
         headers = {"Authorization": f"Bearer {token}"}
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=headers)
+            client = await self._get_client()
+            response = await client.get(url, headers=headers)
+
+            if response.status_code == 401:
+                raise BackendUnauthorizedError(response.text)
 
-                # Если 409 - пользователь уже выполнил задание
-                if response.status_code == 409:
-                    return {"already_completed": True, "detail": response.json().get("detail", "Вы уже выполнили задание на сегодня")}
+            # Если 409 - пользователь уже выполнил задание
+            if response.status_code == 409:
+                return {"already_completed": True, "detail": response.json().get("detail", "Вы уже выполнили задание на сегодня")}
 
-                response.raise_for_status()
-                return response.json()
+            response.raise_for_status()
+            return response.json()
 
+        except BackendUnauthorizedError:
+            raise
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error {e.response.status_code}: {e.response.text}")
             return None
@@ -310,7 +380,7 @@ class BackendAPIClient:
     async def health_check(self) -> bool:
         """Проверка доступности Backend API."""
         try:
-            response = await self._make_request("GET", "/health")
+            response = await self._make_request("GET", "/health", timeout_class="health")
             return response is not None
         except Exception:
             return False
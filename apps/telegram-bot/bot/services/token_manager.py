@@ -0,0 +1,238 @@
+"""
+Менеджер JWT токенов пользователей бота.
+Хранит access и refresh токены по Telegram ID и обновляет их без участия пользователя.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+from bot.config import bot_settings
+from bot.services.api_client import (
+    api_client,
+    BackendAPIClient,
+    BackendLoginRejectedError,
+    BackendUnauthorizedError,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _token_exp(token: str) -> float:
+    """
+    Срок действия JWT (exp) без проверки подписи.
+
+    Подпись проверяет backend; боту срок нужен только для того, чтобы
+    обновить токен заранее. Если exp прочитать не удалось, токен считается
+    истекшим и будет обновлен при следующем обращении.
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return 0.0
+
+
+@dataclass
+class TokenPair:
+    """Токены пользователя и их сроки действия (unix time)."""
+    access_token: str
+    refresh_token: Optional[str]
+    access_expires_at: float
+    refresh_expires_at: float
+
+
+class TokenManager:
+    """
+    Токены пользователей бота с проактивным обновлением.
+
+    Access токен обновляется через /auth/refresh за TOKEN_REFRESH_MARGIN_SECONDS
+    до истечения; если refresh токена нет или он отклонен, выполняется вход
+    по Telegram ID. Обновления одного пользователя выполняются под его
+    блокировкой, поэтому параллельные запросы дожидаются одного обновления,
+    а не выполняют каждый свое.
+
+    Отказ во входе (пользователь не зарегистрирован) запоминается на
+    not_registered_ttl секунд: команды такого пользователя не обращаются к
+    backend, пока он не зарегистрируется (store) или срок не истечет.
+    """
+
+    def __init__(self, client: BackendAPIClient, refresh_margin: float, not_registered_ttl: float):
+        """
+        Args:
+            client: Клиент Backend API
+            refresh_margin: За сколько секунд до истечения обновлять access токен
+            not_registered_ttl: Сколько секунд помнить отказ во входе
+        """
+        self.client = client
+        self.refresh_margin = refresh_margin
+        self.not_registered_ttl = not_registered_ttl
+        self._tokens: Dict[int, TokenPair] = {}
+        # Блокировка обновления и число ожидающих ее запросов
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._lock_users: Dict[int, int] = {}
+        # Telegram ID -> срок отказа (monotonic); TTL общий, порядок вставки = порядок истечения
+        self._not_registered: OrderedDict[int, float] = OrderedDict()
+
+    def store(self, telegram_id: int, tokens: Dict[str, Any]) -> None:
+        """
+        Сохранить токены из ответа /auth/login, /auth/register или /auth/refresh.
+
+        Args:
+            telegram_id: Telegram ID пользователя
+            tokens: Ответ backend с access_token и refresh_token
+        """
+        refresh_token = tokens.get("refresh_token")
+        self._not_registered.pop(telegram_id, None)
+        self._tokens[telegram_id] = TokenPair(
+            access_token=tokens["access_token"],
+            refresh_token=refresh_token,
+            access_expires_at=_token_exp(tokens["access_token"]),
+            refresh_expires_at=_token_exp(refresh_token) if refresh_token else 0.0,
+        )
+
+    def forget(self, telegram_id: int) -> None:
+        """
+        Удалить токены пользователя.
+
+        Args:
+            telegram_id: Telegram ID пользователя
+        """
+        self._tokens.pop(telegram_id, None)
+
+    def _is_fresh(self, tokens: Optional[TokenPair]) -> bool:
+        return tokens is not None and tokens.access_expires_at - self.refresh_margin > time.time()
+
+    def _is_not_registered(self, telegram_id: int) -> bool:
+        """Backend недавно отказал пользователю во входе."""
+        now = time.monotonic()
+        # Истекшие отказы в начале очереди удаляются, чтобы она не росла
+        while self._not_registered and next(iter(self._not_registered.values())) <= now:
+            self._not_registered.popitem(last=False)
+        return telegram_id in self._not_registered
+
+    def _remember_not_registered(self, telegram_id: int) -> None:
+        if self.not_registered_ttl > 0:
+            self._not_registered.pop(telegram_id, None)
+            self._not_registered[telegram_id] = time.monotonic() + self.not_registered_ttl
+
+    async def get_token(self, telegram_id: int) -> Optional[str]:
+        """
+        Получить действующий access токен пользователя.
+
+        Args:
+            telegram_id: Telegram ID пользователя
+
+        Returns:
+            Optional[str]: Access токен или None, если пользователь не
+                зарегистрирован или backend недоступен
+        """
+        tokens = self._tokens.get(telegram_id)
+        if self._is_fresh(tokens):
+            return tokens.access_token
+        if tokens is None and self._is_not_registered(telegram_id):
+            return None
+        return await self._renew(telegram_id, stale=tokens.access_token if tokens else None)
+
+    async def _renew(self, telegram_id: int, stale: Optional[str]) -> Optional[str]:
+        """
+        Обновить токены пользователя, если их еще не обновил другой запрос.
+
+        Args:
+            telegram_id: Telegram ID пользователя
+            stale: Access токен, который вызывающий считает недействительным
+        """
+        lock = self._locks.setdefault(telegram_id, asyncio.Lock())
+        self._lock_users[telegram_id] = self._lock_users.get(telegram_id, 0) + 1
+        try:
+            async with lock:
+                return await self._renew_locked(telegram_id, stale)
+        finally:
+            # Блокировка удаляется, когда ее больше никто не ждет
+            self._lock_users[telegram_id] -= 1
+            if not self._lock_users[telegram_id]:
+                del self._lock_users[telegram_id]
+                del self._locks[telegram_id]
+
+    async def _renew_locked(self, telegram_id: int, stale: Optional[str]) -> Optional[str]:
+        """Обновить токены под блокировкой пользователя (см. _renew)."""
+        tokens = self._tokens.get(telegram_id)
+        # Пока мы ждали блокировку, токены мог обновить параллельный запрос
+        if self._is_fresh(tokens) and tokens.access_token != stale:
+            return tokens.access_token
+        if tokens is None and self._is_not_registered(telegram_id):
+            return None
+
+        result = None
+        if tokens and tokens.refresh_token and tokens.refresh_expires_at > time.time():
+            result = await self.client.refresh(tokens.refresh_token)
+        if not result:
+            try:
+                result = await self.client.login(telegram_id)
+            except BackendLoginRejectedError:
+                self.forget(telegram_id)
+                self._remember_not_registered(telegram_id)
+                return None
+
+        if not result or "access_token" not in result:
+            self.forget(telegram_id)
+            return None
+
+        self.store(telegram_id, result)
+        return result["access_token"]
+
+    async def call(
+        self,
+        telegram_id: int,
+        method: Callable[..., Awaitable[Any]],
+        *args: Any,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Вызвать метод api_client с токеном пользователя.
+
+        Метод получает токен аргументом token. При ответе 401 (токен отозван
+        или истек раньше ожидаемого) токены обновляются и запрос повторяется
+        один раз.
+
+        Args:
+            telegram_id: Telegram ID пользователя
+            method: Метод api_client, принимающий token
+            args: Позиционные аргументы метода
+            kwargs: Именованные аргументы метода
+
+        Returns:
+            Any: Результат метода или None, если авторизоваться не удалось
+        """
+        token = await self.get_token(telegram_id)
+        if token is None:
+            return None
+
+        try:
+            return await method(*args, token=token, **kwargs)
+        except BackendUnauthorizedError:
+            logger.info(f"Access token rejected for telegram_id {telegram_id}, renewing")
+
+        token = await self._renew(telegram_id, stale=token)
+        if token is None:
+            return None
+
+        try:
+            return await method(*args, token=token, **kwargs)
+        except BackendUnauthorizedError:
+            logger.warning(f"Renewed access token rejected for telegram_id {telegram_id}")
+            self.forget(telegram_id)
+            return None
+
+
+# Глобальный экземпляр менеджера токенов
+token_manager = TokenManager(
+    api_client,
+    refresh_margin=bot_settings.TOKEN_REFRESH_MARGIN_SECONDS,
+    not_registered_ttl=bot_settings.TOKEN_NOT_REGISTERED_TTL_SECONDS
+)